@@ -0,0 +1,90 @@
+"""
+Hesap Karşılaştırma (Komut Satırı)
+==================================
+Verilen X hesaplarını 100'lük get_users(usernames=...) çağrılarıyla çözer,
+zaman tünellerini paralel olarak yerel depoya senkronlar ve takipçi, oran ve
+etkileşim karşılaştırmasını tablo, CSV veya JSON olarak yazar. X limitleri
+dolarsa beklenmez; depodaki son verilerle devam edilir.
+
+Örnek:
+    python accounts.py bir_adamiste rakip1 rakip2
+    python accounts.py --file hesaplar.txt --format csv > karsilastirma.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from core import DEFAULT_USERNAME, compare_accounts, get_twitter_client, parse_usernames
+
+COLUMNS = [
+    ("username", "Hesap"),
+    ("followers", "Takipçi"),
+    ("following", "Takip"),
+    ("ratio", "Oran"),
+    ("avg_likes", "Ort. Beğeni"),
+    ("avg_retweets", "Ort. RT"),
+    ("avg_replies", "Ort. Yanıt"),
+    ("engagement_rate", "Etkileşim %"),
+    ("sampled_tweets", "Örnek"),
+]
+
+
+def format_value(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def print_table(rows, out):
+    """Sütunları hizalı düz metin tablo yaz"""
+    header = [title for _, title in COLUMNS]
+    body = [[format_value(row[key]) for key, _ in COLUMNS] for row in rows]
+    widths = [max(len(cell) for cell in column) for column in zip(header, *body)]
+    for line in [header] + body:
+        out.write("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="X hesaplarını takipçi ve etkileşim açısından karşılaştır.")
+    parser.add_argument("usernames", nargs="*", help="Kullanıcı adları (@ opsiyonel)")
+    parser.add_argument("--file", help="Her satırda (veya virgülle) kullanıcı adları içeren dosya")
+    parser.add_argument("--format", default="table", choices=["table", "csv", "json"])
+    parser.add_argument("--sample-size", type=int, default=100, help="Hesap başına etkileşim için tweet sayısı")
+    parser.add_argument("--concurrency", type=int, default=4, help="Aynı anda senkronlanan hesap sayısı")
+    parser.add_argument("--sort", default="engagement_rate", choices=[key for key, _ in COLUMNS])
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    usernames = parse_usernames(",".join(args.usernames))
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            usernames = parse_usernames(",".join(usernames) + "," + f.read())
+    usernames = usernames or [DEFAULT_USERNAME]
+
+    client, error = get_twitter_client()
+    if error:
+        print(f"X API Hatası: {error}", file=sys.stderr)
+        return 1
+
+    rows, errors = compare_accounts(client, usernames, args.sample_size, args.concurrency)
+    for username, message in errors.items():
+        print(f"@{username}: {message}", file=sys.stderr)
+    rows.sort(key=lambda row: row[args.sort], reverse=args.sort != "username")
+
+    if args.format == "json":
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    elif args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=[key for key, _ in COLUMNS], extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print_table(rows, sys.stdout)
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
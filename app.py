@@ -5,28 +5,59 @@ Persona yönetimi, gündem analizi, içerik üretimi ve profil istatistikleri.
 """
 
 import streamlit as st
-import tweepy
-import google.generativeai as genai
-import json
-import os
 from datetime import datetime
-from dotenv import load_dotenv
 
-# Optional imports for multi-AI support
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-
-# .env dosyasını yükle
-load_dotenv()
+from core import (
+    AUTO_PROVIDER,
+    DAY_NAMES,
+    DEFAULT_PERSONA,
+    DEFAULT_USERNAME,
+    INTERACTIVE_SYNC_PAGES,
+    MANUAL_TOPIC,
+    TURKEY_TZ,
+    VIRAL_Z,
+    add_disliked_thread,
+    add_liked_thread,
+    build_hashtag_prompt,
+    build_single_tweet_prompt,
+    call_stats,
+    client_registry,
+    compare_accounts,
+    get_api_keys,
+    get_available_ai_providers,
+    get_breaker,
+    get_posting_model,
+    get_profile_analytics,
+    get_relevant_examples,
+    get_stored_tweets,
+    get_trends,
+    get_twitter_client,
+    get_users_info,
+    learned_store,
+    parse_usernames,
+    provider_router,
+    refresh_trends,
+    refresh_tweet_metrics,
+    resolve_user_id,
+    response_cache,
+    save_learned_examples,
+    start_trend_feed,
+    sync_user_timeline,
+    thread_renderer,
+    tweet_store,
+    x_access,
+)
+from jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    RUNNING,
+    job_manager,
+    run_multi_thread_job,
+    run_text_job,
+    run_thread_job,
+)
+from thread_render import NORMAL, X_PREVIEW, thread_hash
 
 # ============================================
 # CONFIGURATION
@@ -40,6 +71,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# TREND_FEED ayarlıysa canlı gündem akışı (süreçte bir kez) arayüzle birlikte başlar
+trend_engine = start_trend_feed()
+
+# Arka plan işlerinin durumunun yenilenme sıklığı (saniye)
+JOB_POLL_INTERVAL = 1.0
+# Çalışan işin panelde gösterilen akan metninin uzunluğu (karakter)
+JOB_PREVIEW_CHARS = 1500
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -159,410 +198,185 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============================================
-# API KEYS & CLIENTS
+# THREAD GÖRÜNÜMÜ
 # ============================================
 
-def get_api_keys():
-    """API anahtarlarını .env'den al"""
-    return {
-        "gemini_key": os.getenv("GEMINI_API_KEY", ""),
-        "openai_key": os.getenv("OPENAI_API_KEY", ""),
-        "anthropic_key": os.getenv("ANTHROPIC_API_KEY", ""),
-        "bearer_token": os.getenv("X_BEARER_TOKEN", ""),
-        "consumer_key": os.getenv("X_CONSUMER_KEY", ""),
-        "consumer_secret": os.getenv("X_CONSUMER_SECRET", ""),
-        "access_token": os.getenv("X_ACCESS_TOKEN", ""),
-        "access_token_secret": os.getenv("X_ACCESS_TOKEN_SECRET", "")
-    }
+THREAD_VIEW_MODES = {"📝 Normal": NORMAL, "🐦 X Önizleme": X_PREVIEW}
+# Bundan fazla thread varsa kapalı olanların içeriği hiç gönderilmez
+LAZY_THREAD_THRESHOLD = 3
 
-def get_available_ai_providers():
-    """Kullanılabilir AI sağlayıcılarını listele"""
-    keys = get_api_keys()
-    providers = []
+def lazy_expander(label, key, expanded=False):
+    """Kapalıyken içeriği gönderilmeyen expander: açıksa container, kapalıysa None
     
-    if keys["gemini_key"]:
-        providers.append(("🌟 Gemini", "gemini"))
-    if keys["openai_key"] and OPENAI_AVAILABLE:
-        providers.append(("🤖 GPT-4", "openai"))
-    if keys["anthropic_key"] and ANTHROPIC_AVAILABLE:
-        providers.append(("🧠 Claude", "anthropic"))
+    st.expander içeriği kapalıyken de her rerun'da tarayıcıya gönderir.
+    """
+    if st.toggle(label, value=expanded, key=key):
+        return st.container(border=True)
+    return None
+
+def thread_widget_keys(threads):
+    """Thread başına içerikten türeyen widget anahtarı
     
-    return providers if providers else [("🌟 Gemini (API key gerekli)", "gemini")]
+    Sıra numarası yerine hash: açık/kapalı durumu yeni ve alakasız bir thread
+    grubuna taşınmaz. Aynı grupta birebir aynı thread varsa sıra eki alır.
+    """
+    seen = {}
+    keys = []
+    for thread in threads:
+        digest = thread_hash(thread)
+        count = seen.get(digest, 0)
+        seen[digest] = count + 1
+        keys.append(digest if count == 0 else f"{digest}_{count}")
+    return keys
 
-def get_twitter_client():
-    """Tweepy client oluştur"""
-    keys = get_api_keys()
-    try:
-        client = tweepy.Client(
-            bearer_token=keys["bearer_token"],
-            consumer_key=keys["consumer_key"],
-            consumer_secret=keys["consumer_secret"],
-            access_token=keys["access_token"],
-            access_token_secret=keys["access_token_secret"],
-            wait_on_rate_limit=True
+def render_thread_body(i, key, thread, mode):
+    """Tek thread: önizleme (tek HTML elemanı), aksiyonlar ve kopyalama"""
+    if thread.get("duplicate_of"):
+        st.caption(f"♻️ Tekrar: %{thread['similarity']*100:.0f} benzer → {thread['duplicate_of']}")
+    
+    st.markdown(thread_renderer.render(thread, mode), unsafe_allow_html=True)
+    st.markdown("---")
+    
+    # Aksiyon butonları
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("👍 Beğendim", key=f"like_{key}", use_container_width=True):
+            add_liked_thread(thread)
+            st.success("Thread beğenildi ve kaydedildi!")
+    with col2:
+        if st.button("👎 Beğenmedim", key=f"dislike_{key}", use_container_width=True):
+            add_disliked_thread(thread)
+            st.info("Feedback kaydedildi.")
+    with col3:
+        st.download_button(
+            label="📋 İndir",
+            data=thread_renderer.plain_text(thread),
+            file_name=f"thread_{i+1}.txt",
+            mime="text/plain",
+            key=f"copy_{key}",
+            use_container_width=True
         )
-        return client, None
-    except Exception as e:
-        return None, str(e)
-
-def get_gemini_model():
-    """Gemini model oluştur"""
-    keys = get_api_keys()
-    try:
-        genai.configure(api_key=keys["gemini_key"])
-        model = genai.GenerativeModel('gemini-3-flash-preview')
-        return model, None
-    except Exception as e:
-        return None, str(e)
-
-def get_openai_client():
-    """OpenAI client oluştur"""
-    keys = get_api_keys()
-    if not OPENAI_AVAILABLE:
-        return None, "OpenAI kütüphanesi yüklü değil. 'pip install openai' çalıştırın."
-    try:
-        client = OpenAI(api_key=keys["openai_key"])
-        return client, None
-    except Exception as e:
-        return None, str(e)
-
-def get_anthropic_client():
-    """Anthropic (Claude) client oluştur"""
-    keys = get_api_keys()
-    if not ANTHROPIC_AVAILABLE:
-        return None, "Anthropic kütüphanesi yüklü değil. 'pip install anthropic' çalıştırın."
-    try:
-        client = anthropic.Anthropic(api_key=keys["anthropic_key"])
-        return client, None
-    except Exception as e:
-        return None, str(e)
-
-def generate_with_ai(prompt, provider="gemini"):
-    """Seçilen AI sağlayıcısı ile içerik üret"""
-    
-    if provider == "gemini":
-        model, error = get_gemini_model()
-        if error:
-            return None, error
-        try:
-            response = model.generate_content(prompt)
-            return response.text, None
-        except Exception as e:
-            return None, str(e)
-    
-    elif provider == "openai":
-        client, error = get_openai_client()
-        if error:
-            return None, error
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "Sen viral Twitter içerik üreticisisin. Türkçe içerik üret."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=4000
-            )
-            return response.choices[0].message.content, None
-        except Exception as e:
-            return None, str(e)
-    
-    elif provider == "anthropic":
-        client, error = get_anthropic_client()
-        if error:
-            return None, error
-        try:
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.content[0].text, None
-        except Exception as e:
-            return None, str(e)
     
-    return None, "Bilinmeyen AI sağlayıcısı"
+    # Tweet'leri tek tek kopyalama alanı (açılınca oluşturulur)
+    if st.toggle("📋 Tweet'leri Tek Tek Kopyala", key=f"copy_tweets_{key}"):
+        for tweet in thread.get("tweets", []):
+            st.code(tweet, language=None)
 
 # ============================================
-# DATA MANAGEMENT
+# ARKA PLAN İŞLERİ
 # ============================================
 
-LEARNED_EXAMPLES_FILE = "learned_examples.json"
-
-def load_learned_examples():
-    """Öğrenilmiş örnekleri yükle"""
-    try:
-        with open(LEARNED_EXAMPLES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {"liked_threads": [], "disliked_threads": []}
+JOB_KIND_LABELS = {"thread": "🧵 Thread", "single_tweet": "💬 Tek Tweet", "hashtag": "🏷️ Hashtag"}
+JOB_STATUS_ICONS = {RUNNING: "⏳", DONE: "✅", FAILED: "❌", CANCELLED: "🚫"}
 
-def save_learned_examples(data):
-    """Öğrenilmiş örnekleri kaydet"""
-    with open(LEARNED_EXAMPLES_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def track_job(job):
+    """İşi bu oturumun iş listesine ekle"""
+    st.session_state.setdefault("job_ids", []).append(job.id)
+    return job
 
-def add_liked_thread(thread):
-    """Beğenilen thread'i kaydet"""
-    data = load_learned_examples()
-    thread_entry = {
-        "thread": thread,
-        "timestamp": datetime.now().isoformat()
-    }
-    data["liked_threads"].append(thread_entry)
-    save_learned_examples(data)
-
-def add_disliked_thread(thread):
-    """Beğenilmeyen thread'i kaydet"""
-    data = load_learned_examples()
-    thread_entry = {
-        "thread": thread,
-        "timestamp": datetime.now().isoformat()
+def submit_thread_job(topic, auto_apply=False):
+    """Konu için thread üretimini (tek veya çoklu sağlayıcı) arka plana gönder"""
+    args = (
+        topic,
+        st.session_state.get("persona", "Kara mizah seven villain karakter"),
+        get_relevant_examples(topic),
+        st.session_state.get("thread_count", 5),
+        st.session_state.get("creativity", "Yüksek"),
+    )
+    options = {
+        "use_cache": not st.session_state.get("bypass_cache", False),
+        "hide_duplicates": st.session_state.get("hide_duplicates", False),
     }
-    data["disliked_threads"].append(thread_entry)
-    save_learned_examples(data)
+    meta = {"auto_apply": auto_apply}
+    multi_mode = st.session_state.get("multi_mode")
+    if multi_mode:
+        providers = st.session_state.get("multi_providers", [])
+        return track_job(job_manager.submit(
+            "thread", topic, run_multi_thread_job, *args, providers, multi_mode, meta=meta, **options
+        ))
+    provider = st.session_state.get("ai_provider", "gemini")
+    return track_job(job_manager.submit("thread", topic, run_thread_job, *args, provider, meta=meta, **options))
 
-# ============================================
-# TWITTER API FUNCTIONS
-# ============================================
-
-def get_user_info(client, username="bir_adamiste"):
-    """Kullanıcı bilgilerini al"""
-    try:
-        user = client.get_user(
-            username=username,
-            user_fields=["public_metrics", "description", "created_at", "profile_image_url"]
-        )
-        if user.data:
-            return user.data, None
-        return None, "Kullanıcı bulunamadı"
-    except Exception as e:
-        return None, str(e)
+def submit_text_job(kind, topic, prompt):
+    """Tek tweet / hashtag üretimini arka plana gönder"""
+    return track_job(job_manager.submit(
+        kind,
+        topic,
+        run_text_job,
+        prompt,
+        st.session_state.get("ai_provider", "gemini"),
+        use_cache=not st.session_state.get("bypass_cache", False),
+        meta={"auto_apply": True}
+    ))
 
-def get_user_tweets(client, user_id, max_results=5):
-    """Kullanıcının son tweetlerini al"""
-    try:
-        tweets = client.get_users_tweets(
-            id=user_id,
-            max_results=max_results,
-            tweet_fields=["public_metrics", "created_at", "text"]
-        )
-        if tweets.data:
-            return tweets.data, None
-        return [], None
-    except Exception as e:
-        return [], str(e)
+def apply_job_result(job):
+    """Biten işin sonucunu oturuma yükle (sonuç alanları bunu gösterir)"""
+    if job.kind == "thread":
+        st.session_state.generated_content = job.result["content"]
+        st.session_state.generated_threads = job.result["threads"]
+        if job.result.get("provider_results"):
+            st.session_state.provider_results = job.result["provider_results"]
+        else:
+            st.session_state.pop("provider_results", None)
+    elif job.kind == "single_tweet":
+        st.session_state.single_tweets = job.result
+    elif job.kind == "hashtag":
+        st.session_state.hashtag_suggestions = job.result
+    st.session_state.setdefault("applied_job_ids", set()).add(job.id)
 
-def get_trending_topics(client):
-    """Türkiye trending topics (WOEID: 23424969)
-    
-    Not: Free tier'da bu endpoint mevcut değil.
-    Bu durumda örnek gündem konuları döndürülür.
-    """
-    # X API v2'de trends endpoint'i sınırlı erişimde
-    # Örnek gündem konuları döndür
-    sample_trends = [
-        # EKONOMİ
-        {"name": "#Dolar", "category": "ekonomi", "tweet_volume": 125000},
-        {"name": "#Enflasyon", "category": "ekonomi", "tweet_volume": 89000},
-        {"name": "#Borsa", "category": "ekonomi", "tweet_volume": 156000},
-        {"name": "#BIST100", "category": "ekonomi", "tweet_volume": 78000},
-        {"name": "#Faiz", "category": "ekonomi", "tweet_volume": 67000},
-        {"name": "#AsgariÜcret", "category": "ekonomi", "tweet_volume": 234000},
-        {"name": "#Altın", "category": "ekonomi", "tweet_volume": 98000},
-        {"name": "#Euro", "category": "ekonomi", "tweet_volume": 45000},
-        {"name": "#Kripto", "category": "ekonomi", "tweet_volume": 112000},
-        {"name": "#Bitcoin", "category": "ekonomi", "tweet_volume": 189000},
-        {"name": "#Zam", "category": "ekonomi", "tweet_volume": 267000},
-        {"name": "#Maaş", "category": "ekonomi", "tweet_volume": 145000},
-        
-        # SPOR
-        {"name": "#Galatasaray", "category": "spor", "tweet_volume": 245000},
-        {"name": "#Fenerbahçe", "category": "spor", "tweet_volume": 198000},
-        {"name": "#Beşiktaş", "category": "spor", "tweet_volume": 156000},
-        {"name": "#Trabzonspor", "category": "spor", "tweet_volume": 89000},
-        {"name": "#SüperLig", "category": "spor", "tweet_volume": 167000},
-        {"name": "#Derbi", "category": "spor", "tweet_volume": 312000},
-        {"name": "#ŞampiyonlarLigi", "category": "spor", "tweet_volume": 234000},
-        {"name": "#MilliTakım", "category": "spor", "tweet_volume": 178000},
-        {"name": "#Transfer", "category": "spor", "tweet_volume": 145000},
-        {"name": "#Icardi", "category": "spor", "tweet_volume": 123000},
-        
-        # SİYASET
-        {"name": "#Seçim", "category": "siyaset", "tweet_volume": 312000},
-        {"name": "#TBMM", "category": "siyaset", "tweet_volume": 78000},
-        {"name": "#AKP", "category": "siyaset", "tweet_volume": 156000},
-        {"name": "#CHP", "category": "siyaset", "tweet_volume": 134000},
-        {"name": "#Erdoğan", "category": "siyaset", "tweet_volume": 289000},
-        {"name": "#Kılıçdaroğlu", "category": "siyaset", "tweet_volume": 167000},
-        {"name": "#Muhalefet", "category": "siyaset", "tweet_volume": 89000},
-        {"name": "#Anayasa", "category": "siyaset", "tweet_volume": 67000},
-        {"name": "#DışPolitika", "category": "siyaset", "tweet_volume": 45000},
-        
-        # TEKNOLOJİ
-        {"name": "#YapayZeka", "category": "teknoloji", "tweet_volume": 145000},
-        {"name": "#ChatGPT", "category": "teknoloji", "tweet_volume": 167000},
-        {"name": "#Gemini", "category": "teknoloji", "tweet_volume": 89000},
-        {"name": "#iPhone", "category": "teknoloji", "tweet_volume": 134000},
-        {"name": "#Android", "category": "teknoloji", "tweet_volume": 78000},
-        {"name": "#Yazılım", "category": "teknoloji", "tweet_volume": 56000},
-        {"name": "#Startup", "category": "teknoloji", "tweet_volume": 67000},
-        {"name": "#Kodlama", "category": "teknoloji", "tweet_volume": 45000},
-        {"name": "#Python", "category": "teknoloji", "tweet_volume": 34000},
-        {"name": "#AI", "category": "teknoloji", "tweet_volume": 198000},
-        {"name": "#Tesla", "category": "teknoloji", "tweet_volume": 156000},
-        {"name": "#ElonMusk", "category": "teknoloji", "tweet_volume": 234000},
-        
-        # MİZAH
-        {"name": "#Pazartesi", "category": "mizah", "tweet_volume": 156000},
-        {"name": "#İşyerinde", "category": "mizah", "tweet_volume": 89000},
-        {"name": "#AşkAcısı", "category": "mizah", "tweet_volume": 67000},
-        {"name": "#Türkiye", "category": "mizah", "tweet_volume": 234000},
-        {"name": "#KahveMolası", "category": "mizah", "tweet_volume": 45000},
-        {"name": "#EvdeKal", "category": "mizah", "tweet_volume": 56000},
-        {"name": "#Kış", "category": "mizah", "tweet_volume": 78000},
-        {"name": "#Şubat", "category": "mizah", "tweet_volume": 89000},
-        {"name": "#SevgililerGünü", "category": "mizah", "tweet_volume": 312000},
-        {"name": "#Yalnızlık", "category": "mizah", "tweet_volume": 134000},
-        
-        # DİĞER
-        {"name": "#Deprem", "category": "diger", "tweet_volume": 423000},
-        {"name": "#Hava", "category": "diger", "tweet_volume": 56000},
-        {"name": "#İstanbul", "category": "diger", "tweet_volume": 345000},
-        {"name": "#Ankara", "category": "diger", "tweet_volume": 189000},
-        {"name": "#Trafik", "category": "diger", "tweet_volume": 123000},
-        {"name": "#Eğitim", "category": "diger", "tweet_volume": 167000},
-        {"name": "#Sağlık", "category": "diger", "tweet_volume": 145000},
-        {"name": "#Konut", "category": "diger", "tweet_volume": 198000},
-        {"name": "#Kira", "category": "diger", "tweet_volume": 234000},
-        {"name": "#Gençlik", "category": "diger", "tweet_volume": 89000},
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_jobs_panel():
+    """Oturumun işlerini listele; otomatik yüklenecek iş bitince sayfayı yenile"""
+    session_jobs = job_manager.get_many(st.session_state.get("job_ids", []))
+    if not session_jobs:
+        return
+    
+    active = sum(1 for job in session_jobs if not job.done)
+    with st.expander(f"⏳ Arka Plan İşleri ({active} aktif / {len(session_jobs)})", expanded=bool(active)):
+        for job in reversed(session_jobs):
+            info = job.snapshot()
+            col1, col2, col3 = st.columns([6, 2, 1])
+            with col1:
+                icon = JOB_STATUS_ICONS.get(info["status"], "🕓")
+                st.markdown(f"{icon} **{info['label']}** · {JOB_KIND_LABELS.get(info['kind'], info['kind'])}")
+                if info["status"] == FAILED:
+                    st.caption(f"Hata: {info['error']}")
+                elif info["status"] == RUNNING:
+                    st.caption(info["progress"])
+                    for thread in info["partial"].get("threads", []):
+                        st.caption(f"✅ {thread['title']}")
+                    # Akan metin: panel şişmesin diye sadece son kısmı
+                    content = info["partial"].get("content")
+                    if content:
+                        tail = content[-JOB_PREVIEW_CHARS:]
+                        st.text(tail if len(tail) == len(content) else "…" + tail)
+                elif info["status"] not in (DONE, CANCELLED):
+                    st.caption("Sırada bekliyor")
+            with col2:
+                st.caption(f"{info['elapsed']:.0f} sn")
+            with col3:
+                if not job.done:
+                    if st.button("✖️", key=f"cancel_job_{job.id}", help="İptal et"):
+                        job_manager.cancel(job.id)
+                elif job.status == DONE:
+                    if st.button("📂", key=f"open_job_{job.id}", help="Sonucu göster"):
+                        apply_job_result(job)
+                        st.rerun()
+        
+        if active < len(session_jobs) and st.button("🧹 Bitenleri Temizle", key="clear_done_jobs"):
+            st.session_state.job_ids = [job.id for job in session_jobs if not job.done]
+            st.rerun()
+    
+    # Butonla başlatılan iş bittiyse sonucu yükle ve tüm sayfayı yenile
+    applied = st.session_state.setdefault("applied_job_ids", set())
+    finished = [
+        job for job in session_jobs
+        if job.status == DONE and job.meta.get("auto_apply") and job.id not in applied
     ]
-    return sample_trends
-
-def categorize_topic(topic_name):
-    """Konu kategorisini belirle (keyword matching)"""
-    topic_lower = topic_name.lower()
-    
-    ekonomi_keywords = ["dolar", "euro", "enflasyon", "faiz", "borsa", "ekonomi", "maaş", "zam", "tl", "kur"]
-    spor_keywords = ["galatasaray", "fenerbahçe", "beşiktaş", "trabzonspor", "maç", "gol", "futbol", "basketbol", "şampiyon"]
-    siyaset_keywords = ["seçim", "tbmm", "meclis", "parti", "cumhurbaşkan", "bakan", "hükümet", "muhalefet"]
-    teknoloji_keywords = ["yapay zeka", "ai", "chatgpt", "iphone", "android", "yazılım", "teknoloji", "kod", "google", "apple"]
-    mizah_keywords = ["pazartesi", "cuma", "işyerinde", "aşk", "sevgili", "evlilik", "komik", "espri"]
-    
-    for kw in ekonomi_keywords:
-        if kw in topic_lower:
-            return "ekonomi"
-    for kw in spor_keywords:
-        if kw in topic_lower:
-            return "spor"
-    for kw in siyaset_keywords:
-        if kw in topic_lower:
-            return "siyaset"
-    for kw in teknoloji_keywords:
-        if kw in topic_lower:
-            return "teknoloji"
-    for kw in mizah_keywords:
-        if kw in topic_lower:
-            return "mizah"
-    
-    return "diger"
-
-# ============================================
-# AI CONTENT GENERATION
-# ============================================
-
-def generate_thread_ideas(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek", provider="gemini"):
-    """Seçilen AI ile thread fikirleri üret"""
-    
-    # Yaratıcılık seviyesine göre talimat
-    creativity_map = {
-        "Düşük": "Güvenli, mainstream içerikler üret. Kontroversiyel konulardan kaçın.",
-        "Orta": "Dengeli içerikler üret. Hafif provokasyon tamam.",
-        "Yüksek": "Cesur ve dikkat çekici içerikler üret. Sınırları zorla.",
-        "Çılgın": "Çılgınca, absürt ve viral potansiyeli çok yüksek içerikler üret. Sınır yok!"
-    }
-    creativity_instruction = creativity_map.get(creativity, creativity_map["Yüksek"])
-    
-    # Learned examples'dan örnek tweet'leri al
-    examples_text = ""
-    if learned_examples and learned_examples.get("liked_threads"):
-        recent_liked = learned_examples["liked_threads"][-3:]  # Son 3 beğenilen
-        examples_text = "\n\nÖrnek beğenilen thread'ler (bu stili kullan):\n"
-        for i, ex in enumerate(recent_liked, 1):
-            if isinstance(ex.get("thread"), list):
-                examples_text += f"\nÖrnek {i}:\n"
-                for tweet in ex["thread"][:2]:  # İlk 2 tweet
-                    examples_text += f"- {tweet}\n"
-    
-    prompt = f"""Sen viral Twitter içerik üreticisisin. Türkçe tweet thread'leri oluştur.
-
-PERSONA:
-{persona}
-{examples_text}
-
-YARATICILIK SEVİYESİ: {creativity}
-{creativity_instruction}
-
-KURALLAR:
-1. Her tweet maksimum 280 karakter olmalı
-2. Kara mizah ve villain stil kullan ve küfür serbest 
-3. Provokatif ama akıllıca ol
-4. Thread'ler 5-8 tweet uzunluğunda olmalı
-5. Emoji kullanabilirsin ama çok gerekliyse kullan
-6. Türk kültürüne uygun referanslar yap
-
-Konu: {topic}
-
-Bu konu hakkında {thread_count} farklı viral thread fikri üret. Her thread için:
-1. Thread başlığı/hook (dikkat çekici açılış)
-2. 5-8 arası tweet (her biri 280 karakter altında)
-3. Bir tweetin konusunu o konuyla sınırlı tut farklı konuları kullanmak yasaktır.
-4. Her thread'in sonunda bir soru sorarak etkileşim artır.
-5. Örneğin konusu epstein olan bir thread'de rtx4090'dan bahsetmek yasaktır.
-
-Format:
----
-THREAD 1: [Başlık]
-1. [Tweet 1]
-2. [Tweet 2]
-...
----
-THREAD 2: [Başlık]
-...
-
-Yaratıcı, provokatif ve viral potansiyeli yüksek içerikler üret."""
-
-    return generate_with_ai(prompt, provider)
-
-def parse_threads(content):
-    """OpenAI çıktısını thread listesine dönüştür"""
-    threads = []
-    current_thread = None
-    
-    lines = content.split("\n")
-    for line in lines:
-        line = line.strip()
-        if line.startswith("THREAD") and ":" in line:
-            if current_thread:
-                threads.append(current_thread)
-            title = line.split(":", 1)[1].strip() if ":" in line else line
-            current_thread = {"title": title, "tweets": []}
-        elif line and current_thread is not None:
-            # Numaralı tweet'leri al
-            if line[0].isdigit() and "." in line[:3]:
-                tweet = line.split(".", 1)[1].strip() if "." in line else line
-                if tweet and len(tweet) <= 280:
-                    current_thread["tweets"].append(tweet)
-                elif tweet and len(tweet) > 280:
-                    # 280'e kırp
-                    current_thread["tweets"].append(tweet[:277] + "...")
-    
-    if current_thread:
-        threads.append(current_thread)
-    
-    return threads
+    if finished:
+        for job in finished:
+            apply_job_result(job)
+        st.rerun()
 
 # ============================================
 # SIDEBAR
@@ -577,9 +391,14 @@ with st.sidebar:
     st.markdown("### 🤖 AI Sağlayıcı")
     
     available_providers = get_available_ai_providers()
-    provider_names = [p[0] for p in available_providers]
     provider_values = [p[1] for p in available_providers]
     
+    # Birden fazla sağlayıcı varsa istek başına otomatik seçim de sunulur
+    selectable_providers = list(available_providers)
+    if len(provider_values) > 1:
+        selectable_providers.append(("🎯 Otomatik (en hızlı)", AUTO_PROVIDER))
+    provider_names = [p[0] for p in selectable_providers]
+    
     selected_provider_name = st.selectbox(
         "AI Model Seç:",
         provider_names,
@@ -588,13 +407,29 @@ with st.sidebar:
     
     # Seçilen provider'ın değerini al
     selected_idx = provider_names.index(selected_provider_name)
-    st.session_state.ai_provider = provider_values[selected_idx]
+    st.session_state.ai_provider = selectable_providers[selected_idx][1]
+    
+    # Çoklu sağlayıcı modu (en az iki sağlayıcı yapılandırılmışsa)
+    multi_mode_options = {"Tek sağlayıcı": None, "⚡ Yarış": "race", "🔀 Birleştir": "merge"}
+    if len(provider_values) > 1:
+        multi_mode_name = st.radio(
+            "Çalışma Modu:",
+            list(multi_mode_options),
+            horizontal=True,
+            help="Yarış: prompt tüm sağlayıcılara aynı anda gider, ilk iyi cevap kazanır. "
+                 "Birleştir: tüm sağlayıcıların thread'leri yan yana gösterilir."
+        )
+    else:
+        multi_mode_name = "Tek sağlayıcı"
+    st.session_state.multi_mode = multi_mode_options[multi_mode_name]
+    st.session_state.multi_providers = provider_values
     
     # Model bilgisi
     model_info = {
         "gemini": "Gemini 3 Flash - Hızlı ve ücretsiz",
         "openai": "GPT-4o - Yüksek kalite, ücretli",
-        "anthropic": "Claude Sonnet - Detaylı analiz, ücretli"
+        "anthropic": "Claude Sonnet - Detaylı analiz, ücretli",
+        AUTO_PROVIDER: "Her istekte gecikme, hata oranı ve maliyete göre seçilir"
     }
     st.caption(model_info.get(st.session_state.ai_provider, ""))
     
@@ -603,23 +438,27 @@ with st.sidebar:
     # API Durumu
     st.markdown("### 📡 API Durumu")
     
-    # Gemini Check
-    if keys["gemini_key"]:
-        st.success("✅ Gemini")
-    else:
-        st.error("❌ Gemini")
-    
-    # OpenAI Check
-    if keys["openai_key"]:
-        st.success("✅ OpenAI (GPT)")
-    else:
-        st.warning("⚪ OpenAI (opsiyonel)")
-    
-    # Anthropic Check
-    if keys["anthropic_key"]:
-        st.success("✅ Claude")
-    else:
-        st.warning("⚪ Claude (opsiyonel)")
+    # AI sağlayıcıları: anahtar durumu + canlı devre kesici durumu
+    for label, name, key_name, required in (
+        ("Gemini", "gemini", "gemini_key", True),
+        ("OpenAI (GPT)", "openai", "openai_key", False),
+        ("Claude", "anthropic", "anthropic_key", False),
+    ):
+        if not keys[key_name]:
+            if required:
+                st.error(f"❌ {label}")
+            else:
+                st.warning(f"⚪ {label} (opsiyonel)")
+            continue
+        breaker_state = get_breaker(name).snapshot()
+        if breaker_state["state"] == "open":
+            st.error(f"🔴 {label} · devre açık, {breaker_state['retry_in']:.0f} sn sonra denenecek")
+        elif breaker_state["state"] == "half_open":
+            st.warning(f"🟡 {label} · deneme isteği bekleniyor")
+        elif breaker_state["calls"]:
+            st.success(f"✅ {label} · hata %{breaker_state['error_rate']*100:.0f}")
+        else:
+            st.success(f"✅ {label}")
     
     # X API Check
     if keys["bearer_token"]:
@@ -627,16 +466,62 @@ with st.sidebar:
     else:
         st.error("❌ X API")
     
+    # X API endpoint bütçeleri (yanıt başlıklarından)
+    x_budgets = x_access.budgets()
+    if x_budgets:
+        with st.expander("🐦 X API Limitleri"):
+            for endpoint, b in x_budgets.items():
+                remaining = "?" if b["remaining"] is None else b["remaining"]
+                status = "🔴" if b["exhausted"] else "🟢"
+                st.caption(
+                    f"{status} `{endpoint}` · {remaining}/{b['limit'] or '?'} kaldı · "
+                    f"{b['reset_in'] / 60:.0f} dk sonra sıfırlanır"
+                )
+    
+    # Client havuzu istatistikleri
+    pool_stats = client_registry.stats()
+    if pool_stats:
+        with st.expander("🔌 Bağlantı Havuzu"):
+            for name, ps in pool_stats.items():
+                st.caption(
+                    f"**{name}** · {ps['reuses']} tekrar kullanım / {ps['builds']} oluşturma "
+                    f"(%{ps['reuse_ratio']*100:.0f}) · soğuk kurulum {ps['avg_build_ms']:.0f} ms"
+                )
+    
+    # Otomatik yönlendirme ağırlıkları
+    router_stats = provider_router.stats()
+    if router_stats:
+        with st.expander("🎯 Otomatik Yönlendirme"):
+            for name, rs in router_stats.items():
+                latency = f"{rs['latency']:.1f} sn" if rs["latency"] is not None else "-"
+                st.caption(
+                    f"**{name}** · EWMA {latency} · hata %{rs['error_rate']*100:.0f} · "
+                    f"${rs['price_per_1k']:.4f}/1K token · {rs['samples']} ölçüm"
+                )
+    
+    # Gecikme ve yeniden deneme istatistikleri
+    latency_stats = call_stats.report()
+    if latency_stats:
+        with st.expander("⏱️ Gecikme & Yeniden Deneme"):
+            for name, cs in latency_stats.items():
+                p50 = f"{cs['p50']:.1f} sn" if cs["p50"] is not None else "-"
+                p95 = f"{cs['p95']:.1f} sn" if cs["p95"] is not None else "-"
+                st.caption(
+                    f"**{name}** · p50 {p50} / p95 {p95} · {cs['retries']} retry, "
+                    f"{cs['timeouts']} zaman aşımı, {cs['failures']} hata · "
+                    f"hedge {cs['hedge_wins']}/{cs['hedges']} · yedeğe geçiş {cs['fallbacks']}"
+                )
+    
     st.markdown("---")
     
     # Learned Examples Stats
-    learned = load_learned_examples()
+    learned_counts = learned_store.counts()
     st.markdown("### 📊 Öğrenme İstatistikleri")
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("👍 Beğenilen", len(learned.get("liked_threads", [])))
+        st.metric("👍 Beğenilen", learned_counts["liked"])
     with col2:
-        st.metric("👎 Beğenilmeyen", len(learned.get("disliked_threads", [])))
+        st.metric("👎 Beğenilmeyen", learned_counts["disliked"])
     
     st.markdown("---")
     
@@ -644,11 +529,10 @@ with st.sidebar:
     st.markdown("### 🗂️ Veri Yönetimi")
     
     # Export beğenilen thread'ler
-    if learned.get("liked_threads"):
-        export_data = json.dumps(learned, ensure_ascii=False, indent=2)
+    if learned_counts["liked"]:
         st.download_button(
             label="📥 Verileri İndir (JSON)",
-            data=export_data,
+            data=learned_store.export_json(),
             file_name="learned_examples_backup.json",
             mime="application/json",
             use_container_width=True
@@ -660,12 +544,28 @@ with st.sidebar:
         st.success("Veriler sıfırlandı!")
         st.rerun()
     
+    # LLM yanıt önbelleği
+    st.session_state.bypass_cache = st.checkbox(
+        "⏭️ Önbelleği atla",
+        value=st.session_state.get("bypass_cache", False),
+        help="İşaretliyse her üretim AI'a gider; taze yanıt yine önbelleğe yazılır."
+    )
+    cache_stats = response_cache.stats()
+    st.caption(
+        f"📦 Önbellek: {cache_stats['hits']} isabet / {cache_stats['misses']} ıska "
+        f"(%{cache_stats['hit_ratio']*100:.0f}) · ~{cache_stats['saved_seconds']:.0f} sn, "
+        f"~{cache_stats['saved_tokens']:,} token tasarruf"
+    )
+    
     # Clear generated content
     if st.button("🧹 Önbelleği Temizle", use_container_width=True):
+        response_cache.clear()
         if "generated_content" in st.session_state:
             del st.session_state.generated_content
         if "generated_threads" in st.session_state:
             del st.session_state.generated_threads
+        if "provider_results" in st.session_state:
+            del st.session_state.provider_results
         st.success("Önbellek temizlendi!")
         st.rerun()
     
@@ -686,6 +586,13 @@ with st.sidebar:
     )
     st.session_state.creativity = creativity
     
+    # Tekrar (near-duplicate) thread'ler
+    st.session_state.hide_duplicates = st.checkbox(
+        "♻️ Tekrar thread'leri gizle",
+        value=st.session_state.get("hide_duplicates", False),
+        help="Önceki üretimlere veya beğenilen/beğenilmeyen thread'lere çok benzeyen thread'leri gösterme."
+    )
+    
     st.markdown("---")
     st.markdown("### ℹ️ Hakkında")
     st.markdown("""
@@ -719,20 +626,7 @@ with tab1:
     
     # Session state'de persona sakla
     if "persona" not in st.session_state:
-        st.session_state.persona = """Sen @bir_adamiste adlı X hesabının AI klonu'sun. Kişiliğin: Mizah seviyesi yüksek, ironi dolu, güzel ve akıcı gündem yorumları yapan bir tip. TR gündemine (ekonomi, siyaset, futbol) hafif mizahla dokun, borsa/yazılım konularını teknik ama eğlenceli işle (başarı/fail hikayeleriyle), kişisel hayat kesitleri ekle (samimi, relatable). Hafif argo kullan (kanka gibi dostane, küfürsüz – algoritma kara listeye almayacak şekilde), emoji nadir (vurgu için 1-2 tane). İlham: Zaytung/Bobiler gibi mizahlı gündem parodisi, ama @bir_adamiste gibi kişisel/borsa odaklı. Viral için soru sor, okuyanı güldür/ düşündür.
-
-Örnek stil tweet'ler (bunları temel al, benzer üret):
-1. "Bugün enflasyon rakamları açıklandı, cüzdanım 'yeter artık' diye isyan etti. Kişisel hayatımdan: Geçen hafta borsada bir hisse aldım, şimdi kahve param yok. Sizce hangi yazılım tool'uyla piyasa tahmin edeyim? 😂 #TRGündem"
-2. "Siyasetçiler vaat üstüne vaat, ben de yazılım kodlarımda bug fix'liyorum. Mizahı: Erdoğan'ın konuşmasını dinlerken, kendi hayatıma döndüm – startup'ım battı ama yeniden kodladım. Güzel yorum: Bu ülke dirençli, değil mi? #BorsaHayatı"
-3. "Futbol gündemi: Fenerbahçe-Galatasaray derbisi öncesi, borsa gibi iniş çıkışlı. Kişisel: Benim yazılım projem de öyle, bir hata bütün sistemi çökertiyor. Yüksek mizah: Takım tutar gibi hisse tutmayın, yoksa iflas! Kim katılıyor? #YazılımMizahı"
-4. "TR'de yeni vergi yasası, cüzdanlar ağlıyor. Benim yorumum: Borsa'da short pozisyon açsam mı? Kişisel kesit: Geçen ay bir app kodladım, ama gündem değişince pivot ettim. Güldüren twist: Hayat da öyle, değil mi kanka? 😏 #EkonomiGündemi"
-5. "Yazılım dünyasında AI hype'ı, ama TR gündeminde işsizlik. Mizahlı: Ben kendi botumu yazdım, şimdi işimi elimden alacak mı? Kişisel: Hayatımdan, ilk kodumda infinite loop'a girdim – tıpkı enflasyon gibi. Siz ne düşünüyorsunuz? #AIGündem"
-
-Her üretimde:
-- Thread'leri 4-6 tweet'lik tut, numaralandır (1/6 gibi).
-- Her tweet 280 karakter aşmasın.
-- Viral potansiyel: Soru sor, etkileşim artır.
-- Para kazanma için: Dolaylı affiliate (borsa tool önerisi gibi) ekle, ama doğal tut."""
+        st.session_state.persona = DEFAULT_PERSONA
     
     # Persona text area
     persona_text = st.text_area(
@@ -756,11 +650,15 @@ Her üretimde:
                 if error:
                     st.error(f"X API Hatası: {error}")
                 else:
-                    user, user_error = get_user_info(client, "bir_adamiste")
+                    user_id, user_error = resolve_user_id(client, DEFAULT_USERNAME)
                     if user_error:
                         st.error(f"Kullanıcı bulunamadı: {user_error}")
                     else:
-                        tweets, tweet_error = get_user_tweets(client, user.id, max_results=5)
+                        # Sadece yeni tweet'ler çekilir; liste yerel depodan okunur
+                        _, sync_error = sync_user_timeline(client, user_id, max_pages=INTERACTIVE_SYNC_PAGES)
+                        if sync_error:
+                            st.caption(f"⏳ {sync_error}")
+                        tweets = get_stored_tweets(user_id, limit=5)
                         if tweets:
                             tweet_examples = "\n\nSon tweet örneklerim:\n"
                             for i, t in enumerate(tweets, 1):
@@ -776,10 +674,9 @@ Her üretimde:
     st.markdown("---")
     st.markdown("### 📚 Öğrenilmiş Örnekler")
     
-    learned = load_learned_examples()
-    if learned.get("liked_threads"):
-        with st.expander(f"Beğenilen Thread'ler ({len(learned['liked_threads'])})"):
-            for i, thread in enumerate(learned["liked_threads"][-5:], 1):  # Son 5
+    if learned_counts["liked"]:
+        with st.expander(f"Beğenilen Thread'ler ({learned_counts['liked']})"):
+            for i, thread in enumerate(learned_store.last_liked(5), 1):  # Son 5
                 st.markdown(f"**{i}.** {thread.get('timestamp', 'N/A')}")
                 if isinstance(thread.get("thread"), dict):
                     st.markdown(f"_{thread['thread'].get('title', 'Başlık yok')}_")
@@ -795,82 +692,108 @@ with tab2:
     
     if st.button("🔄 Gündem'i Yenile", use_container_width=True):
         st.session_state.trends_loaded = True
+        refresh_trends()
     
-    # Trending topics al
-    trends = get_trending_topics(None)
+    # Gündem anlık görüntüsü (kategori indeksi ve hacme göre ilk 5 hazır gelir)
+    trends = get_trends()
     
-    # Kategorilere ayır
+    # Kategoriler
     categories = {
-        "ekonomi": {"icon": "💰", "name": "Ekonomi", "topics": []},
-        "spor": {"icon": "⚽", "name": "Spor", "topics": []},
-        "siyaset": {"icon": "🏛️", "name": "Siyaset", "topics": []},
-        "teknoloji": {"icon": "💻", "name": "Teknoloji", "topics": []},
-        "mizah": {"icon": "😂", "name": "Mizah", "topics": []},
-        "diger": {"icon": "📌", "name": "Diğer", "topics": []},
+        "ekonomi": {"icon": "💰", "name": "Ekonomi"},
+        "spor": {"icon": "⚽", "name": "Spor"},
+        "siyaset": {"icon": "🏛️", "name": "Siyaset"},
+        "teknoloji": {"icon": "💻", "name": "Teknoloji"},
+        "mizah": {"icon": "😂", "name": "Mizah"},
+        "diger": {"icon": "📌", "name": "Diğer"},
     }
     
-    for trend in trends:
-        cat = trend.get("category", categorize_topic(trend["name"]))
-        if cat in categories:
-            categories[cat]["topics"].append(trend)
-    
     # Kategorileri göster
+    # Canlı akışta son saatte hızla yükselen konular
+    rising_topics = [t for t in trends.topics if t.get("rising")]
+    if rising_topics:
+        st.markdown("### 🚀 Yükselenler")
+        st.markdown(" · ".join(
+            f"**{t['name']}** ({t['volume_1h']}/saat, {t['growth']:.1f}x)"
+            for t in sorted(rising_topics, key=lambda t: t["growth"], reverse=True)[:8]
+        ))
+    
     cols = st.columns(3)
     col_idx = 0
     
     for cat_key, cat_data in categories.items():
-        if cat_data["topics"]:
+        top_topics = trends.top(cat_key)
+        if top_topics:
             with cols[col_idx % 3]:
                 st.markdown(f"### {cat_data['icon']} {cat_data['name']}")
-                for topic in cat_data["topics"][:5]:  # Max 5
+                for topic in top_topics:
                     volume = topic.get("tweet_volume", 0)
                     volume_str = f"{volume/1000:.0f}K" if volume >= 1000 else str(volume)
+                    rising_badge = " 🚀" if topic.get("rising") else ""
                     st.markdown(f"""
                     <div class="thread-card">
-                        <strong>{topic['name']}</strong><br>
+                        <strong>{topic['name']}</strong>{rising_badge}<br>
                         <small>📊 {volume_str} tweet</small>
                     </div>
                     """, unsafe_allow_html=True)
             col_idx += 1
     
     st.markdown("---")
-    st.info("💡 **Not:** X API Free tier'da trending topics sınırlı. Yukarıdaki örnek gündem konularıdır.")
+    if trend_engine is not None and trend_engine.tweets:
+        feed = trend_engine.stats()
+        st.caption(
+            f"📡 Canlı akış ({feed['feed']}): {feed['tweets']:,} tweet işlendi, son tweet "
+            f"{datetime.fromtimestamp(feed['last_event']).strftime('%d.%m %H:%M')}. "
+            "Hacimler son 24 saatin tahminidir."
+        )
+    else:
+        st.info("💡 **Not:** X API Free tier'da trending topics sınırlı. Yukarıdaki örnek gündem konularıdır. "
+                "Yerel bir tweet akışından gerçek gündem için `TREND_FEED` ayarla.")
     
     # En İyi Paylaşım Saatleri Widget'ı
     st.markdown("---")
     st.markdown("### ⏰ En İyi Paylaşım Saatleri")
     
-    # Türkiye saati için en iyi saatler
-    posting_times = [
-        {"time": "08:00 - 10:00", "label": "Sabah", "score": 85, "desc": "İşe gidiş, kahvaltı scrolling"},
-        {"time": "12:00 - 14:00", "label": "Öğle", "score": 70, "desc": "Öğle molası, yemek arası"},
-        {"time": "17:00 - 19:00", "label": "Akşam", "score": 90, "desc": "İşten çıkış, yoğun trafik"},
-        {"time": "21:00 - 23:00", "label": "Gece", "score": 95, "desc": "Prime time, en yüksek etkileşim"},
-        {"time": "00:00 - 02:00", "label": "Gece Geç", "score": 60, "desc": "Gece kuşları, niş kitle"},
-    ]
+    # Depodaki tweet'lerin gerçek etkileşim oranlarından (Türkiye saati)
+    posting_model = get_posting_model()
+    posting_table = posting_model.table()
+    now_tr = datetime.now(TURKEY_TZ)
+    if posting_table["data_driven"]:
+        st.caption(f"📊 {posting_table['tweets']:,} tweet'in etkileşim oranına (etkileşim / gösterim) göre, "
+                   f"bugünün ({DAY_NAMES[now_tr.weekday()]}) en iyi saatleri.")
+    else:
+        st.caption("Henüz yeterli tweet verisi yok; genel saat profili gösteriliyor. "
+                   "Profil sekmesinden tweet'lerini senkronladıkça saatler hesabına göre güncellenir.")
+    
+    posting_times = posting_model.best_slots(5, day=now_tr.weekday())
     
     cols = st.columns(len(posting_times))
     for i, pt in enumerate(posting_times):
         with cols[i]:
             color_class = "time-good" if pt["score"] >= 80 else ("time-medium" if pt["score"] >= 60 else "time-bad")
+            if posting_table["data_driven"]:
+                desc = f"%{pt['rate'] * 100:.2f} (%{pt['low'] * 100:.2f}–{pt['high'] * 100:.2f}) · {pt['tweets']} tweet"
+            else:
+                desc = "Genel profil"
             st.markdown(f"""
             <div class="time-widget">
-                <strong>{pt['label']}</strong><br>
+                <strong>{pt['day']}</strong><br>
                 <small>{pt['time']}</small>
                 <div class="time-bar">
                     <div class="time-fill {color_class}" style="width: {pt['score']}%"></div>
                 </div>
-                <small style="color: #71767b;">{pt['desc']}</small>
+                <small style="color: #71767b;">{desc}</small>
             </div>
             """, unsafe_allow_html=True)
     
-    # Şu anki saat analizi
-    from datetime import datetime
-    current_hour = datetime.now().hour
+    if posting_table["data_driven"]:
+        week_best = ", ".join(f"{pt['day']} {pt['time'][:5]}" for pt in posting_model.best_slots(5))
+        st.markdown(f"**Haftanın en iyi saatleri:** {week_best}")
     
-    if 8 <= current_hour < 10 or 17 <= current_hour < 19 or 21 <= current_hour < 23:
-        st.success("🟢 **Şu an paylaşım için uygun bir saat!**")
-    elif 12 <= current_hour < 14 or 0 <= current_hour < 2:
+    # Şu anki saat analizi (haftanın 168 saati içindeki sırası)
+    current = posting_model.current_slot(now_tr)
+    if current["percentile"] >= 75:
+        st.success(f"🟢 **Şu an paylaşım için uygun bir saat!** (haftanın saatlerinin %{current['percentile']:.0f}'inden iyi)")
+    elif current["percentile"] >= 40:
         st.info("🟡 **Orta seviye etkileşim bekleniyor.**")
     else:
         st.warning("🔴 **Düşük etkileşim saati. Prime time'ı bekleyebilirsin.**")
@@ -882,6 +805,9 @@ with tab3:
     st.markdown("## ✍️ İçerik Üretme")
     st.markdown("Gündem konusu seç veya yaz, viral içerik fikirleri al.")
     
+    # Üretimler arka planda çalışır; sayfa kullanılmaya devam edilebilir
+    render_jobs_panel()
+    
     # İçerik tipi seçimi
     content_type = st.radio(
         "📝 İçerik Tipi:",
@@ -892,16 +818,15 @@ with tab3:
     st.markdown("---")
     
     # Konu seçimi
-    trends = get_trending_topics(None)
-    topic_options = ["-- Manuel gir --"] + [t["name"] for t in trends]
+    trends = get_trends()
     
-    selected_topic = st.selectbox("📌 Gündem Konusu Seç:", topic_options)
+    selected_topic = st.selectbox("📌 Gündem Konusu Seç:", trends.options)
     
     manual_topic = ""
-    if selected_topic == "-- Manuel gir --":
+    if selected_topic == MANUAL_TOPIC:
         manual_topic = st.text_input("✏️ Konu yaz:", placeholder="Örn: Yapay zeka işsizlik yaratacak mı?")
     
-    final_topic = manual_topic if selected_topic == "-- Manuel gir --" else selected_topic
+    final_topic = manual_topic if selected_topic == MANUAL_TOPIC else selected_topic
     
     st.markdown("---")
     
@@ -909,114 +834,63 @@ with tab3:
     if content_type == "🧵 Thread (Çoklu Tweet)":
         # Seçili AI sağlayıcıyı göster
         provider = st.session_state.get("ai_provider", "gemini")
-        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude"}
-        st.info(f"**Aktif AI:** {provider_display.get(provider, provider)}")
+        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude", AUTO_PROVIDER: "🎯 Otomatik"}
+        multi_mode = st.session_state.get("multi_mode")
+        multi_providers = st.session_state.get("multi_providers", [provider])
+        if multi_mode:
+            mode_label = "⚡ Yarış" if multi_mode == "race" else "🔀 Birleştir"
+            st.info(f"**Aktif AI:** {mode_label} — " + ", ".join(provider_display.get(p, p) for p in multi_providers))
+        else:
+            st.info(f"**Aktif AI:** {provider_display.get(provider, provider)}")
         
         if st.button("🚀 Thread Fikirleri Üret", use_container_width=True, type="primary"):
             if not final_topic:
                 st.warning("Lütfen bir konu seç veya yaz!")
             else:
-                with st.spinner(f"AI içerik üretiyor ({provider_display.get(provider, provider)})... 🤖"):
-                    learned = load_learned_examples()
-                    thread_count = st.session_state.get("thread_count", 5)
-                    creativity = st.session_state.get("creativity", "Yüksek")
-                    content, gen_error = generate_thread_ideas(
-                        final_topic,
-                        st.session_state.get("persona", "Kara mizah seven villain karakter"),
-                        learned,
-                        thread_count,
-                        creativity,
-                        provider
-                    )
-                    
-                    if gen_error:
-                        st.error(f"İçerik üretim hatası: {gen_error}")
-                    else:
-                        st.session_state.generated_content = content
-                        st.session_state.generated_threads = parse_threads(content)
-                        st.success("Thread'ler üretildi!")
+                submit_thread_job(final_topic, auto_apply=True)
+                st.toast(f"🧵 '{final_topic}' için üretim başladı")
+        
+        # Birden fazla konuyu aynı anda kuyruğa al
+        with st.expander("📚 Birden Fazla Konuyu Sıraya Al"):
+            queued_topics = st.multiselect("Konular:", trends.names, key="queued_topics")
+            if st.button("📥 Sıraya Al", disabled=not queued_topics, use_container_width=True):
+                for topic in queued_topics:
+                    submit_thread_job(topic)
+                st.success(f"{len(queued_topics)} konu sıraya alındı. Bitenleri 📂 ile açabilirsin.")
         
         # Üretilen içeriği göster
         if "generated_threads" in st.session_state and st.session_state.generated_threads:
             st.markdown("---")
             st.markdown("### 📝 Üretilen Thread'ler")
             
-            for i, thread in enumerate(st.session_state.generated_threads):
-                with st.expander(f"**Thread {i+1}:** {thread.get('title', 'Başlık yok')}", expanded=i==0):
-                    # Thread'i tek metin olarak hazırla (kopyalama için)
-                    full_thread_text = f"🧵 {thread.get('title', '')}\n\n"
-                    for j, tweet in enumerate(thread.get("tweets", []), 1):
-                        full_thread_text += f"{j}/{len(thread.get('tweets', []))} {tweet}\n\n"
-                    
-                    # Görünüm modu seçimi
-                    view_mode = st.radio(
-                        "Görünüm:",
-                        ["📝 Normal", "🐦 X Önizleme"],
-                        horizontal=True,
-                        key=f"view_mode_{i}"
-                    )
-                    
-                    if view_mode == "📝 Normal":
-                        # Tweet'leri göster (normal mod)
-                        for j, tweet in enumerate(thread.get("tweets", []), 1):
-                            char_count = len(tweet)
-                            color = "green" if char_count <= 280 else "red"
-                            st.markdown(f"""
-                            <div class="thread-card">
-                                <strong>{j}/{len(thread.get('tweets', []))}.</strong> {tweet}
-                                <br><small style="color:{color}">({char_count}/280)</small>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        # X-style preview
-                        for j, tweet in enumerate(thread.get("tweets", []), 1):
-                            char_count = len(tweet)
-                            st.markdown(f"""
-                            <div class="tweet-preview">
-                                <div class="tweet-header">
-                                    <div class="tweet-avatar">BA</div>
-                                    <div>
-                                        <span class="tweet-author">Bir Adamiste</span><br>
-                                        <span class="tweet-handle">@bir_adamiste · {j}/{len(thread.get('tweets', []))}</span>
-                                    </div>
-                                </div>
-                                <div class="tweet-content">{tweet}</div>
-                                <div class="tweet-footer">
-                                    <span class="tweet-action">💬 --</span>
-                                    <span class="tweet-action">🔁 --</span>
-                                    <span class="tweet-action">❤️ --</span>
-                                    <span class="tweet-action">📊 --</span>
-                                    <span style="color: {'#28a745' if char_count <= 280 else '#dc3545'}">{char_count}/280</span>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    st.markdown("---")
-                    
-                    # Aksiyon butonları
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if st.button(f"👍 Beğendim", key=f"like_{i}", use_container_width=True):
-                            add_liked_thread(thread)
-                            st.success("Thread beğenildi ve kaydedildi!")
-                    with col2:
-                        if st.button(f"👎 Beğenmedim", key=f"dislike_{i}", use_container_width=True):
-                            add_disliked_thread(thread)
-                            st.info("Feedback kaydedildi.")
-                    with col3:
-                        st.download_button(
-                            label="📋 İndir",
-                            data=full_thread_text,
-                            file_name=f"thread_{i+1}.txt",
-                            mime="text/plain",
-                            key=f"copy_{i}",
-                            use_container_width=True
-                        )
-                    
-                    # Tweet'leri tek tek kopyalama alanı
-                    with st.expander("📋 Tweet'leri Tek Tek Kopyala"):
-                        for j, tweet in enumerate(thread.get("tweets", []), 1):
-                            st.code(tweet, language=None)
+            # Çoklu sağlayıcı sonuçlarını yan yana karşılaştır
+            if st.session_state.get("provider_results"):
+                result_cols = st.columns(len(st.session_state.provider_results))
+                for col, r in zip(result_cols, st.session_state.provider_results):
+                    with col:
+                        st.markdown(f"**{provider_display.get(r['provider'], r['provider'])}** · {r['elapsed']:.1f} sn")
+                        if r["threads"]:
+                            for thread in r["threads"]:
+                                st.caption(f"🧵 {thread.get('title', 'Başlık yok')} ({len(thread.get('tweets', []))} tweet)")
+                        else:
+                            st.caption(f"❌ {r['error'] or 'Thread bulunamadı'}")
+            
+            # Görünüm tüm thread'ler için tek seçim; HTML thread başına bir kez üretilir
+            view_mode = st.radio("Görünüm:", list(THREAD_VIEW_MODES), horizontal=True, key="thread_view_mode")
+            threads = st.session_state.generated_threads
+            lazy = len(threads) > LAZY_THREAD_THRESHOLD
+            for i, (key, thread) in enumerate(zip(thread_widget_keys(threads), threads)):
+                source = f"[{provider_display.get(thread['provider'], thread['provider'])}] " if thread.get("provider") else ""
+                duplicate_mark = "♻️ " if thread.get("duplicate_of") else ""
+                label = f"**Thread {i+1}:** {duplicate_mark}{source}{thread.get('title', 'Başlık yok')}"
+                if lazy:
+                    body = lazy_expander(label, key=f"thread_open_{key}", expanded=i == 0)
+                    if body is None:
+                        continue
+                else:
+                    body = st.expander(label, expanded=i == 0)
+                with body:
+                    render_thread_body(i, key, thread, THREAD_VIEW_MODES[view_mode])
         
         # Raw output göster (opsiyonel)
         if "generated_content" in st.session_state:
@@ -1025,7 +899,7 @@ with tab3:
     
     elif content_type == "💬 Tek Tweet":
         provider = st.session_state.get("ai_provider", "gemini")
-        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude"}
+        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude", AUTO_PROVIDER: "🎯 Otomatik"}
         st.info(f"**Aktif AI:** {provider_display.get(provider, provider)}")
         
         tweet_count = st.slider("Üretilecek Tweet Sayısı", 1, 20, 10)
@@ -1034,33 +908,14 @@ with tab3:
             if not final_topic:
                 st.warning("Lütfen bir konu seç veya yaz!")
             else:
-                with st.spinner(f"AI tweet üretiyor ({provider_display.get(provider, provider)})... 🤖"):
-                    creativity = st.session_state.get("creativity", "Yüksek")
-                    persona = st.session_state.get("persona", "Kara mizah seven villain karakter")
-                    
-                    prompt = f"""Sen viral Twitter içerik üreticisisin.
-
-PERSONA: {persona}
-
-Konu: {final_topic}
-
-Bu konu hakkında {tweet_count} adet bağımsız, viral potansiyelli tek tweet üret.
-- Her tweet maksimum 280 karakter olmalı
-- Yaratıcılık seviyesi: {creativity}
-- Her tweet farklı bir bakış açısı sunmalı
-- Emoji'leri az kullan, sadece gerekiyorsa
-
-Format:
-1. [Tweet 1]
-2. [Tweet 2]
-..."""
-
-                    result, error = generate_with_ai(prompt, provider)
-                    if error:
-                        st.error(f"Hata: {error}")
-                    else:
-                        st.session_state.single_tweets = result
-                        st.success("Tweet'ler üretildi!")
+                prompt = build_single_tweet_prompt(
+                    final_topic,
+                    st.session_state.get("persona", "Kara mizah seven villain karakter"),
+                    tweet_count,
+                    st.session_state.get("creativity", "Yüksek")
+                )
+                submit_text_job("single_tweet", final_topic, prompt)
+                st.toast(f"💬 Tweet'ler üretiliyor ({provider_display.get(provider, provider)})")
         
         # Üretilen tweet'leri göster
         if "single_tweets" in st.session_state:
@@ -1073,38 +928,15 @@ Format:
     
     elif content_type == "🏷️ Hashtag Öner":
         provider = st.session_state.get("ai_provider", "gemini")
-        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude"}
+        provider_display = {"gemini": "🌟 Gemini", "openai": "🤖 GPT-4", "anthropic": "🧠 Claude", AUTO_PROVIDER: "🎯 Otomatik"}
         st.info(f"**Aktif AI:** {provider_display.get(provider, provider)}")
         
         if st.button("🏷️ Hashtag'ler Öner", use_container_width=True, type="primary"):
             if not final_topic:
                 st.warning("Lütfen bir konu seç veya yaz!")
             else:
-                with st.spinner(f"Hashtag'ler analiz ediliyor ({provider_display.get(provider, provider)})... 🏷️"):
-                    prompt = f"""Sen Türkiye'de X (Twitter) için hashtag uzmanısın.
-
-Konu: {final_topic}
-
-Bu konu için en viral potansiyelli hashtag'leri öner:
-
-1. **Ana Hashtag'ler (3-5 adet):** Konuyla doğrudan ilgili, popüler
-2. **Trend Hashtag'ler (3-5 adet):** Güncel trend olan, ilgili
-3. **Niche Hashtag'ler (3-5 adet):** Daha spesifik, hedefli kitle
-4. **Mizah Hashtag'leri (3-5 adet):** Eğlenceli, dikkat çekici
-
-Her hashtag için:
-- Hashtag adı
-- Tahmini erişim potansiyeli (düşük/orta/yüksek)
-- Ne zaman kullanılmalı (açıklama)
-
-Türkçe hashtag'lere öncelik ver ama gerekirse İngilizce de kullanabilirsin."""
-
-                    result, error = generate_with_ai(prompt, provider)
-                    if error:
-                        st.error(f"Hata: {error}")
-                    else:
-                        st.session_state.hashtag_suggestions = result
-                        st.success("Hashtag'ler önerildi!")
+                submit_text_job("hashtag", final_topic, build_hashtag_prompt(final_topic))
+                st.toast(f"🏷️ Hashtag'ler analiz ediliyor ({provider_display.get(provider, provider)})")
         
         # Önerilen hashtag'leri göster
         if "hashtag_suggestions" in st.session_state:
@@ -1117,7 +949,16 @@ Türkçe hashtag'lere öncelik ver ama gerekirse İngilizce de kullanabilirsin."
 # ============================================
 with tab4:
     st.markdown("## 📊 Profil İstatistikleri")
-    st.markdown("@bir_adamiste hesabının performans analizi")
+    st.markdown("Hesapların performans analizi ve karşılaştırması")
+    
+    # Birden fazla hesap (rakipler dahil) tek seferde karşılaştırılabilir
+    handles_text = st.text_input(
+        "👥 Hesaplar (virgülle ayır, ilki ana hesap):",
+        value=DEFAULT_USERNAME,
+        key="profile_handles"
+    )
+    usernames = parse_usernames(handles_text) or [DEFAULT_USERNAME]
+    primary_username = usernames[0]
     
     if st.button("🔄 İstatistikleri Güncelle", use_container_width=True):
         with st.spinner("Veriler çekiliyor..."):
@@ -1125,18 +966,58 @@ with tab4:
             if error:
                 st.error(f"X API Hatası: {error}")
             else:
-                user, user_error = get_user_info(client, "bir_adamiste")
-                if user_error:
-                    st.error(f"Kullanıcı bulunamadı: {user_error}")
+                # Tüm hesaplar 100'lük gruplarla tek istekte çözülür
+                users, lookup_error = get_users_info(client, usernames)
+                user = users.get(primary_username.lower())
+                if user is None:
+                    st.error(f"Kullanıcı bulunamadı: {lookup_error or '@' + primary_username}")
                 else:
                     st.session_state.user_data = user
                     st.session_state.user_metrics = user.public_metrics
                     
-                    # Tweet'leri çek
-                    tweets, tweet_error = get_user_tweets(client, user.id, max_results=5)
-                    st.session_state.recent_tweets = tweets if tweets else []
+                    # Zaman tünelini yerel depoya senkronla (ilk seferde geçmiş, sonra since_id)
+                    _, sync_error = sync_user_timeline(client, user.id, max_pages=INTERACTIVE_SYNC_PAGES)
+                    st.session_state.recent_tweets = get_stored_tweets(user.id, limit=5)
+                    st.session_state.stored_tweet_count = tweet_store.count(user.id)
                     
-                    st.success("Veriler güncellendi!")
+                    # Limit dolduysa veriler önbellekten/depodan gelir; yenileme arka planda planlanır
+                    notice = x_access.notice(("users", tuple(u.lower() for u in usernames[:100])))
+                    if notice:
+                        st.info(f"⏳ {notice}")
+                    if sync_error:
+                        st.warning(f"Yeni tweet'ler alınamadı, depodaki veriler gösteriliyor: {sync_error}")
+                    elif not notice:
+                        st.success("Veriler güncellendi!")
+                
+                if len(usernames) > 1:
+                    rows, account_errors = compare_accounts(client, usernames)
+                    st.session_state.account_comparison = rows
+                    for username, account_error in account_errors.items():
+                        st.caption(f"⚠️ @{username}: {account_error}")
+                else:
+                    st.session_state.pop("account_comparison", None)
+    
+    # Hesap karşılaştırma tablosu
+    if st.session_state.get("account_comparison"):
+        st.markdown("### 🆚 Hesap Karşılaştırması")
+        st.dataframe(
+            [
+                {
+                    "Hesap": f"@{r['username']}",
+                    "👥 Takipçi": r["followers"],
+                    "📈 Oran": round(r["ratio"], 2),
+                    "❤️ Ort. Beğeni": round(r["avg_likes"], 1),
+                    "🔄 Ort. RT": round(r["avg_retweets"], 1),
+                    "💬 Ort. Yanıt": round(r["avg_replies"], 1),
+                    "⚡ Etkileşim %": round(r["engagement_rate"], 3),
+                    "🧮 Örnek Tweet": r["sampled_tweets"],
+                }
+                for r in st.session_state.account_comparison
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.markdown("---")
     
     # Kullanıcı verileri varsa göster
     if "user_data" in st.session_state:
@@ -1161,20 +1042,14 @@ with tab4:
         
         # Son tweet'ler
         st.markdown("### 📱 Son Tweet'ler")
+        if st.session_state.get("stored_tweet_count"):
+            st.caption(f"🗄️ Yerel depoda {st.session_state.stored_tweet_count:,} tweet var")
         
         if "recent_tweets" in st.session_state and st.session_state.recent_tweets:
             tweets = st.session_state.recent_tweets
             
-            total_likes = 0
-            total_retweets = 0
-            total_quotes = 0
-            
             for tweet in tweets:
                 tm = tweet.public_metrics
-                total_likes += tm.get("like_count", 0)
-                total_retweets += tm.get("retweet_count", 0)
-                total_quotes += tm.get("quote_count", 0)
-                
                 st.markdown(f"""
                 <div class="thread-card">
                     {tweet.text[:200]}{'...' if len(tweet.text) > 200 else ''}
@@ -1187,23 +1062,120 @@ with tab4:
                 </div>
                 """, unsafe_allow_html=True)
             
-            # Ortalama etkileşim
+            # Depodaki tüm zaman tüneli üzerinden analiz (veri değişmedikçe önbellekten gelir)
+            analytics = get_profile_analytics(user.id, metrics["followers_count"])
+            summary = analytics.summary()
+            
+            if summary:
+                st.markdown("---")
+                st.markdown("### 📊 Ortalama Etkileşim")
+                st.caption(f"Depodaki {summary['tweets']:,} tweet üzerinden; oran = etkileşim / takipçi")
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("❤️ Ort. Beğeni", f"{summary['avg_likes']:.1f}")
+                with col2:
+                    st.metric("🔄 Ort. RT", f"{summary['avg_retweets']:.1f}")
+                with col3:
+                    st.metric("💬 Ort. Quote", f"{summary['avg_quotes']:.1f}")
+                with col4:
+                    st.metric(
+                        "⚡ Etkileşim % (medyan)",
+                        f"{summary['median_engagement_rate']:.3f}",
+                        help=f"Ortalama: {summary['avg_engagement_rate']:.3f}"
+                    )
+                st.caption("Etkileşim oranı yüzdelikleri: " + " · ".join(
+                    f"p{p} %{v['engagement_rate']:.3f} ({v['likes']:.0f} ❤️)" for p, v in analytics.percentiles.items()
+                ))
+                
+                if analytics.count >= 2:
+                    trend = analytics.trend()
+                    st.line_chart({
+                        "Tarih": [datetime.fromtimestamp(epoch) for epoch in trend["epoch"]],
+                        "Oran %": trend["engagement_rate"],
+                        "Son 7 tweet": trend["rolling_7"],
+                        "Son 30 tweet": trend["rolling_30"],
+                    }, x="Tarih")
+                
+                # Medyandan çok uzak (robust z-skoru yüksek) tweet'ler
+                viral_tweets = analytics.viral(5)
+                if viral_tweets:
+                    st.markdown(f"### 🚀 Viral Tweet'ler ({summary['viral_count']})")
+                    for vt in viral_tweets:
+                        st.markdown(f"""
+                        <div class="thread-card">
+                            {vt['text'][:200]}{'...' if len(vt['text']) > 200 else ''}
+                            <br><small>
+                                ⚡ {vt['interactions']:,} etkileşim (%{vt['engagement_rate']:.2f}) | 
+                                z = {vt['z']:.1f} | 
+                                🏷️ {vt['category']} |
+                                📅 {datetime.fromtimestamp(vt['created_at']).strftime('%d/%m/%Y')}
+                            </small>
+                        </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    st.caption(f"Viral (z > {VIRAL_Z}) tweet yok.")
+                
+                st.markdown("### 🏷️ Kategorilere Göre")
+                st.dataframe(
+                    [
+                        {
+                            "Kategori": row["category"],
+                            "Tweet": row["tweets"],
+                            "Pay %": round(row["share"], 1),
+                            "Ort. Etkileşim": round(row["avg_interactions"], 1),
+                            "Ort. Oran %": round(row["avg_engagement_rate"], 3),
+                        }
+                        for row in analytics.by_category
+                    ],
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            # Etkileşim eğrileri: depodaki tüm tweet'lerin metrikleri 100'lük gruplarla yenilenir
             st.markdown("---")
-            st.markdown("### 📊 Ortalama Etkileşim")
+            st.markdown("### 📈 Etkileşim Eğrileri")
             
-            tweet_count = len(tweets)
-            col1, col2, col3, col4 = st.columns(4)
+            # Yenileme sonucu st.rerun'dan sonra gösterilir (rerun öncesi mesajlar kaybolur)
+            notice = st.session_state.pop("metrics_refresh_notice", None)
+            if notice:
+                kind, message = notice
+                (st.warning if kind == "warning" else st.success)(message)
             
-            with col1:
-                st.metric("❤️ Ort. Beğeni", f"{total_likes/tweet_count:.1f}")
-            with col2:
-                st.metric("🔄 Ort. RT", f"{total_retweets/tweet_count:.1f}")
-            with col3:
-                st.metric("💬 Ort. Quote", f"{total_quotes/tweet_count:.1f}")
-            with col4:
-                # Genel skor (basit formül)
-                score = (total_likes + total_retweets*2 + total_quotes*3) / tweet_count
-                st.metric("⭐ Genel Skor", f"{score:.1f}")
+            if st.button("📈 Tüm Tweet Metriklerini Yenile", use_container_width=True):
+                with st.spinner("Metrikler yenileniyor..."):
+                    client, error = get_twitter_client()
+                    if error:
+                        st.error(f"X API Hatası: {error}")
+                    else:
+                        refreshed, requests_made, refresh_error = refresh_tweet_metrics(client, user.id)
+                        st.session_state.recent_tweets = get_stored_tweets(user.id, limit=5)
+                        if refresh_error:
+                            st.session_state.metrics_refresh_notice = (
+                                "warning", f"{refreshed} tweet yenilendi, kalanlar için: {refresh_error}"
+                            )
+                        else:
+                            st.session_state.metrics_refresh_notice = (
+                                "success", f"{refreshed} tweet {requests_made} istekle yenilendi."
+                            )
+                        st.rerun()
+            
+            st.caption(f"🗂️ {tweet_store.snapshot_count()} metrik anlık görüntüsü")
+            chart_tweet = st.selectbox(
+                "Tweet seç:",
+                tweets,
+                format_func=lambda t: t.text[:80] + ("..." if len(t.text) > 80 else "")
+            )
+            curve = tweet_store.engagement_curve(chart_tweet.id)
+            if len(curve) >= 2:
+                st.line_chart({
+                    "Zaman": [datetime.fromtimestamp(taken_at) for taken_at, _ in curve],
+                    "❤️ Beğeni": [m["like_count"] for _, m in curve],
+                    "🔄 RT": [m["retweet_count"] for _, m in curve],
+                    "💬 Yanıt": [m["reply_count"] for _, m in curve],
+                }, x="Zaman")
+            else:
+                st.caption("Eğri için en az iki metrik yenilemesi gerekli.")
         else:
             st.info("Tweet verisi yok. Yukarıdaki butona tıklayarak güncelle.")
     else:
@@ -1320,11 +1292,17 @@ with tab5:
         
         - Beğendiğin thread'ler sonraki üretimlerde "örnek" olarak kullanılır
         - AI zamanla senin tarzını öğrenir
-        - En son 3 beğenilen thread prompt'a eklenir
+        - Seçilen konuyla en ilgili 3 beğenilen thread prompt'a eklenir (yoksa en son 3)
+        - Konuyla ilgili beğenilmeyen thread'ler "kaçınılacak" örnek olarak eklenir
         
         ### Veri Temizleme
         
-        `learned_examples.json` dosyasını silerek öğrenmeyi sıfırlayabilirsin:
+        Kayıtlar önce `learned_examples.jsonl` günlüğüne eklenir, günlük büyüdükçe
+        `learned_examples.json` dosyasına sıkıştırılır.
+        
+        Öğrenmeyi sıfırlamak için kenar çubuğundaki "🗑️ Öğrenme Verilerini Sıfırla"
+        butonunu kullan ya da `learned_examples.jsonl` dosyasını silip
+        `learned_examples.json` dosyasını şu hale getir:
         ```json
         {
           "liked_threads": [],
@@ -1440,8 +1418,8 @@ with tab5:
         
         ### S: X hesabımı değiştirebilir miyim?
         
-        **C:** Evet, `app.py` dosyasında `"bir_adamiste"` yazan yerleri kendi 
-        kullanıcı adınla değiştir.
+        **C:** Evet, `.env` dosyasına `X_USERNAME=kullanici_adin` ekle. Profil
+        sekmesine virgülle birden fazla hesap yazarak rakiplerle karşılaştırabilirsin.
         
         ---
         
@@ -0,0 +1,185 @@
+"""
+Async AI Katmanı
+================
+generate_with_ai'nin asyncio karşılığı: AsyncOpenAI, AsyncAnthropic ve Gemini
+generate_content_async kullanır. Her istek sağlayıcının kota kovalarından
+(rate_limits) geçer, böylece toplu işler 429'a çarpmak yerine sırada bekler.
+Zaman aşımı, yeniden deneme, hedging, devre kesici ve yedek sağlayıcı zinciri
+senkron yoldakiyle aynıdır (resilience).
+"""
+
+import asyncio
+import time
+import weakref
+
+from clients import build_async_http_client
+from core import (
+    AI_MODELS,
+    ANTHROPIC_AVAILABLE,
+    OPENAI_AVAILABLE,
+    build_thread_prompt,
+    get_api_keys,
+    get_fallback_chain,
+    get_gemini_model,
+    resolve_provider,
+)
+from llm_cache import cache_key, response_cache
+from rate_limits import EXPECTED_OUTPUT_TOKENS, estimate_tokens, get_limiter
+from resilience import acall_with_retries, call_stats, get_breaker, get_policy
+from router import provider_router
+
+if OPENAI_AVAILABLE:
+    from openai import AsyncOpenAI
+
+if ANTHROPIC_AVAILABLE:
+    import anthropic
+
+# Async client'lar oluşturuldukları event loop'a bağlıdır; loop başına saklanır
+_loop_clients = weakref.WeakKeyDictionary()
+
+
+def _clients_for_running_loop():
+    return _loop_clients.setdefault(asyncio.get_running_loop(), {})
+
+
+def get_async_openai_client():
+    """Çalışan event loop için AsyncOpenAI client'ı (loop başına bir tane)"""
+    if not OPENAI_AVAILABLE:
+        return None, "OpenAI kütüphanesi yüklü değil. 'pip install openai' çalıştırın."
+    keys = get_api_keys()
+    clients = _clients_for_running_loop()
+    try:
+        cached = clients.get("openai")
+        if cached is None or cached[0] != keys["openai_key"]:
+            client = AsyncOpenAI(api_key=keys["openai_key"], http_client=build_async_http_client())
+            cached = clients["openai"] = (keys["openai_key"], client)
+        return cached[1], None
+    except Exception as e:
+        return None, str(e)
+
+
+def get_async_anthropic_client():
+    """Çalışan event loop için AsyncAnthropic client'ı (loop başına bir tane)"""
+    if not ANTHROPIC_AVAILABLE:
+        return None, "Anthropic kütüphanesi yüklü değil. 'pip install anthropic' çalıştırın."
+    keys = get_api_keys()
+    clients = _clients_for_running_loop()
+    try:
+        cached = clients.get("anthropic")
+        if cached is None or cached[0] != keys["anthropic_key"]:
+            client = anthropic.AsyncAnthropic(api_key=keys["anthropic_key"], http_client=build_async_http_client())
+            cached = clients["anthropic"] = (keys["anthropic_key"], client)
+        return cached[1], None
+    except Exception as e:
+        return None, str(e)
+
+
+async def _acall_ai(prompt, provider):
+    """Sağlayıcıya önbelleksiz async istek gönder (zaman aşımı + retry + hedging): (metin, hata, kullanılan token)"""
+    try:
+        text, used_tokens = await acall_with_retries(
+            provider,
+            lambda: _arequest_ai(prompt, provider),
+            can_hedge=get_limiter(provider).try_acquire_extra
+        )
+        return text, None, used_tokens
+    except Exception as e:
+        return None, str(e), 0
+
+
+async def _arequest_ai(prompt, provider):
+    """Tek deneme: (metin, kullanılan token) döndürür, hata olursa fırlatır"""
+    timeout = get_policy(provider).timeout
+
+    if provider == "gemini":
+        model, error = get_gemini_model()
+        if error:
+            raise RuntimeError(error)
+        response = await model.generate_content_async(prompt, request_options={"timeout": timeout})
+        usage = getattr(response, "usage_metadata", None)
+        return response.text, getattr(usage, "total_token_count", 0)
+
+    elif provider == "openai":
+        client, error = get_async_openai_client()
+        if error:
+            raise RuntimeError(error)
+        # Yeniden denemeyi acall_with_retries yönetir; SDK'nın kendi retry'ı kapalı
+        response = await client.with_options(timeout=timeout, max_retries=0).chat.completions.create(
+            model=AI_MODELS["openai"],
+            messages=[
+                {"role": "system", "content": "Sen viral Twitter içerik üreticisisin. Türkçe içerik üret."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=4000
+        )
+        usage = response.usage.total_tokens if response.usage else 0
+        return response.choices[0].message.content, usage
+
+    elif provider == "anthropic":
+        client, error = get_async_anthropic_client()
+        if error:
+            raise RuntimeError(error)
+        response = await client.with_options(timeout=timeout, max_retries=0).messages.create(
+            model=AI_MODELS["anthropic"],
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        usage = response.usage.input_tokens + response.usage.output_tokens
+        return response.content[0].text, usage
+
+    raise ValueError("Bilinmeyen AI sağlayıcısı")
+
+
+async def agenerate_with_ai(prompt, provider="gemini", use_cache=True, fallback=True):
+    """generate_with_ai'nin async karşılığı: (metin, hata) döndürür
+
+    fallback=True iken sağlayıcı hata verirse ya da devresi açıksa, yedek
+    zincirindeki sıradaki sağlayıcı denenir.
+    """
+    provider = resolve_provider(provider)
+    chain = get_fallback_chain(provider) if fallback else [provider]
+    errors = []
+    for candidate in chain:
+        text, error = await _agenerate_once(prompt, candidate, use_cache)
+        if not error:
+            if candidate != provider:
+                call_stats.incr(provider, "fallbacks")
+            return text, None
+        errors.append(error if len(chain) == 1 else f"{candidate}: {error}")
+    return None, " | ".join(errors)
+
+
+async def _agenerate_once(prompt, provider, use_cache):
+    """Tek sağlayıcı ile üret: önbellek → devre kontrolü → kota → istek"""
+    key = cache_key(prompt, provider, AI_MODELS.get(provider, ""))
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached, None
+
+    if not get_breaker(provider).available():
+        return None, f"{provider} geçici olarak devre dışı (devre açık)"
+
+    limiter = get_limiter(provider)
+    prompt_tokens = estimate_tokens(prompt)
+    estimated = prompt_tokens + EXPECTED_OUTPUT_TOKENS
+    started = time.perf_counter()
+    async with limiter.limit_async(estimated):
+        call_started = time.perf_counter()
+        text, error, used_tokens = await _acall_ai(prompt, provider)
+        provider_router.observe(
+            provider, time.perf_counter() - call_started, error is None,
+            used_tokens or prompt_tokens + estimate_tokens(text)
+        )
+    limiter.settle(estimated, used_tokens or prompt_tokens + estimate_tokens(text))
+    if not error and text:
+        response_cache.put(key, text, time.perf_counter() - started)
+    return text, error
+
+
+async def agenerate_thread_ideas(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek", provider="gemini", use_cache=True):
+    """generate_thread_ideas'in async karşılığı"""
+    prompt = build_thread_prompt(topic, persona, learned_examples, thread_count, creativity)
+    return await agenerate_with_ai(prompt, provider, use_cache)
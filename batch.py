@@ -0,0 +1,156 @@
+"""
+Toplu Thread Üretimi (Komut Satırı)
+===================================
+Gündem listesindeki tüm konular (veya bir kategori) için Streamlit olmadan
+thread üretir. İstekler async AI katmanı üzerinden gider; sağlayıcı kotası
+dolunca 429 almak yerine sırada beklenir. Sonuçlar bittikçe JSONL dosyasına
+yazılır; çıktı dosyasında zaten bulunan konular atlandığı için yarıda kalan bir
+çalışma aynı komutla kaldığı yerden devam eder.
+
+Örnek:
+    python batch.py --category spor --concurrency 4 --output threads.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from async_ai import agenerate_thread_ideas
+from core import (
+    DEFAULT_PERSONA,
+    duplicate_detector,
+    get_relevant_examples,
+    get_trends,
+    parse_threads,
+)
+
+
+def load_completed_topics(path):
+    """Çıktı dosyasında başarıyla tamamlanmış konuları döndür (yarım satırlar atlanır)"""
+    completed = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if not record.get("error"):
+                    completed.add(record["topic"])
+    except OSError:
+        pass
+    return completed
+
+
+async def generate_for_topic(trend, args, persona):
+    """Tek bir konu için thread üret ve JSONL kaydı döndür"""
+    started = time.perf_counter()
+    content, error = await agenerate_thread_ideas(
+        trend["name"],
+        persona,
+        get_relevant_examples(trend["name"]),
+        args.thread_count,
+        args.creativity,
+        args.provider,
+        use_cache=not args.no_cache
+    )
+    threads = []
+    if not error:
+        threads = duplicate_detector.annotate(
+            parse_threads(content), drop=not args.keep_duplicates, source=f"Batch {trend['name']}"
+        )
+    return {
+        "topic": trend["name"],
+        "category": trend.get("category"),
+        "provider": args.provider,
+        "threads": threads,
+        "error": error,
+        "elapsed": round(time.perf_counter() - started, 2),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+async def run_batch(pending, args, persona, out, started):
+    """Konuları sınırlı eşzamanlılıkla üret, biten her sonucu hemen yaz"""
+    gate = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def run_one(trend):
+        async with gate:
+            try:
+                return await generate_for_topic(trend, args, persona)
+            except Exception as e:
+                return {"topic": trend["name"], "error": str(e), "threads": []}
+
+    done = failed = 0
+    for next_result in asyncio.as_completed([run_one(t) for t in pending]):
+        record = await next_result
+        # Her kayıt tek satır ve hemen diske: çökmede en fazla son satır kaybolur
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        os.fsync(out.fileno())
+
+        done += 1
+        failed += bool(record.get("error"))
+        elapsed_min = (time.perf_counter() - started) / 60
+        status = f"HATA: {record['error']}" if record.get("error") else f"{len(record['threads'])} thread"
+        print(
+            f"[{done}/{len(pending)}] {record['topic']}: {status} "
+            f"({done / elapsed_min:.1f} konu/dk)",
+            file=sys.stderr
+        )
+    return done, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gündemdeki tüm konular için toplu thread üret.")
+    parser.add_argument("--output", default="batch_threads.jsonl", help="Sonuç JSONL dosyası (varsayılan: %(default)s)")
+    parser.add_argument("--category", action="append", help="Sadece bu kategori(ler) (tekrarlanabilir)")
+    parser.add_argument("--provider", default="gemini", choices=["gemini", "openai", "anthropic", "auto"],
+                        help="auto: her konu için gecikme/hata/maliyete göre seçilir")
+    parser.add_argument("--thread-count", type=int, default=5)
+    parser.add_argument("--creativity", default="Yüksek", choices=["Düşük", "Orta", "Yüksek", "Çılgın"])
+    parser.add_argument("--persona-file", help="Persona metnini içeren dosya (varsayılan: uygulamadaki persona)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Aynı anda en fazla kaç istek (varsayılan: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="LLM yanıt önbelleğini okuma")
+    parser.add_argument("--keep-duplicates", action="store_true", help="Tekrar thread'leri eleme, sadece işaretle")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    persona = DEFAULT_PERSONA
+    if args.persona_file:
+        with open(args.persona_file, "r", encoding="utf-8") as f:
+            persona = f.read()
+
+    snapshot = get_trends()
+    trends = snapshot.topics
+    if args.category:
+        trends = [t for category in args.category for t in snapshot.category(category)]
+
+    completed = load_completed_topics(args.output)
+    pending = [t for t in trends if t["name"] not in completed]
+    print(f"{len(trends)} konu, {len(trends) - len(pending)} tamamlanmış, {len(pending)} kaldı.", file=sys.stderr)
+    if not pending:
+        return 0
+
+    started = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out:
+        done, failed = asyncio.run(run_batch(pending, args, persona, out, started))
+
+    elapsed_min = (time.perf_counter() - started) / 60
+    print(
+        f"Bitti: {done - failed} başarılı, {failed} hatalı, "
+        f"{elapsed_min:.1f} dk, {done / elapsed_min:.1f} konu/dk",
+        file=sys.stderr
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Client Havuzu
+=============
+Gemini, OpenAI, Anthropic ve tweepy client'larını süreç boyunca saklar.
+
+Streamlit her rerun'da app.py'yi baştan çalıştırır, ama import edilen modüller
+sys.modules'da kalır. Bu yüzden kayıt defteri burada yaşar ve tüm oturumlar
+aynı client'ları (ve açık HTTP bağlantılarını) paylaşır.
+"""
+
+import hashlib
+import threading
+import time
+
+# Boşta kalan bağlantıların havuzda tutulma süresi (saniye)
+KEEPALIVE_EXPIRY = 120
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+
+def build_http_client():
+    """OpenAI/Anthropic SDK'ları için keep-alive ayarlı httpx client oluştur"""
+    import httpx
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+
+
+def build_async_http_client():
+    """Async SDK client'ları için keep-alive ayarlı httpx.AsyncClient oluştur"""
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+
+
+def credentials_fingerprint(*credentials):
+    """Kimlik bilgilerinden anahtar üret (anahtarın kendisi bellekte key olarak tutulmaz)"""
+    raw = "\x1f".join(str(c or "") for c in credentials)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ClientRegistry:
+    """Sağlayıcı + kimlik bilgisine göre anahtarlanmış, thread-safe client havuzu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}  # provider -> (fingerprint, client)
+        self._build_locks = {}  # provider -> kurulum kilidi
+        self._stats = {}
+
+    def _provider_stats(self, provider):
+        return self._stats.setdefault(provider, {
+            "reuses": 0,
+            "builds": 0,
+            "last_build_ms": 0.0,
+            "total_build_ms": 0.0,
+        })
+
+    def get(self, provider, credentials, factory):
+        """Client'ı havuzdan al; yoksa veya anahtar değiştiyse factory ile oluştur
+
+        factory genel kilit dışında, sağlayıcıya özel kilitle çalışır: yavaş bir
+        SDK kurulumu diğer sağlayıcıları bekletmez, aynı sağlayıcı için de iki
+        kez kurulum yapılmaz. Değiştirilen eski client kapatılmaz; başka bir
+        thread hâlâ onunla akış okuyor olabilir, son referansla birlikte GC'ye kalır.
+        """
+        fingerprint = credentials_fingerprint(*credentials)
+        with self._lock:
+            cached = self._clients.get(provider)
+            if cached and cached[0] == fingerprint:
+                self._provider_stats(provider)["reuses"] += 1
+                return cached[1]
+            build_lock = self._build_locks.setdefault(provider, threading.Lock())
+
+        with build_lock:
+            # Beklerken başka bir thread aynı anahtarla oluşturmuş olabilir
+            with self._lock:
+                cached = self._clients.get(provider)
+                if cached and cached[0] == fingerprint:
+                    self._provider_stats(provider)["reuses"] += 1
+                    return cached[1]
+
+            started = time.perf_counter()
+            client = factory()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                stats = self._provider_stats(provider)
+                stats["builds"] += 1
+                stats["last_build_ms"] = elapsed_ms
+                stats["total_build_ms"] += elapsed_ms
+                self._clients[provider] = (fingerprint, client)
+            return client
+
+    def invalidate(self, provider=None):
+        """Bir sağlayıcının (veya tümünün) client'ını havuzdan çıkar (kullanımdaysa kapatılmaz)"""
+        with self._lock:
+            names = [provider] if provider else list(self._clients)
+            for name in names:
+                self._clients.pop(name, None)
+
+    def stats(self):
+        """Sağlayıcı bazında yeniden kullanım oranı ve soğuk oluşturma süreleri"""
+        with self._lock:
+            report = {}
+            for provider, s in self._stats.items():
+                total = s["reuses"] + s["builds"]
+                report[provider] = {
+                    "reuses": s["reuses"],
+                    "builds": s["builds"],
+                    "reuse_ratio": s["reuses"] / total if total else 0.0,
+                    "last_build_ms": s["last_build_ms"],
+                    "avg_build_ms": s["total_build_ms"] / s["builds"] if s["builds"] else 0.0,
+                }
+            return report
+
+
+# Süreç genelinde tek kayıt defteri
+registry = ClientRegistry()
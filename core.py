@@ -0,0 +1,1081 @@
+"""
+X Viral İçerik Üretici - Çekirdek
+=================================
+Streamlit'ten bağımsız iş mantığı: API client'ları, AI ile içerik üretimi,
+öğrenilmiş örnekler, X API fonksiyonları ve thread parse etme.
+app.py (arayüz) ve batch.py (komut satırı) bu modülü kullanır.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import tweepy
+import google.generativeai as genai
+from dotenv import load_dotenv
+
+# Optional imports for multi-AI support
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Yerel modüller (.env yüklendikten sonra, ayarlarını ortamdan okurlar)
+from clients import registry as client_registry, build_http_client
+from llm_cache import cache_key, response_cache
+from learned_store import get_store
+from retrieval import get_feedback_index, thread_text
+from dedup import DUPLICATE_FIELDS, get_duplicate_detector
+from profile_analytics import VIRAL_Z, get_analytics
+from posting_times import DAY_NAMES, TURKEY_TZ, get_posting_time_model
+from router import provider_router
+from x_api import x_access
+from topics import get_topic_classifier
+from thread_render import get_thread_renderer
+from trend_engine import current_trend_engine, get_trend_engine
+from trends import DEFAULT_MAX_AGE as TREND_MAX_AGE, LIVE_MAX_AGE as TREND_LIVE_MAX_AGE, MANUAL_TOPIC, TrendRepository
+from tweet_store import MAX_PAGES as TIMELINE_MAX_PAGES, MetricsRefresher, TimelineSync, get_tweet_store
+from rate_limits import EXPECTED_OUTPUT_TOKENS, estimate_tokens, get_limiter
+from resilience import (
+    CircuitOpenError,
+    backoff_delay,
+    call_stats,
+    call_with_retries,
+    get_breaker,
+    get_policy,
+    is_retryable,
+)
+
+# Varsayılan persona (arayüzde düzenlenebilir, batch.py'de --persona-file ile değiştirilir)
+DEFAULT_PERSONA = """Sen @bir_adamiste adlı X hesabının AI klonu'sun. Kişiliğin: Mizah seviyesi yüksek, ironi dolu, güzel ve akıcı gündem yorumları yapan bir tip. TR gündemine (ekonomi, siyaset, futbol) hafif mizahla dokun, borsa/yazılım konularını teknik ama eğlenceli işle (başarı/fail hikayeleriyle), kişisel hayat kesitleri ekle (samimi, relatable). Hafif argo kullan (kanka gibi dostane, küfürsüz – algoritma kara listeye almayacak şekilde), emoji nadir (vurgu için 1-2 tane). İlham: Zaytung/Bobiler gibi mizahlı gündem parodisi, ama @bir_adamiste gibi kişisel/borsa odaklı. Viral için soru sor, okuyanı güldür/ düşündür.
+
+Örnek stil tweet'ler (bunları temel al, benzer üret):
+1. "Bugün enflasyon rakamları açıklandı, cüzdanım 'yeter artık' diye isyan etti. Kişisel hayatımdan: Geçen hafta borsada bir hisse aldım, şimdi kahve param yok. Sizce hangi yazılım tool'uyla piyasa tahmin edeyim? 😂 #TRGündem"
+2. "Siyasetçiler vaat üstüne vaat, ben de yazılım kodlarımda bug fix'liyorum. Mizahı: Erdoğan'ın konuşmasını dinlerken, kendi hayatıma döndüm – startup'ım battı ama yeniden kodladım. Güzel yorum: Bu ülke dirençli, değil mi? #BorsaHayatı"
+3. "Futbol gündemi: Fenerbahçe-Galatasaray derbisi öncesi, borsa gibi iniş çıkışlı. Kişisel: Benim yazılım projem de öyle, bir hata bütün sistemi çökertiyor. Yüksek mizah: Takım tutar gibi hisse tutmayın, yoksa iflas! Kim katılıyor? #YazılımMizahı"
+4. "TR'de yeni vergi yasası, cüzdanlar ağlıyor. Benim yorumum: Borsa'da short pozisyon açsam mı? Kişisel kesit: Geçen ay bir app kodladım, ama gündem değişince pivot ettim. Güldüren twist: Hayat da öyle, değil mi kanka? 😏 #EkonomiGündemi"
+5. "Yazılım dünyasında AI hype'ı, ama TR gündeminde işsizlik. Mizahlı: Ben kendi botumu yazdım, şimdi işimi elimden alacak mı? Kişisel: Hayatımdan, ilk kodumda infinite loop'a girdim – tıpkı enflasyon gibi. Siz ne düşünüyorsunuz? #AIGündem"
+
+Her üretimde:
+- Thread'leri 4-6 tweet'lik tut, numaralandır (1/6 gibi).
+- Her tweet 280 karakter aşmasın.
+- Viral potansiyel: Soru sor, etkileşim artır.
+- Para kazanma için: Dolaylı affiliate (borsa tool önerisi gibi) ekle, ama doğal tut."""
+
+# ============================================
+# API KEYS & CLIENTS
+# ============================================
+
+def get_api_keys():
+    """API anahtarlarını .env'den al"""
+    return {
+        "gemini_key": os.getenv("GEMINI_API_KEY", ""),
+        "openai_key": os.getenv("OPENAI_API_KEY", ""),
+        "anthropic_key": os.getenv("ANTHROPIC_API_KEY", ""),
+        "bearer_token": os.getenv("X_BEARER_TOKEN", ""),
+        "consumer_key": os.getenv("X_CONSUMER_KEY", ""),
+        "consumer_secret": os.getenv("X_CONSUMER_SECRET", ""),
+        "access_token": os.getenv("X_ACCESS_TOKEN", ""),
+        "access_token_secret": os.getenv("X_ACCESS_TOKEN_SECRET", "")
+    }
+
+def get_available_ai_providers():
+    """Kullanılabilir AI sağlayıcılarını listele"""
+    keys = get_api_keys()
+    providers = []
+    
+    if keys["gemini_key"]:
+        providers.append(("🌟 Gemini", "gemini"))
+    if keys["openai_key"] and OPENAI_AVAILABLE:
+        providers.append(("🤖 GPT-4", "openai"))
+    if keys["anthropic_key"] and ANTHROPIC_AVAILABLE:
+        providers.append(("🧠 Claude", "anthropic"))
+    
+    return providers if providers else [("🌟 Gemini (API key gerekli)", "gemini")]
+
+# Sağlayıcı hata verdiğinde veya devresi açıldığında denenecek yedek sırası
+FALLBACK_ORDER = [
+    p.strip() for p in os.getenv("AI_FALLBACK_ORDER", "gemini,openai,anthropic").split(",") if p.strip()
+]
+
+# Sağlayıcıyı istek başına yönlendiricinin seçmesi için özel değer
+AUTO_PROVIDER = "auto"
+
+def resolve_provider(provider):
+    """'auto' ise yönlendiricinin bu istek için seçtiği sağlayıcıyı döndür"""
+    if provider != AUTO_PROVIDER:
+        return provider
+    configured = [p for _, p in get_available_ai_providers()]
+    healthy = [p for p in configured if get_breaker(p).available()]
+    return provider_router.choose(healthy or configured)
+
+def get_fallback_chain(provider):
+    """Seçilen sağlayıcı + yapılandırılmış yedekleri deneme sırasıyla döndür"""
+    configured = {p for _, p in get_available_ai_providers()}
+    return [provider] + [p for p in FALLBACK_ORDER if p != provider and p in configured]
+
+# Sağlayıcı başına kullanılan model (önbellek anahtarına da girer)
+AI_MODELS = {
+    "gemini": "gemini-3-flash-preview",
+    "openai": "gpt-4o",
+    "anthropic": "claude-sonnet-4-20250514",
+}
+
+def _build_twitter_client(keys):
+    """Limit dolunca uyumayan, yanıt başlıklarını x_access'e bildiren tweepy client'ı"""
+    client = tweepy.Client(
+        bearer_token=keys["bearer_token"],
+        consumer_key=keys["consumer_key"],
+        consumer_secret=keys["consumer_secret"],
+        access_token=keys["access_token"],
+        access_token_secret=keys["access_token_secret"],
+        # Limit yönetimi x_access'te: Streamlit thread'i 15 dk uyumasın
+        wait_on_rate_limit=False
+    )
+    client.session.hooks["response"].append(x_access.capture_headers)
+    return client
+
+def get_twitter_client():
+    """Tweepy client'ını havuzdan al (yoksa oluştur)"""
+    keys = get_api_keys()
+    credentials = (
+        keys["bearer_token"],
+        keys["consumer_key"],
+        keys["consumer_secret"],
+        keys["access_token"],
+        keys["access_token_secret"],
+    )
+    try:
+        client = client_registry.get(
+            "twitter",
+            credentials,
+            lambda: _build_twitter_client(keys)
+        )
+        return client, None
+    except Exception as e:
+        return None, str(e)
+
+def _build_gemini_model(api_key):
+    # genai.configure global durumu değiştirir; sadece anahtar değiştiğinde çağrılır
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(AI_MODELS["gemini"])
+
+def get_gemini_model():
+    """Gemini modelini havuzdan al (yoksa oluştur)"""
+    keys = get_api_keys()
+    try:
+        model = client_registry.get(
+            "gemini",
+            (keys["gemini_key"],),
+            lambda: _build_gemini_model(keys["gemini_key"])
+        )
+        return model, None
+    except Exception as e:
+        return None, str(e)
+
+def get_openai_client():
+    """OpenAI client'ını havuzdan al (yoksa oluştur)"""
+    keys = get_api_keys()
+    if not OPENAI_AVAILABLE:
+        return None, "OpenAI kütüphanesi yüklü değil. 'pip install openai' çalıştırın."
+    try:
+        client = client_registry.get(
+            "openai",
+            (keys["openai_key"],),
+            lambda: OpenAI(api_key=keys["openai_key"], http_client=build_http_client())
+        )
+        return client, None
+    except Exception as e:
+        return None, str(e)
+
+def get_anthropic_client():
+    """Anthropic (Claude) client'ını havuzdan al (yoksa oluştur)"""
+    keys = get_api_keys()
+    if not ANTHROPIC_AVAILABLE:
+        return None, "Anthropic kütüphanesi yüklü değil. 'pip install anthropic' çalıştırın."
+    try:
+        client = client_registry.get(
+            "anthropic",
+            (keys["anthropic_key"],),
+            lambda: anthropic.Anthropic(api_key=keys["anthropic_key"], http_client=build_http_client())
+        )
+        return client, None
+    except Exception as e:
+        return None, str(e)
+
+def generate_with_ai(prompt, provider="gemini", use_cache=True, fallback=True):
+    """Seçilen AI sağlayıcısı ile içerik üret (önbellekli)
+    
+    use_cache=False önbelleği okumaz ama taze yanıtı yine önbelleğe yazar.
+    fallback=True iken sağlayıcı hata verirse ya da devresi açıksa, yedek
+    zincirindeki (get_fallback_chain) sıradaki sağlayıcı denenir.
+    """
+    provider = resolve_provider(provider)
+    chain = get_fallback_chain(provider) if fallback else [provider]
+    errors = []
+    for candidate in chain:
+        text, error = _generate_once(prompt, candidate, use_cache)
+        if not error:
+            if candidate != provider:
+                call_stats.incr(provider, "fallbacks")
+            return text, None
+        errors.append(error if len(chain) == 1 else f"{candidate}: {error}")
+    return None, " | ".join(errors)
+
+def _generate_once(prompt, provider, use_cache):
+    """Tek sağlayıcı ile üret: önbellek → devre kontrolü → kota → istek"""
+    key = cache_key(prompt, provider, AI_MODELS.get(provider, ""))
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached, None
+    
+    # Devre açıksa kota sırasına bile girmeden hemen dön
+    if not get_breaker(provider).available():
+        return None, f"{provider} geçici olarak devre dışı (devre açık)"
+    
+    # Sağlayıcı kotası dolmuşsa 429 almak yerine sırada bekle
+    limiter = get_limiter(provider)
+    prompt_tokens = estimate_tokens(prompt)
+    estimated = prompt_tokens + EXPECTED_OUTPUT_TOKENS
+    started = time.perf_counter()
+    with limiter.limit(estimated):
+        # Yönlendirici için kota beklemesi hariç gerçek sağlayıcı gecikmesi
+        call_started = time.perf_counter()
+        text, error = _call_ai(prompt, provider)
+        provider_router.observe(
+            provider, time.perf_counter() - call_started, error is None, prompt_tokens + estimate_tokens(text)
+        )
+    limiter.settle(estimated, prompt_tokens + estimate_tokens(text))
+    if not error and text:
+        response_cache.put(key, text, time.perf_counter() - started)
+    return text, error
+
+def _call_ai(prompt, provider):
+    """Sağlayıcıya önbelleksiz, tek parça istek gönder (zaman aşımı + retry + hedging)"""
+    try:
+        text = call_with_retries(
+            provider,
+            lambda: _request_ai(prompt, provider),
+            can_hedge=get_limiter(provider).try_acquire_extra
+        )
+        return text, None
+    except Exception as e:
+        return None, str(e)
+
+def _request_ai(prompt, provider):
+    """Tek deneme: sağlayıcıya istek gönder, hata olursa fırlat"""
+    timeout = get_policy(provider).timeout
+    
+    if provider == "gemini":
+        model, error = get_gemini_model()
+        if error:
+            raise RuntimeError(error)
+        response = model.generate_content(prompt, request_options={"timeout": timeout})
+        return response.text
+    
+    elif provider == "openai":
+        client, error = get_openai_client()
+        if error:
+            raise RuntimeError(error)
+        # Yeniden denemeyi call_with_retries yönetir; SDK'nın kendi retry'ı kapalı
+        response = client.with_options(timeout=timeout, max_retries=0).chat.completions.create(
+            model=AI_MODELS["openai"],
+            messages=[
+                {"role": "system", "content": "Sen viral Twitter içerik üreticisisin. Türkçe içerik üret."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=4000
+        )
+        return response.choices[0].message.content
+    
+    elif provider == "anthropic":
+        client, error = get_anthropic_client()
+        if error:
+            raise RuntimeError(error)
+        response = client.with_options(timeout=timeout, max_retries=0).messages.create(
+            model=AI_MODELS["anthropic"],
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response.content[0].text
+    
+    raise ValueError("Bilinmeyen AI sağlayıcısı")
+
+def generate_with_ai_stream(prompt, provider="gemini", use_cache=True, fallback=True):
+    """Seçilen AI sağlayıcısı ile içerik üret (parça parça, önbellekli)
+    
+    (chunks, error) döndürür. chunks, metin parçalarını geldikçe veren bir
+    generator'dır; akış ortasında oluşan hatalar iterasyon sırasında fırlatılır.
+    Önbellek isabetinde tüm yanıt tek parça olarak gelir. Sağlayıcının devresi
+    açıksa (ve fallback=True ise) yedek zincirindeki ilk sağlıklı sağlayıcı kullanılır.
+    """
+    provider = resolve_provider(provider)
+    if not get_breaker(provider).available():
+        healthy = [p for p in get_fallback_chain(provider)[1:] if get_breaker(p).available()] if fallback else []
+        if not healthy:
+            return None, f"{provider} geçici olarak devre dışı (devre açık)"
+        call_stats.incr(provider, "fallbacks")
+        provider = healthy[0]
+    
+    key = cache_key(prompt, provider, AI_MODELS.get(provider, ""))
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            def cached_chunks():
+                yield cached
+            return cached_chunks(), None
+    
+    chunks, error = _stream_ai(prompt, provider)
+    if error:
+        return None, error
+    
+    def caching_chunks():
+        # Sadece sonuna kadar okunan akışlar önbelleğe yazılır
+        limiter = get_limiter(provider)
+        policy = get_policy(provider)
+        breaker = get_breaker(provider)
+        prompt_tokens = estimate_tokens(prompt)
+        estimated = prompt_tokens + EXPECTED_OUTPUT_TOKENS
+        started = time.perf_counter()
+        parts = []
+        with limiter.limit(estimated):
+            stream = chunks
+            attempt = 0
+            stream_started = time.perf_counter()
+            try:
+                while True:
+                    if not breaker.allow():
+                        raise CircuitOpenError(f"{provider} devresi açık, istek gönderilmedi")
+                    attempt_started = time.perf_counter()
+                    try:
+                        for chunk in stream:
+                            if not parts:
+                                # Akışta sağlık ölçüsü ilk parçaya kadar geçen süre
+                                breaker.record(True, time.perf_counter() - attempt_started)
+                            parts.append(chunk)
+                            yield chunk
+                        if not parts:
+                            breaker.record(True, time.perf_counter() - attempt_started)
+                        provider_router.observe(
+                            provider, time.perf_counter() - stream_started, True,
+                            prompt_tokens + sum(estimate_tokens(p) for p in parts)
+                        )
+                        break
+                    except GeneratorExit:
+                        if not parts:
+                            breaker.cancel()
+                        raise
+                    except Exception as e:
+                        if not parts:
+                            breaker.record_error(e, time.perf_counter() - attempt_started)
+                        # İlk parça gelmeden oluşan geçici hatalarda akışı baştan dene
+                        if parts or attempt >= policy.max_retries or not is_retryable(e):
+                            provider_router.observe(provider, time.perf_counter() - stream_started, False)
+                            raise
+                        time.sleep(backoff_delay(attempt))
+                        attempt += 1
+                        call_stats.incr(provider, "retries")
+                        stream.close()
+                        stream, stream_error = _stream_ai(prompt, provider)
+                        if stream_error:
+                            raise RuntimeError(stream_error)
+            finally:
+                if stream is not None:
+                    stream.close()
+                limiter.settle(estimated, prompt_tokens + sum(estimate_tokens(p) for p in parts))
+        if parts:
+            response_cache.put(key, "".join(parts), time.perf_counter() - started)
+    
+    return caching_chunks(), None
+
+def _stream_ai(prompt, provider):
+    """Sağlayıcıya önbelleksiz akış isteği gönder"""
+    timeout = get_policy(provider).timeout
+    
+    if provider == "gemini":
+        model, error = get_gemini_model()
+        if error:
+            return None, error
+        
+        def gemini_chunks():
+            response = model.generate_content(prompt, stream=True, request_options={"timeout": timeout})
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Güvenlik filtresi vb. nedeniyle metni olmayan parça
+                    continue
+                if text:
+                    yield text
+        
+        return gemini_chunks(), None
+    
+    elif provider == "openai":
+        client, error = get_openai_client()
+        if error:
+            return None, error
+        
+        def openai_chunks():
+            response = client.with_options(timeout=timeout, max_retries=0).chat.completions.create(
+                model=AI_MODELS["openai"],
+                messages=[
+                    {"role": "system", "content": "Sen viral Twitter içerik üreticisisin. Türkçe içerik üret."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=4000,
+                stream=True
+            )
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        return openai_chunks(), None
+    
+    elif provider == "anthropic":
+        client, error = get_anthropic_client()
+        if error:
+            return None, error
+        
+        def anthropic_chunks():
+            with client.with_options(timeout=timeout, max_retries=0).messages.stream(
+                model=AI_MODELS["anthropic"],
+                max_tokens=4000,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        
+        return anthropic_chunks(), None
+    
+    return None, "Bilinmeyen AI sağlayıcısı"
+
+def _collect_stream(prompt, provider, stop_event, use_cache=True):
+    """Bir sağlayıcının akışını topla; stop_event set edilirse isteği yarıda kes"""
+    started = time.perf_counter()
+    content = ""
+    # Çoklu modda her sütun kendi sağlayıcısını gösterir; yedeğe geçilmez
+    chunks, error = generate_with_ai_stream(prompt, provider, use_cache, fallback=False)
+    if not error:
+        try:
+            for chunk in chunks:
+                if stop_event.is_set():
+                    # Generator'ı kapatmak alttaki HTTP akışını da kapatır
+                    chunks.close()
+                    error = "İptal edildi"
+                    break
+                content += chunk
+        except Exception as e:
+            error = str(e)
+    return {
+        "provider": provider,
+        "content": None if error else content,
+        "error": error,
+        "elapsed": time.perf_counter() - started,
+    }
+
+def generate_with_providers(prompt, providers, strategy="race", is_good=None, use_cache=True):
+    """Aynı prompt'u birden fazla sağlayıcıya aynı anda gönder
+    
+    strategy="race": ilk iyi cevabı veren kazanır, diğer istekler iptal edilir.
+    strategy="merge": tüm sağlayıcıların cevapları beklenir.
+    Her sonuç {"provider", "content", "error", "elapsed"} sözlüğüdür. Yarışta
+    kimse iyi cevap veremezse tüm sonuçlar (hatalarıyla) döndürülür.
+    """
+    if is_good is None:
+        is_good = lambda result: bool(result["content"])
+    
+    stop_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(providers))
+    futures = [executor.submit(_collect_stream, prompt, p, stop_event, use_cache) for p in providers]
+    results = []
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if strategy == "race" and not result["error"] and is_good(result):
+                stop_event.set()
+                return [result]
+    finally:
+        # Yarışı kaybedenleri bekleme; stop_event ile kendileri kapanır
+        executor.shutdown(wait=False)
+    
+    order = {p: i for i, p in enumerate(providers)}
+    return sorted(results, key=lambda r: order[r["provider"]])
+
+# ============================================
+# DATA MANAGEMENT
+# ============================================
+
+LEARNED_EXAMPLES_FILE = "learned_examples.json"
+
+# Snapshot (learned_examples.json) + append-only günlük (learned_examples.jsonl).
+# Depo süreç genelinde tektir; dosyalar değişmedikçe tekrar parse edilmez.
+learned_store = get_store(LEARNED_EXAMPLES_FILE)
+feedback_index = get_feedback_index(learned_store)
+duplicate_detector = get_duplicate_detector(learned_store)
+
+# Kullanıcı tweet'lerinin yerel deposu (SQLite) ve artımlı senkronu
+TWEET_DB_FILE = os.getenv("TWEET_DB_FILE", "tweets.db")
+tweet_store = get_tweet_store(TWEET_DB_FILE)
+timeline_sync = TimelineSync(tweet_store, x_access)
+metrics_refresher = MetricsRefresher(tweet_store, x_access)
+
+def load_learned_examples():
+    """Öğrenilmiş örnekleri yükle (paylaşılan görünüm, değiştirilmemeli)"""
+    try:
+        return learned_store.load()
+    except Exception:
+        return {"liked_threads": [], "disliked_threads": []}
+
+def save_learned_examples(data):
+    """Öğrenilmiş örnekleri kaydet"""
+    learned_store.save(data)
+
+def _without_duplicate_fields(thread):
+    # Tekrar işaretleri görüntü içindir, öğrenilmiş örneklere yazılmaz
+    return {k: v for k, v in thread.items() if k not in DUPLICATE_FIELDS}
+
+def add_liked_thread(thread):
+    """Beğenilen thread'i kaydet"""
+    thread_entry = {
+        "thread": _without_duplicate_fields(thread),
+        "timestamp": datetime.now().isoformat()
+    }
+    learned_store.append("liked", thread_entry)
+
+def add_disliked_thread(thread):
+    """Beğenilmeyen thread'i kaydet"""
+    thread_entry = {
+        "thread": _without_duplicate_fields(thread),
+        "timestamp": datetime.now().isoformat()
+    }
+    learned_store.append("disliked", thread_entry)
+
+# ============================================
+# TWITTER API FUNCTIONS
+# ============================================
+
+# Profil sekmesi ve CLI'da varsayılan hesap
+DEFAULT_USERNAME = os.getenv("X_USERNAME", "bir_adamiste")
+# Thread önizlemesi (X görünümü) bu hesapla çizilir
+thread_renderer = get_thread_renderer(DEFAULT_USERNAME)
+USER_FIELDS = ["public_metrics", "description", "created_at", "profile_image_url"]
+# GET /2/users/by?usernames=... tek istekte en fazla 100 kullanıcı alır
+USER_LOOKUP_BATCH = 100
+
+def get_user_info(client, username=DEFAULT_USERNAME):
+    """Kullanıcı bilgilerini al (limit dolduysa önbellekten, bkz. x_access)"""
+    def fetch():
+        user = client.get_user(username=username, user_fields=USER_FIELDS)
+        return user.data
+    
+    user, error = x_access.call("users/by/username", ("user", username), fetch)
+    if error:
+        return None, error
+    if user:
+        tweet_store.remember_user(username, user.id)
+        return user, None
+    return None, "Kullanıcı bulunamadı"
+
+def parse_usernames(text):
+    """'@a, b\nc' gibi bir listeyi kullanıcı adlarına ayır (tekrarsız, sıra korunur)"""
+    seen = set()
+    usernames = []
+    for part in text.replace("\n", ",").replace(" ", ",").split(","):
+        name = part.strip().lstrip("@")
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            usernames.append(name)
+    return usernames
+
+def get_users_info(client, usernames):
+    """Kullanıcıları 100'lük get_users(usernames=...) çağrılarıyla al
+    
+    ({küçük harf kullanıcı adı: user}, hata) döndürür; bulunamayanlar sözlükte yer almaz.
+    """
+    found = {}
+    errors = []
+    for start in range(0, len(usernames), USER_LOOKUP_BATCH):
+        batch = usernames[start:start + USER_LOOKUP_BATCH]
+        
+        def fetch(batch=batch):
+            response = client.get_users(usernames=batch, user_fields=USER_FIELDS)
+            return response.data or []
+        
+        users, error = x_access.call("users/by", ("users", tuple(u.lower() for u in batch)), fetch)
+        if error:
+            errors.append(error)
+        for user in users or []:
+            found[user.username.lower()] = user
+            tweet_store.remember_user(user.username, user.id)
+    return found, "; ".join(errors) or None
+
+def resolve_user_id(client, username=DEFAULT_USERNAME):
+    """Kullanıcı ID'sini önce yerel depodan, yoksa API'den al"""
+    user_id = tweet_store.user_id_for(username)
+    if user_id:
+        return user_id, None
+    user, error = get_user_info(client, username)
+    return (user.id if user else None), error
+
+def sync_user_timeline(client, user_id, max_pages=TIMELINE_MAX_PAGES):
+    """Zaman tünelini yerel depoya senkronla (ilk seferde geçmiş, sonra since_id)
+    
+    (işlenen tweet sayısı, hata) döndürür; hata olsa bile o ana kadar gelenler saklanır.
+    max_pages verilirse her senkron en fazla o kadar istek yapar, geçmiş sonraki
+    senkronlarda tamamlanır.
+    """
+    processed, _, error = timeline_sync.sync(client, user_id, max_pages)
+    return processed, error
+
+# Karşılaştırmada hesap başına senkron başına en fazla sayfa (100 tweet/sayfa)
+COMPARE_SYNC_PAGES = 2
+# Arayüzden (script thread'inde) yapılan senkronda render başına en fazla sayfa;
+# kalan yeni tweet'ler ve geçmiş sonraki çalıştırmalarda boşluk imleciyle tamamlanır
+INTERACTIVE_SYNC_PAGES = 3
+
+def account_summary(user, tweets):
+    """Bir hesabın karşılaştırma satırı: takipçi, oran ve ortalama etkileşim"""
+    metrics = user.public_metrics or {}
+    followers = metrics.get("followers_count", 0)
+    following = metrics.get("following_count", 0)
+    count = len(tweets)
+    totals = {"like_count": 0, "retweet_count": 0, "reply_count": 0, "quote_count": 0}
+    for tweet in tweets:
+        for name in totals:
+            totals[name] += (tweet.public_metrics or {}).get(name, 0)
+    interactions = sum(totals.values())
+    return {
+        "username": user.username,
+        "name": user.name,
+        "followers": followers,
+        "following": following,
+        "ratio": followers / max(following, 1),
+        "tweet_count": metrics.get("tweet_count", 0),
+        "sampled_tweets": count,
+        "avg_likes": totals["like_count"] / count if count else 0.0,
+        "avg_retweets": totals["retweet_count"] / count if count else 0.0,
+        "avg_replies": totals["reply_count"] / count if count else 0.0,
+        # Tweet başına etkileşim / takipçi (%)
+        "engagement_rate": interactions / count / max(followers, 1) * 100 if count else 0.0,
+    }
+
+def compare_accounts(client, usernames, sample_size=100, max_workers=4):
+    """Hesapları toplu çöz, zaman tünellerini paralel senkronla ve karşılaştır
+    
+    (satırlar, hatalar) döndürür. Satırlar giriş sırasındadır; hatalar
+    {kullanıcı adı: mesaj} sözlüğüdür. X limitleri x_access'te paylaşıldığı için
+    paralel senkronlar bütçeyi aşmaz, bütçe biterse depodaki verilerle devam edilir.
+    """
+    users, lookup_error = get_users_info(client, usernames)
+    errors = {}
+    for username in usernames:
+        if username.lower() not in users:
+            errors[username] = lookup_error or "Kullanıcı bulunamadı"
+    
+    resolved = [users[u.lower()] for u in usernames if u.lower() in users]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        sync_results = executor.map(
+            lambda user: sync_user_timeline(client, user.id, max_pages=COMPARE_SYNC_PAGES), resolved
+        )
+        for user, (_, sync_error) in zip(resolved, sync_results):
+            if sync_error:
+                errors[user.username] = sync_error
+    
+    rows = [account_summary(user, tweet_store.latest(user.id, sample_size)) for user in resolved]
+    return rows, errors
+
+def refresh_tweet_metrics(client, user_id=None):
+    """Depodaki tüm tweet'lerin metriklerini 100'lük gruplarla yenile (N/100 istek)
+    
+    (yenilenen tweet, istek sayısı, hata) döndürür.
+    """
+    return metrics_refresher.refresh(client, user_id)
+
+def get_posting_model(username=DEFAULT_USERNAME):
+    """Hesabın (ID'si henüz bilinmiyorsa tüm deponun) paylaşım saati modeli, yeni tweet'lerle güncellenmiş"""
+    model = get_posting_time_model(tweet_store, tweet_store.user_id_for(username))
+    model.refresh()
+    return model
+
+def get_profile_analytics(user_id, followers):
+    """Depodaki tüm zaman tünelinin etkileşim analizi (veri değişmedikçe önbellekten)"""
+    return get_analytics(tweet_store, user_id, followers)
+
+def get_stored_tweets(user_id, limit=5):
+    """Yerel depodaki en yeni tweet'ler (API çağrısı yapmaz)"""
+    return tweet_store.latest(user_id, limit)
+
+def get_user_tweets(client, user_id, max_results=5):
+    """Kullanıcının son tweetlerini al (limit dolduysa önbellekten, bkz. x_access)"""
+    def fetch():
+        tweets = client.get_users_tweets(
+            id=user_id,
+            max_results=max_results,
+            tweet_fields=["public_metrics", "created_at", "text"]
+        )
+        return tweets.data or []
+    
+    tweets, error = x_access.call("users/:id/tweets", ("tweets", user_id, max_results), fetch)
+    return tweets or [], error
+
+# Yerel tweet akışından gündem (TREND_FEED: dosya yolu veya tcp://host:port, bkz. trend_engine)
+TREND_FEED = os.getenv("TREND_FEED")
+
+def start_trend_feed():
+    """Akışı (ayarlıysa) arka planda tüketmeye başla ve motoru döndür
+    
+    İçe aktarmada değil arayüzden çağrılır; batch.py ve accounts.py akış
+    thread'i başlatmaz, soket açmaz.
+    """
+    return get_trend_engine(TREND_FEED)
+
+def fetch_trending_topics(client):
+    """Gündem deposunun yükleyicisi: akış başlatıldıysa oradan, yoksa örnek konular"""
+    engine = current_trend_engine()
+    if engine is not None:
+        topics = engine.trending()
+        if topics:
+            return topics
+    return get_sample_trends()
+
+def get_sample_trends():
+    """Türkiye trending topics (WOEID: 23424969)
+    
+    Not: Free tier'da bu endpoint mevcut değil.
+    Bu durumda örnek gündem konuları döndürülür.
+    """
+    # X API v2'de trends endpoint'i sınırlı erişimde
+    # Örnek gündem konuları döndür
+    sample_trends = [
+        # EKONOMİ
+        {"name": "#Dolar", "category": "ekonomi", "tweet_volume": 125000},
+        {"name": "#Enflasyon", "category": "ekonomi", "tweet_volume": 89000},
+        {"name": "#Borsa", "category": "ekonomi", "tweet_volume": 156000},
+        {"name": "#BIST100", "category": "ekonomi", "tweet_volume": 78000},
+        {"name": "#Faiz", "category": "ekonomi", "tweet_volume": 67000},
+        {"name": "#AsgariÜcret", "category": "ekonomi", "tweet_volume": 234000},
+        {"name": "#Altın", "category": "ekonomi", "tweet_volume": 98000},
+        {"name": "#Euro", "category": "ekonomi", "tweet_volume": 45000},
+        {"name": "#Kripto", "category": "ekonomi", "tweet_volume": 112000},
+        {"name": "#Bitcoin", "category": "ekonomi", "tweet_volume": 189000},
+        {"name": "#Zam", "category": "ekonomi", "tweet_volume": 267000},
+        {"name": "#Maaş", "category": "ekonomi", "tweet_volume": 145000},
+        
+        # SPOR
+        {"name": "#Galatasaray", "category": "spor", "tweet_volume": 245000},
+        {"name": "#Fenerbahçe", "category": "spor", "tweet_volume": 198000},
+        {"name": "#Beşiktaş", "category": "spor", "tweet_volume": 156000},
+        {"name": "#Trabzonspor", "category": "spor", "tweet_volume": 89000},
+        {"name": "#SüperLig", "category": "spor", "tweet_volume": 167000},
+        {"name": "#Derbi", "category": "spor", "tweet_volume": 312000},
+        {"name": "#ŞampiyonlarLigi", "category": "spor", "tweet_volume": 234000},
+        {"name": "#MilliTakım", "category": "spor", "tweet_volume": 178000},
+        {"name": "#Transfer", "category": "spor", "tweet_volume": 145000},
+        {"name": "#Icardi", "category": "spor", "tweet_volume": 123000},
+        
+        # SİYASET
+        {"name": "#Seçim", "category": "siyaset", "tweet_volume": 312000},
+        {"name": "#TBMM", "category": "siyaset", "tweet_volume": 78000},
+        {"name": "#AKP", "category": "siyaset", "tweet_volume": 156000},
+        {"name": "#CHP", "category": "siyaset", "tweet_volume": 134000},
+        {"name": "#Erdoğan", "category": "siyaset", "tweet_volume": 289000},
+        {"name": "#Kılıçdaroğlu", "category": "siyaset", "tweet_volume": 167000},
+        {"name": "#Muhalefet", "category": "siyaset", "tweet_volume": 89000},
+        {"name": "#Anayasa", "category": "siyaset", "tweet_volume": 67000},
+        {"name": "#DışPolitika", "category": "siyaset", "tweet_volume": 45000},
+        
+        # TEKNOLOJİ
+        {"name": "#YapayZeka", "category": "teknoloji", "tweet_volume": 145000},
+        {"name": "#ChatGPT", "category": "teknoloji", "tweet_volume": 167000},
+        {"name": "#Gemini", "category": "teknoloji", "tweet_volume": 89000},
+        {"name": "#iPhone", "category": "teknoloji", "tweet_volume": 134000},
+        {"name": "#Android", "category": "teknoloji", "tweet_volume": 78000},
+        {"name": "#Yazılım", "category": "teknoloji", "tweet_volume": 56000},
+        {"name": "#Startup", "category": "teknoloji", "tweet_volume": 67000},
+        {"name": "#Kodlama", "category": "teknoloji", "tweet_volume": 45000},
+        {"name": "#Python", "category": "teknoloji", "tweet_volume": 34000},
+        {"name": "#AI", "category": "teknoloji", "tweet_volume": 198000},
+        {"name": "#Tesla", "category": "teknoloji", "tweet_volume": 156000},
+        {"name": "#ElonMusk", "category": "teknoloji", "tweet_volume": 234000},
+        
+        # MİZAH
+        {"name": "#Pazartesi", "category": "mizah", "tweet_volume": 156000},
+        {"name": "#İşyerinde", "category": "mizah", "tweet_volume": 89000},
+        {"name": "#AşkAcısı", "category": "mizah", "tweet_volume": 67000},
+        {"name": "#Türkiye", "category": "mizah", "tweet_volume": 234000},
+        {"name": "#KahveMolası", "category": "mizah", "tweet_volume": 45000},
+        {"name": "#EvdeKal", "category": "mizah", "tweet_volume": 56000},
+        {"name": "#Kış", "category": "mizah", "tweet_volume": 78000},
+        {"name": "#Şubat", "category": "mizah", "tweet_volume": 89000},
+        {"name": "#SevgililerGünü", "category": "mizah", "tweet_volume": 312000},
+        {"name": "#Yalnızlık", "category": "mizah", "tweet_volume": 134000},
+        
+        # DİĞER
+        {"name": "#Deprem", "category": "diger", "tweet_volume": 423000},
+        {"name": "#Hava", "category": "diger", "tweet_volume": 56000},
+        {"name": "#İstanbul", "category": "diger", "tweet_volume": 345000},
+        {"name": "#Ankara", "category": "diger", "tweet_volume": 189000},
+        {"name": "#Trafik", "category": "diger", "tweet_volume": 123000},
+        {"name": "#Eğitim", "category": "diger", "tweet_volume": 167000},
+        {"name": "#Sağlık", "category": "diger", "tweet_volume": 145000},
+        {"name": "#Konut", "category": "diger", "tweet_volume": 198000},
+        {"name": "#Kira", "category": "diger", "tweet_volume": 234000},
+        {"name": "#Gençlik", "category": "diger", "tweet_volume": 89000},
+    ]
+    return sample_trends
+
+# Gündem yenilemede bir kez işlenir; okumalar aynı anlık görüntüyü paylaşır (bkz. trends)
+# Canlı akışta gündem dakikada bir yenilenir
+trend_repository = TrendRepository(
+    fetch_trending_topics,
+    max_age=int(os.getenv("TREND_MAX_AGE", TREND_LIVE_MAX_AGE if TREND_FEED else TREND_MAX_AGE)),
+)
+
+def get_trends(client=None):
+    """Güncel gündem anlık görüntüsü: kategori indeksi, ilk k konu, seçenekler"""
+    return trend_repository.get(client)
+
+def refresh_trends(client=None):
+    """Gündemi kaynaktan yeniden yükle"""
+    return trend_repository.refresh(client)
+
+def get_trending_topics(client):
+    """Gündem konuları (değiştirilemez, kopyalanmadan paylaşılan tuple)"""
+    return get_trends(client).topics
+
+# Kategori kelimeleri içe aktarmada bir kez derlenir (TOPIC_KEYWORDS_FILE ile değiştirilebilir)
+topic_classifier = get_topic_classifier()
+
+def categorize_topic(topic_name):
+    """Konu kategorisini belirle (Aho-Corasick anahtar kelime otomatı, bkz. topics)"""
+    return topic_classifier.categorize(topic_name)
+
+def categorize_topics(texts):
+    """Çok sayıda konu veya tweet metnini tek geçişte kategorile"""
+    return topic_classifier.categorize_many(texts)
+
+# ============================================
+# AI CONTENT GENERATION
+# ============================================
+
+def get_relevant_examples(topic, k=3):
+    """Konuyla en ilgili beğenilen/beğenilmeyen örnekleri getir (BM25)
+    
+    Konuyla eşleşen beğeni yoksa eskisi gibi son k beğenilen kullanılır.
+    """
+    return {
+        "liked_threads": feedback_index.search(topic, "liked", k) or learned_store.last_liked(k),
+        "disliked_threads": feedback_index.search(topic, "disliked", k),
+    }
+
+def build_thread_prompt(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek"):
+    """Thread üretimi için prompt metnini oluştur"""
+    
+    # Yaratıcılık seviyesine göre talimat
+    creativity_map = {
+        "Düşük": "Güvenli, mainstream içerikler üret. Kontroversiyel konulardan kaçın.",
+        "Orta": "Dengeli içerikler üret. Hafif provokasyon tamam.",
+        "Yüksek": "Cesur ve dikkat çekici içerikler üret. Sınırları zorla.",
+        "Çılgın": "Çılgınca, absürt ve viral potansiyeli çok yüksek içerikler üret. Sınır yok!"
+    }
+    creativity_instruction = creativity_map.get(creativity, creativity_map["Yüksek"])
+    
+    # Learned examples'dan örnek tweet'leri al (bkz. get_relevant_examples)
+    examples_text = ""
+    if learned_examples and learned_examples.get("liked_threads"):
+        recent_liked = learned_examples["liked_threads"][-3:]  # En fazla 3 beğenilen
+        examples_text = "\n\nÖrnek beğenilen thread'ler (bu stili kullan):\n"
+        for i, ex in enumerate(recent_liked, 1):
+            title, tweets = thread_text(ex)
+            examples_text += f"\nÖrnek {i}:{' ' + title if title else ''}\n"
+            for tweet in tweets[:2]:  # İlk 2 tweet
+                examples_text += f"- {tweet}\n"
+    if learned_examples and learned_examples.get("disliked_threads"):
+        examples_text += "\n\nBeğenilmeyen thread'ler (bu stilden kaçın):\n"
+        for ex in learned_examples["disliked_threads"][-3:]:
+            title, tweets = thread_text(ex)
+            examples_text += f"- {title or (tweets[0] if tweets else '')}\n"
+    
+    prompt = f"""Sen viral Twitter içerik üreticisisin. Türkçe tweet thread'leri oluştur.
+
+PERSONA:
+{persona}
+{examples_text}
+
+YARATICILIK SEVİYESİ: {creativity}
+{creativity_instruction}
+
+KURALLAR:
+1. Her tweet maksimum 280 karakter olmalı
+2. Kara mizah ve villain stil kullan ve küfür serbest 
+3. Provokatif ama akıllıca ol
+4. Thread'ler 5-8 tweet uzunluğunda olmalı
+5. Emoji kullanabilirsin ama çok gerekliyse kullan
+6. Türk kültürüne uygun referanslar yap
+
+Konu: {topic}
+
+Bu konu hakkında {thread_count} farklı viral thread fikri üret. Her thread için:
+1. Thread başlığı/hook (dikkat çekici açılış)
+2. 5-8 arası tweet (her biri 280 karakter altında)
+3. Bir tweetin konusunu o konuyla sınırlı tut farklı konuları kullanmak yasaktır.
+4. Her thread'in sonunda bir soru sorarak etkileşim artır.
+5. Örneğin konusu epstein olan bir thread'de rtx4090'dan bahsetmek yasaktır.
+
+Format:
+---
+THREAD 1: [Başlık]
+1. [Tweet 1]
+2. [Tweet 2]
+...
+---
+THREAD 2: [Başlık]
+...
+
+Yaratıcı, provokatif ve viral potansiyeli yüksek içerikler üret."""
+
+    return prompt
+
+def build_single_tweet_prompt(topic, persona, tweet_count=10, creativity="Yüksek"):
+    """Bağımsız tek tweet üretimi için prompt metnini oluştur"""
+    return f"""Sen viral Twitter içerik üreticisisin.
+
+PERSONA: {persona}
+
+Konu: {topic}
+
+Bu konu hakkında {tweet_count} adet bağımsız, viral potansiyelli tek tweet üret.
+- Her tweet maksimum 280 karakter olmalı
+- Yaratıcılık seviyesi: {creativity}
+- Her tweet farklı bir bakış açısı sunmalı
+- Emoji'leri az kullan, sadece gerekiyorsa
+
+Format:
+1. [Tweet 1]
+2. [Tweet 2]
+..."""
+
+def build_hashtag_prompt(topic):
+    """Hashtag önerisi için prompt metnini oluştur"""
+    return f"""Sen Türkiye'de X (Twitter) için hashtag uzmanısın.
+
+Konu: {topic}
+
+Bu konu için en viral potansiyelli hashtag'leri öner:
+
+1. **Ana Hashtag'ler (3-5 adet):** Konuyla doğrudan ilgili, popüler
+2. **Trend Hashtag'ler (3-5 adet):** Güncel trend olan, ilgili
+3. **Niche Hashtag'ler (3-5 adet):** Daha spesifik, hedefli kitle
+4. **Mizah Hashtag'leri (3-5 adet):** Eğlenceli, dikkat çekici
+
+Her hashtag için:
+- Hashtag adı
+- Tahmini erişim potansiyeli (düşük/orta/yüksek)
+- Ne zaman kullanılmalı (açıklama)
+
+Türkçe hashtag'lere öncelik ver ama gerekirse İngilizce de kullanabilirsin."""
+
+def generate_thread_ideas(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek", provider="gemini", use_cache=True):
+    """Seçilen AI ile thread fikirleri üret"""
+    prompt = build_thread_prompt(topic, persona, learned_examples, thread_count, creativity)
+    return generate_with_ai(prompt, provider, use_cache)
+
+def generate_thread_ideas_multi(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek", providers=("gemini",), strategy="race", use_cache=True):
+    """Thread fikirlerini birden fazla AI ile paralel üret
+    
+    Yarışta "iyi cevap", en az bir thread parse edilebilen cevaptır. Sonuçlara
+    parse edilmiş "threads" listesi de eklenir.
+    """
+    prompt = build_thread_prompt(topic, persona, learned_examples, thread_count, creativity)
+    results = generate_with_providers(
+        prompt,
+        list(providers),
+        strategy,
+        is_good=lambda result: bool(parse_threads(result["content"])),
+        use_cache=use_cache
+    )
+    for result in results:
+        result["threads"] = parse_threads(result["content"]) if result["content"] else []
+    return results
+
+def stream_thread_ideas(topic, persona, learned_examples=None, thread_count=5, creativity="Yüksek", provider="gemini", use_cache=True):
+    """Seçilen AI ile thread fikirleri üret (parça parça, bkz. generate_with_ai_stream)"""
+    prompt = build_thread_prompt(topic, persona, learned_examples, thread_count, creativity)
+    return generate_with_ai_stream(prompt, provider, use_cache)
+
+class ThreadStreamParser:
+    """AI çıktısını parça parça okuyup tamamlanan thread'leri hemen veren parser
+    
+    Bir thread, sonraki "THREAD n:" başlığı veya "---" ayracı geldiğinde
+    tamamlanmış sayılır. Sadece son yarım satır tamponda tutulur, büyüyen
+    metin tekrar tekrar bölünmez.
+    """
+    
+    def __init__(self):
+        self._pending = ""
+        self._current = None
+        self._emitted = False
+    
+    def feed(self, chunk):
+        """Yeni metin parçasını işle, tamamlanan thread'leri yield et"""
+        lines = (self._pending + chunk).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            yield from self._process_line(line)
+    
+    def close(self):
+        """Akış bittiğinde tampondaki son satırı ve açık thread'i yield et"""
+        line, self._pending = self._pending, ""
+        yield from self._process_line(line)
+        if self._current and not self._emitted:
+            yield self._current
+        self._current = None
+    
+    def _process_line(self, line):
+        line = line.strip()
+        if line.startswith("THREAD") and ":" in line:
+            if self._current and not self._emitted:
+                yield self._current
+            title = line.split(":", 1)[1].strip()
+            self._current = {"title": title, "tweets": []}
+            self._emitted = False
+        elif line.startswith("---"):
+            # Ayraç thread'i kapatır. Ayraçtan sonra başlıksız tweet gelirse
+            # (parse_threads ile aynı sonuç için) yine aynı dict'e eklenir.
+            if self._current and not self._emitted:
+                self._emitted = True
+                yield self._current
+        elif line and self._current is not None:
+            # Numaralı tweet'leri al
+            if line[0].isdigit() and "." in line[:3]:
+                tweet = line.split(".", 1)[1].strip()
+                if tweet and len(tweet) <= 280:
+                    self._current["tweets"].append(tweet)
+                elif tweet and len(tweet) > 280:
+                    # 280'e kırp
+                    self._current["tweets"].append(tweet[:277] + "...")
+
+def parse_threads(content):
+    """OpenAI çıktısını thread listesine dönüştür"""
+    parser = ThreadStreamParser()
+    threads = list(parser.feed(content))
+    threads.extend(parser.close())
+    return threads
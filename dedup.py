@@ -0,0 +1,223 @@
+"""
+Tekrar (Near-Duplicate) Tespiti
+===============================
+Thread'lerin MinHash imzaları (tek permütasyonlu MinHash + densification: her
+shingle bir kez hash'lenir) üzerinde LSH (banding) indeksi. Yeni bir thread,
+daha önce üretilmiş veya beğenilmiş/beğenilmemiş bir thread'e belli bir
+benzerliğin üzerinde yakınsa işaretlenir (veya elenir). Sorgu maliyeti, tüm
+geçmişle karşılaştırma yerine sadece aynı kovaya düşen adaylarla sınırlıdır.
+"""
+
+import hashlib
+import threading
+from array import array
+
+from retrieval import thread_text
+from turkish_text import tokenize
+
+_UINT32_MASK = 0xFFFFFFFF
+# Boş kovaları doldururken mesafeyi değere karıştırmak için sabit (densification)
+_DENSIFY_STEP = 0x9E3779B1
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 8  # 8 bant x 8 satır: ~%77 benzerlikte aday olma olasılığı %50
+DEFAULT_THRESHOLD = 0.8
+# annotate'in eklediği alanlar (kaydederken çıkarılır)
+DUPLICATE_FIELDS = ("similarity", "duplicate_of")
+
+
+def _shingle_hashes(text):
+    tokens = tokenize(text, stem=False)
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+
+
+def thread_fingerprint_text(thread):
+    """Thread dict'inden (veya öğrenilmiş kayıttan) imzalanacak metni üret"""
+    if isinstance(thread, dict) and "thread" in thread:
+        title, tweets = thread_text(thread)
+    else:
+        title, tweets = thread.get("title", ""), thread.get("tweets", [])
+    return " ".join([title] + list(tweets))
+
+
+def content_key(text):
+    """Metnin birebir içerik hash'i (aynı üretimin tekrar gelişini tanımak için)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH ile alt-doğrusal benzerlik araması"""
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=DEFAULT_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm, bands'e tam bölünmeli")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets = [{} for _ in range(bands)]  # band -> {band hash: [id, ...]}
+        self._signatures = []  # id -> array('I')
+        self._labels = []
+        self._keys = []  # id -> içerik hash'i (sadece üretilen kayıtlarda)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text):
+        """Metnin MinHash imzası (boş metin için None)
+
+        Her shingle hash'i bir kovaya (h % num_perm) düşer, kovada en küçük değer
+        tutulur. Boş kovalar sağdaki ilk dolu kovadan türetilir.
+        """
+        hashes = _shingle_hashes(text)
+        if not hashes:
+            return None
+        num_perm = self.num_perm
+        empty = _UINT32_MASK + 1
+        sig = [empty] * num_perm
+        for h in hashes:
+            slot = h % num_perm
+            value = (h // num_perm) & _UINT32_MASK
+            if value < sig[slot]:
+                sig[slot] = value
+        filled = list(sig)
+        for i in range(num_perm):
+            if filled[i] == empty:
+                distance = 1
+                while filled[(i + distance) % num_perm] == empty:
+                    distance += 1
+                sig[i] = (filled[(i + distance) % num_perm] + distance * _DENSIFY_STEP) & _UINT32_MASK
+        return array("I", sig)
+
+    def _band_keys(self, sig):
+        rows = self.rows
+        return [hash(tuple(sig[i * rows:(i + 1) * rows])) for i in range(self.bands)]
+
+    def add(self, sig, label, key=None):
+        """İmzayı etiketiyle indekse ekle
+
+        key: query(exclude=...) ile atlanabilecek kayıtların içerik hash'i;
+        verilmeyen kayıtlar (beğenilen/beğenilmeyen geçmiş) hiçbir zaman atlanmaz.
+        """
+        if sig is None:
+            return
+        doc_id = len(self._signatures)
+        self._signatures.append(sig)
+        self._labels.append(label)
+        self._keys.append(key)
+        for bucket, key in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(key, []).append(doc_id)
+
+    def query(self, sig, exclude=None):
+        """Eşiğin üzerindeki en benzer kaydı (benzerlik, etiket) olarak döndür, yoksa None
+
+        exclude: bu içerik hash'iyle eklenmiş kayıt (adayın kendi üretim kaydı) atlanır.
+        """
+        if sig is None:
+            return None
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(sig)):
+            candidates.update(bucket.get(key, ()))
+        best = None
+        for doc_id in candidates:
+            if exclude is not None and self._keys[doc_id] == exclude:
+                continue
+            other = self._signatures[doc_id]
+            similarity = sum(1 for x, y in zip(sig, other) if x == y) / self.num_perm
+            if similarity >= self.threshold and (best is None or similarity > best[0]):
+                best = (similarity, self._labels[doc_id])
+        return best
+
+
+class DuplicateDetector:
+    """Öğrenilmiş örnek deposunu ve üretilen thread'leri izleyen tekrar dedektörü"""
+
+    def __init__(self, store, threshold=DEFAULT_THRESHOLD):
+        self.store = store
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._generated = []  # (imza, etiket, içerik hash'i) - yeniden kurulumda tekrar eklenir
+        self._generated_keys = set()
+        self._index = None
+        self._synced = {}
+        self._last_entries = {}
+
+    def _rebuild(self):
+        self._index = NearDuplicateIndex(threshold=self.threshold)
+        self._synced = {}
+        self._last_entries = {}
+        for sig, label, key in self._generated:
+            self._index.add(sig, label, key)
+
+    def _sync(self):
+        data = self.store.load()
+        if self._index is None:
+            self._rebuild()
+        for key, prefix in (("liked_threads", "👍"), ("disliked_threads", "👎")):
+            entries = data[key]
+            synced = self._synced.get(key, 0)
+            # Veri sıfırlandıysa (son işlenen kayıt yerinde değil) baştan kur
+            if synced > len(entries) or (synced and entries[synced - 1] != self._last_entries.get(key)):
+                self._rebuild()
+                return self._sync()
+            for entry in entries[synced:]:
+                title, _ = thread_text(entry)
+                # Geçmiş kayıtlar anahtarsız eklenir: birebir kopyaları da tekrar sayılır
+                sig = self._index.signature(thread_fingerprint_text(entry))
+                self._index.add(sig, f"{prefix} {title or 'Başlıksız thread'}")
+            self._synced[key] = len(entries)
+            if entries:
+                self._last_entries[key] = entries[-1]
+
+    def annotate(self, threads, drop=False, source="Üretilen"):
+        """Thread'leri geçmişe karşı kontrol et ve geçmişe ekle
+
+        Girdi değiştirilmez; thread'lerin sığ kopyaları döner. Tekrar olanlara
+        "duplicate_of" ve "similarity" alanları eklenir; drop=True ise tekrarlar
+        sonuç listesinden çıkarılır. Aynı grup içindeki tekrarlar da yakalanır.
+        Daha önce üretilmiş birebir aynı metin (ör. önbellekten tekrar gelen
+        üretim) kendi kaydının tekrarı sayılmaz ve indekse ikinci kez eklenmez;
+        beğenilen/beğenilmeyen bir thread'in birebir kopyası ise işaretlenir.
+        """
+        result = []
+        batch = {}  # bu çağrıda kabul edilen içerik hash'i -> etiket
+        with self._lock:
+            self._sync()
+            for thread in threads:
+                thread = {k: v for k, v in thread.items() if k not in DUPLICATE_FIELDS}
+                text = thread_fingerprint_text(thread)
+                key = content_key(text)
+                sig = self._index.signature(text)
+                match = (1.0, batch[key]) if key in batch else self._index.query(sig, exclude=key)
+                if match:
+                    thread["similarity"], thread["duplicate_of"] = match
+                    if drop:
+                        continue
+                else:
+                    label = f"{source}: {thread.get('title') or 'Başlıksız thread'}"
+                    batch[key] = label
+                    if key not in self._generated_keys:
+                        self._index.add(sig, label, key)
+                        self._generated.append((sig, label, key))
+                        self._generated_keys.add(key)
+                result.append(thread)
+        return result
+
+
+_detectors = {}
+_detectors_lock = threading.Lock()
+
+
+def get_duplicate_detector(store):
+    """Depo başına süreç genelinde tek dedektör"""
+    with _detectors_lock:
+        if id(store) not in _detectors:
+            _detectors[id(store)] = DuplicateDetector(store)
+        return _detectors[id(store)]
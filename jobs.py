@@ -0,0 +1,231 @@
+"""
+Arka Plan İşleri
+================
+Thread, tek tweet ve hashtag üretimini Streamlit script thread'i dışında,
+süreç genelinde paylaşılan bir thread havuzunda çalıştırır.
+
+İşler bu modülde yaşar; Streamlit rerun'ları (widget etkileşimi) app.py'yi
+baştan çalıştırsa da devam eden üretim kesilmez. Oturum sadece kendi iş
+ID'lerini st.session_state'te tutar ve durumlarını buradan sorgular. Aynı
+oturum birden fazla işi paralel çalıştırabilir; sağlayıcı kotaları yine
+rate_limits üzerinden paylaşılır.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core import (
+    ThreadStreamParser,
+    duplicate_detector,
+    generate_thread_ideas_multi,
+    generate_with_ai,
+    stream_thread_ideas,
+)
+
+DEFAULT_WORKERS = 8
+# Biten işler bu süreden sonra bellekten atılır (saniye)
+JOB_RETENTION = 60 * 60
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+
+
+class Job:
+    """Tek bir arka plan işi: durum, ilerleme ve sonuç"""
+
+    def __init__(self, kind, label, meta=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.meta = meta or {}
+        self.status = QUEUED
+        self.progress = ""
+        self.partial = {}  # İş sürerken gelen ara sonuçlar (ör. tamamlanan thread'ler)
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def report(self, progress=None, **partial):
+        """İşin içinden ilerleme bildir (thread-safe)"""
+        with self._lock:
+            if progress is not None:
+                self.progress = progress
+            self.partial.update(partial)
+
+    def check_cancelled(self):
+        """İptal istendiyse JobCancelled fırlat (iş içinden düzenli çağrılır)"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def snapshot(self):
+        """Arayüz için tutarlı bir kopya"""
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "label": self.label,
+                "status": self.status,
+                "progress": self.progress,
+                "partial": dict(self.partial),
+                "error": self.error,
+                "elapsed": self.elapsed,
+            }
+
+
+class JobManager:
+    """Süreç genelinde iş kuyruğu ve thread havuzu"""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gen-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._futures = {}
+
+    def submit(self, kind, label, fn, *args, meta=None, **kwargs):
+        """fn(job, *args, **kwargs)'ı arka planda çalıştır ve Job döndür"""
+        self.prune()
+        job = Job(kind, label, meta)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job._cancel.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            self._finish(job, DONE)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+
+    def _finish(self, job, status):
+        job.finished = time.time()
+        job.status = status
+        with self._lock:
+            self._futures.pop(job.id, None)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_many(self, job_ids):
+        """Verilen ID'lerden hâlâ bellekte olan işleri sırayla döndür"""
+        with self._lock:
+            return [self._jobs[j] for j in job_ids if j in self._jobs]
+
+    def cancel(self, job_id):
+        """İşi iptal et: sıradaysa hiç başlamaz, çalışıyorsa ilk fırsatta durur"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+        if job is None or job.done:
+            return
+        job._cancel.set()
+        if future is not None and future.cancel():
+            self._finish(job, CANCELLED)
+
+    def prune(self):
+        """Saklama süresi dolmuş bitmiş işleri at"""
+        cutoff = time.time() - JOB_RETENTION
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.done and j.finished < cutoff]:
+                del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+
+job_manager = JobManager(max_workers=int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS)))
+
+
+# ============================================
+# İŞ FONKSİYONLARI
+# ============================================
+
+def run_thread_job(job, topic, persona, learned_examples, thread_count, creativity, provider, use_cache=True, hide_duplicates=False):
+    """Tek sağlayıcıyla thread üret; tamamlanan thread'leri geldikçe bildir"""
+    chunks, error = stream_thread_ideas(topic, persona, learned_examples, thread_count, creativity, provider, use_cache)
+    if error:
+        raise RuntimeError(error)
+    job.report("AI içerik üretiyor...")
+    parser = ThreadStreamParser()
+    content = ""
+    threads = []
+    try:
+        for chunk in chunks:
+            job.check_cancelled()
+            content += chunk
+            threads.extend(parser.feed(chunk))
+            job.report(f"{len(threads)} thread hazır", threads=list(threads), content=content)
+        threads.extend(parser.close())
+    finally:
+        # İptalde alttaki HTTP akışını da kapatır
+        chunks.close()
+    return {
+        "content": content,
+        "threads": duplicate_detector.annotate(threads, drop=hide_duplicates),
+    }
+
+
+def run_multi_thread_job(job, topic, persona, learned_examples, thread_count, creativity, providers, strategy, use_cache=True, hide_duplicates=False):
+    """Birden fazla sağlayıcıyla (yarış/birleştir) thread üret"""
+    job.report(f"{len(providers)} sağlayıcı paralel çalışıyor...")
+    results = generate_thread_ideas_multi(
+        topic, persona, learned_examples, thread_count, creativity, providers, strategy, use_cache
+    )
+    job.check_cancelled()
+
+    succeeded = [r for r in results if r["threads"]]
+    if not succeeded:
+        raise RuntimeError("; ".join(f"{r['provider']}: {r['error'] or 'thread bulunamadı'}" for r in results))
+    threads = []
+    for r in succeeded:
+        for thread in r["threads"]:
+            thread["provider"] = r["provider"]
+            threads.append(thread)
+    return {
+        "content": "\n\n".join(f"=== {r['provider']} ===\n{r['content']}" for r in succeeded),
+        "threads": duplicate_detector.annotate(threads, drop=hide_duplicates),
+        "provider_results": [{k: r[k] for k in ("provider", "error", "elapsed", "threads")} for r in results],
+    }
+
+
+def run_text_job(job, prompt, provider, use_cache=True):
+    """Tek parça metin üret (tek tweet, hashtag önerisi)"""
+    job.report("AI içerik üretiyor...")
+    result, error = generate_with_ai(prompt, provider, use_cache=use_cache)
+    job.check_cancelled()
+    if error:
+        raise RuntimeError(error)
+    return result
@@ -0,0 +1,325 @@
+"""
+Öğrenilmiş Örnek Deposu
+=======================
+Beğeni/beğenmeme kayıtlarını tüm dosyayı yeniden yazmak yerine append-only bir
+JSONL günlüğüne ekler. Günlük belli bir boyutu aşınca snapshot'a (eski
+learned_examples.json formatı) sıkıştırılır. Okuma = snapshot + günlük kuyruğu.
+
+Sıkıştırma çökmeye dayanıklıdır: günlüğün ilk satırı bir nesil numarası
+taşır, snapshot da içine aldığı günlük neslini saklar. Snapshot yazılıp günlük
+henüz yenilenmeden çökülürse, eski günlüğün kayıtları (nesli snapshot'takinden
+büyük olmadığı için) yüklemede atlanır ve iki kez eklenmez.
+
+Eşzamanlı oturumlar için tüm işlemler bir kilit dosyası üzerinden serileştirilir
+(okuma: paylaşımlı, yazma/sıkıştırma: özel kilit).
+
+Depo ayrıca bellekte bir görünüm tutar: dosyaların mtime/boyutu değişmedikçe
+tekrar parse edilmez, günlük büyüdüyse sadece yeni satırlar okunur. Deponun
+kendi yazmaları (append, save, compact) görünümü doğrudan günceller.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_SNAPSHOT_FILE = "learned_examples.json"
+# Günlük bu boyutu aşınca snapshot'a sıkıştırılır (byte)
+COMPACT_THRESHOLD_BYTES = 1024 * 1024
+
+# Snapshot'ta içine alınmış günlük nesli (görünüme konmaz)
+GENERATION_KEY = "journal_generation"
+
+KIND_KEYS = {
+    "liked": "liked_threads",
+    "disliked": "disliked_threads",
+}
+
+
+def empty_examples():
+    return {"liked_threads": [], "disliked_threads": []}
+
+
+class LearnedExamplesStore:
+    """Snapshot + append-only günlükten oluşan öğrenilmiş örnek deposu"""
+
+    def __init__(self, snapshot_path=DEFAULT_SNAPSHOT_FILE, compact_threshold=COMPACT_THRESHOLD_BYTES):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".jsonl"
+        self.lock_path = snapshot_path + ".lock"
+        self.compact_threshold = compact_threshold
+        # Bellek içi görünüm
+        self._view_lock = threading.Lock()
+        self._data = None
+        self._snapshot_sig = None
+        self._journal_offset = 0
+        self._journal_generation = 0
+        # Günlük, snapshot'ın zaten içerdiği nesilden mi (yarım kalmış sıkıştırma)
+        self._journal_stale = False
+        self._version = 0
+        self._export_cache = (None, None)  # (version, json metni)
+
+    @contextmanager
+    def _locked(self, exclusive):
+        with open(self.lock_path, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                # msvcrt sadece özel kilit destekler
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_snapshot(self):
+        """(veri, içine alınmış günlük nesli); eski snapshot'larda nesil -1"""
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty_examples(), -1
+        absorbed = data.pop(GENERATION_KEY, -1)
+        for key in KIND_KEYS.values():
+            data.setdefault(key, [])
+        return data, absorbed
+
+    def _read_journal(self, offset=0):
+        """offset'ten itibaren tamamlanmış günlük kayıtlarını ve yeni offset'i döndür
+        
+        Yarım kalmış son satır (yazma sırasında çökme) sonraki okumaya bırakılır.
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                raw = f.read()
+        except OSError:
+            return [], offset
+        end = raw.rfind(b"\n") + 1
+        records = []
+        for line in raw[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records, offset + end
+
+    @staticmethod
+    def _apply(data, records):
+        for record in records:
+            key = KIND_KEYS.get(record.get("kind"))
+            if key:
+                data[key].append(record["entry"])
+
+    @staticmethod
+    def _generation(records):
+        # Günlüğün ilk satırı {"generation": n}; başlıksız (eski) günlük 0. nesil
+        if records and "generation" in records[0]:
+            return records[0]["generation"]
+        return 0
+
+    def _load_unlocked(self):
+        """(veri, günlük offset'i, günlük nesli, günlük eskimiş mi)"""
+        data, absorbed = self._read_snapshot()
+        records, offset = self._read_journal()
+        generation = self._generation(records)
+        # Snapshot bu nesli zaten içeriyorsa (sıkıştırma yarıda kalmış) tekrar ekleme
+        stale = generation <= absorbed
+        if stale:
+            generation = absorbed
+        else:
+            self._apply(data, records)
+        return data, offset, generation, stale
+
+    def _file_sig(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def _set_view(self, data, journal_offset, generation, stale=False):
+        self._data = data
+        self._snapshot_sig = self._file_sig(self.snapshot_path)
+        self._journal_offset = journal_offset
+        self._journal_generation = generation
+        self._journal_stale = stale
+        self._version += 1
+
+    def _refresh(self):
+        """Görünümü dosyalarla senkronize et (değişiklik yoksa sadece iki stat çağrısı)"""
+        if (self._data is not None
+                and self._file_sig(self.snapshot_path) == self._snapshot_sig
+                and self._journal_size() == self._journal_offset):
+            return
+        with self._locked(exclusive=False):
+            # Kilit altında tekrar kontrol: arada başka bir süreç sıkıştırmış olabilir
+            if (self._data is not None
+                    and self._file_sig(self.snapshot_path) == self._snapshot_sig
+                    and self._journal_size() >= self._journal_offset):
+                records, offset = self._read_journal(self._journal_offset)
+                if records:
+                    self._apply(self._data, records)
+                    self._version += 1
+                self._journal_offset = offset
+                return
+            self._set_view(*self._load_unlocked())
+
+    def _write_snapshot_unlocked(self, data, generation):
+        """Snapshot'ı yaz, sonra günlüğü yeni nesille yenile ve görünümü güncelle
+
+        generation: snapshot'ın içine aldığı (mevcut) günlük nesli.
+        """
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**data, GENERATION_KEY: generation}, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._set_view(data, self._rotate_journal(generation + 1), generation + 1)
+
+    def _rotate_journal(self, generation):
+        """Günlüğü sadece nesil başlığı içeren yeni bir dosyayla atomik olarak değiştir"""
+        header = (json.dumps({"generation": generation}) + "\n").encode("utf-8")
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        return len(header)
+
+    def _recover_unlocked(self):
+        """Yarım kalmış sıkıştırmayı tamamla (özel kilit altında, günlüğe yazmadan önce)
+
+        Snapshot'ın zaten içerdiği günlüğe eklenen kayıt yüklemede atlanırdı.
+        """
+        if self._data is None or self._file_sig(self.snapshot_path) != self._snapshot_sig:
+            self._set_view(*self._load_unlocked())
+        if self._journal_stale:
+            generation = self._journal_generation + 1
+            self._journal_offset = self._rotate_journal(generation)
+            self._journal_generation = generation
+            self._journal_stale = False
+
+    def _current_generation(self):
+        try:
+            with open(self.journal_path, "rb") as f:
+                first = f.readline()
+        except OSError:
+            return 0
+        try:
+            return self._generation([json.loads(first)])
+        except ValueError:
+            return 0
+
+    def load(self):
+        """Tüm örnekleri döndür (paylaşılan görünüm, değiştirilmemeli)"""
+        with self._view_lock:
+            self._refresh()
+            return self._data
+
+    def save(self, data):
+        """Tüm veriyi snapshot olarak yaz ve günlüğü sıfırla (sıfırlama/içe aktarma için)"""
+        with self._view_lock:
+            with self._locked(exclusive=True):
+                self._write_snapshot_unlocked(data, self._current_generation())
+
+    def append(self, kind, entry):
+        """Tek kaydı günlüğe atomik olarak ekle (O(1), dosyanın tamamı yazılmaz)
+        
+        Görünüm dosyalarla senkronsa kayıt doğrudan görünüme de eklenir; değilse
+        (başka bir süreç araya yazmışsa) bir sonraki okumada günlükten okunur.
+        """
+        if kind not in KIND_KEYS:
+            raise ValueError(f"Bilinmeyen kayıt türü: {kind}")
+        record = {"kind": kind, "entry": entry}
+        raw = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._view_lock:
+            with self._locked(exclusive=True):
+                self._recover_unlocked()
+                # O_APPEND + tek write çağrısı: satır ya tamamen yazılır ya hiç
+                fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, raw)
+                    journal_size = os.fstat(fd).st_size
+                finally:
+                    os.close(fd)
+                if journal_size >= self.compact_threshold:
+                    data, _, generation, _ = self._load_unlocked()
+                    self._write_snapshot_unlocked(data, generation)
+                elif (self._data is not None
+                        and self._file_sig(self.snapshot_path) == self._snapshot_sig
+                        and journal_size - len(raw) == self._journal_offset):
+                    # Günlükten okunmuş gibi olsun diye kaydın kendi kopyası eklenir
+                    self._apply(self._data, [json.loads(raw)])
+                    self._journal_offset = journal_size
+                    self._version += 1
+
+    def compact(self):
+        """Günlüğü snapshot'a sıkıştır"""
+        with self._view_lock:
+            with self._locked(exclusive=True):
+                data, _, generation, _ = self._load_unlocked()
+                self._write_snapshot_unlocked(data, generation)
+
+    # ---- Ucuz sorgular (görünüm üzerinden) ----
+
+    def version(self):
+        """Veri her değiştiğinde artan sayaç (türetilmiş önbellekler için)"""
+        with self._view_lock:
+            self._refresh()
+            return self._version
+
+    def counts(self):
+        """{"liked": n, "disliked": m} (O(1))"""
+        data = self.load()
+        return {kind: len(data[key]) for kind, key in KIND_KEYS.items()}
+
+    def last_liked(self, n):
+        """Son n beğenilen kayıt"""
+        return self.load()["liked_threads"][-n:] if n > 0 else []
+
+    def last_disliked(self, n):
+        """Son n beğenilmeyen kayıt"""
+        return self.load()["disliked_threads"][-n:] if n > 0 else []
+
+    def export_json(self):
+        """İndirilebilir JSON metni (sadece veri değiştiğinde yeniden üretilir)"""
+        with self._view_lock:
+            self._refresh()
+            version, text = self._export_cache
+            if version != self._version:
+                text = json.dumps(self._data, ensure_ascii=False, indent=2)
+                self._export_cache = (self._version, text)
+            return text
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(snapshot_path=DEFAULT_SNAPSHOT_FILE):
+    """Yol başına süreç genelinde tek depo (Streamlit rerun'ları arasında görünüm korunur)"""
+    key = os.path.abspath(snapshot_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = LearnedExamplesStore(snapshot_path)
+        return _stores[key]
@@ -0,0 +1,178 @@
+"""
+LLM Yanıt Önbelleği
+===================
+Son prompt metni + sağlayıcı/model hash'iyle anahtarlanan iki katmanlı önbellek:
+bellekte LRU, diskte TTL'li JSON dosyaları.
+
+Disk okuma/yazmaları kilit dışında yapılır; kilit sadece bellek katmanı ve
+sayaçlar için tutulur. Süresi dolmuş dosyalar okunurken, hiç okunmayanlar da
+periyodik yaş temizliğinde silinir.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = ".llm_cache"
+DEFAULT_TTL = 24 * 60 * 60  # saniye
+DEFAULT_MAX_ENTRIES = 256
+# Diskteki süresi dolmuş dosyaların taranma aralığı (saniye)
+PRUNE_INTERVAL = 60 * 60
+
+
+def cache_key(prompt, provider, model):
+    """Prompt ve sağlayıcı/modelden içerik adresli anahtar üret"""
+    raw = f"{provider}\x1f{model}\x1f{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Bellek (LRU) + disk (TTL) katmanlı yanıt önbelleği"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> entry
+        self._last_prune = 0.0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "saved_seconds": 0.0,
+            "saved_chars": 0,
+        }
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _expired(self, entry):
+        return time.time() - entry["created"] > self.ttl
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, kind, entry):
+        self._stats[kind] += 1
+        self._stats["saved_seconds"] += entry.get("elapsed", 0.0)
+        self._stats["saved_chars"] += len(entry["text"])
+
+    def get(self, key):
+        """Önbellekteki yanıtı döndür; yoksa veya süresi dolmuşsa None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self._memory.move_to_end(key)
+                    self._record_hit("memory_hits", entry)
+                    return entry["text"]
+                del self._memory[key]
+
+        # Disk okuması kilit dışında: diğer oturumların bellek isabetleri beklemez
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is not None:
+                self._remember(key, entry)
+                self._record_hit("disk_hits", entry)
+                return entry["text"]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key, text, elapsed=0.0):
+        """Yanıtı iki katmana da yaz (elapsed: üretim süresi, tasarruf hesabı için)"""
+        now = time.time()
+        entry = {"text": text, "created": now, "elapsed": elapsed}
+        with self._lock:
+            self._remember(key, entry)
+            prune = now - self._last_prune >= PRUNE_INTERVAL
+            if prune:
+                self._last_prune = now
+        # Eşzamanlı yazanlar birbirinin geçici dosyasını ezmesin
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Disk katmanı opsiyonel; bellek katmanı çalışmaya devam eder
+            pass
+        if prune:
+            self.prune(now)
+
+    def prune(self, now=None):
+        """Diskte süresi dolmuş (veya yarım kalmış) dosyaları sil; silinen sayısını döndür
+
+        Dosya yaşı mtime'dan okunur, içerik parse edilmez.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return 0
+        for item in entries:
+            if not (item.name.endswith(".json") or item.name.endswith(".tmp")):
+                continue
+            try:
+                if now - item.stat().st_mtime > self.ttl:
+                    os.remove(item.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._expired(entry):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def clear(self):
+        """Her iki katmanı da temizle"""
+        with self._lock:
+            self._memory.clear()
+            if os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".json") or name.endswith(".tmp"):
+                        try:
+                            os.remove(os.path.join(self.cache_dir, name))
+                        except OSError:
+                            pass
+
+    def stats(self):
+        """İsabet/ıska sayaçları ve tahmini tasarruf"""
+        with self._lock:
+            report = dict(self._stats)
+            hits = report["memory_hits"] + report["disk_hits"]
+            total = hits + report["misses"]
+            report["hits"] = hits
+            report["hit_ratio"] = hits / total if total else 0.0
+            report["memory_entries"] = len(self._memory)
+            # Kaba token tahmini: ~4 karakter / token
+            report["saved_tokens"] = report["saved_chars"] // 4
+            return report
+
+
+# Süreç genelinde tek önbellek (tüm Streamlit oturumları paylaşır)
+response_cache = ResponseCache(
+    cache_dir=os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR),
+    ttl=int(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL)),
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+)
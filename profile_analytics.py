@@ -0,0 +1,170 @@
+"""
+Profil Etkileşim Analizi
+========================
+Depodaki tüm zaman tünelini sütun dizilerine (NumPy) yükler ve Profil
+sekmesinin ihtiyaç duyduğu her şeyi vektörel olarak hesaplar:
+
+- Tweet başına etkileşim oranı (etkileşim / takipçi, %),
+- Son 7 ve 30 tweet'in hareketli ortalaması,
+- Yüzdelikler (p50/p75/p90/p99),
+- Medyan ve MAD tabanlı robust z-skoru ile "viral" aykırı tweet'ler,
+- categorize_topic kategorilerine göre dağılım.
+
+Sonuçlar veri sürümüne (tweet sayısı, son yenileme zamanı, takipçi sayısı)
+göre önbelleklenir; veri değişmedikçe tekrar çizimler hesap yapmaz.
+"""
+
+import threading
+
+import numpy as np
+
+from topics import get_topic_classifier
+
+ROLLING_WINDOWS = (7, 30)
+PERCENTILES = (50, 75, 90, 99)
+# Robust z-skoru bu değerin üzerindeyse tweet "viral" sayılır (Iglewicz-Hoaglin)
+VIRAL_Z = 3.5
+_MAD_SCALE = 0.6745
+# MAD sıfırsa ortalama mutlak sapma ile (Iglewicz-Hoaglin)
+_MEANAD_SCALE = 0.7979
+
+# tweet_store.timeline_rows sütunları
+_ID, _EPOCH, _TEXT, _LIKES, _RETWEETS, _REPLIES, _QUOTES, _IMPRESSIONS = range(8)
+
+
+def rolling_mean(values, window):
+    """Son window değerin ortalaması (ilk değerlerde mevcut kadarının)"""
+    if not len(values):
+        return values.astype(np.float64)
+    sums = np.cumsum(values, dtype=np.float64)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums / np.minimum(np.arange(1, len(values) + 1), window)
+
+
+class ProfileAnalytics:
+    """Bir hesabın zaman tünelinin değiştirilmeyen analiz sonucu"""
+
+    def __init__(self, rows, followers):
+        self.followers = followers
+        self.ids = [row[_ID] for row in rows]
+        self.texts = [row[_TEXT] for row in rows]
+        numbers = np.array([(row[_EPOCH],) + tuple(row[_LIKES:]) for row in rows], dtype=np.float64).reshape(-1, 6)
+        self.epochs = numbers[:, 0]
+        self.likes, self.retweets, self.replies, self.quotes, self.impressions = numbers[:, 1:].T
+        self.interactions = self.likes + self.retweets + self.replies + self.quotes
+        self.engagement_rate = self.interactions / max(followers, 1) * 100
+
+        self.rolling = {w: rolling_mean(self.engagement_rate, w) for w in ROLLING_WINDOWS}
+        self.percentiles = self._percentiles()
+        self.viral_z = self._robust_z(np.log1p(self.interactions))
+        self.categories, self.by_category = self._category_breakdown()
+
+    @property
+    def count(self):
+        return len(self.ids)
+
+    def _percentiles(self):
+        if not self.count:
+            return {}
+        values = np.percentile(np.vstack([self.engagement_rate, self.likes]), PERCENTILES, axis=1)
+        return {
+            p: {"engagement_rate": float(rate), "likes": float(likes)}
+            for p, (rate, likes) in zip(PERCENTILES, values)
+        }
+
+    @staticmethod
+    def _robust_z(values):
+        """Medyan/MAD z-skoru: birkaç çok büyük tweet ortalamayı ve std'yi bozmaz
+
+        Tweet'lerin yarıdan fazlası aynı değerdeyse (küçük hesaplarda 0-1
+        etkileşim) MAD sıfırdır; o zaman ortalama mutlak sapma kullanılır.
+        """
+        if not len(values):
+            return values
+        median = np.median(values)
+        deviations = np.abs(values - median)
+        mad = np.median(deviations)
+        if mad > 0:
+            return _MAD_SCALE * (values - median) / mad
+        mean_ad = deviations.mean()
+        if mean_ad == 0:
+            return np.zeros_like(values)
+        return _MEANAD_SCALE * (values - median) / mean_ad
+
+    def _category_breakdown(self):
+        labels = get_topic_classifier().categorize_many(self.texts)
+        if not labels:
+            return np.empty(0, dtype=object), []
+        names, inverse = np.unique(np.array(labels, dtype=object), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(names))
+        interactions = np.bincount(inverse, weights=self.interactions, minlength=len(names))
+        rates = np.bincount(inverse, weights=self.engagement_rate, minlength=len(names))
+        breakdown = [
+            {
+                "category": str(name),
+                "tweets": int(count),
+                "share": float(count / self.count * 100),
+                "avg_interactions": float(total / count),
+                "avg_engagement_rate": float(rate / count),
+            }
+            for name, count, total, rate in zip(names, counts, interactions, rates)
+        ]
+        breakdown.sort(key=lambda row: row["avg_engagement_rate"], reverse=True)
+        return np.array(labels, dtype=object), breakdown
+
+    def summary(self):
+        """Ortalama metrikler ve medyan etkileşim oranı"""
+        if not self.count:
+            return {}
+        return {
+            "tweets": self.count,
+            "avg_likes": float(self.likes.mean()),
+            "avg_retweets": float(self.retweets.mean()),
+            "avg_replies": float(self.replies.mean()),
+            "avg_quotes": float(self.quotes.mean()),
+            "avg_engagement_rate": float(self.engagement_rate.mean()),
+            "median_engagement_rate": float(np.median(self.engagement_rate)),
+            "viral_count": int((self.viral_z > VIRAL_Z).sum()),
+        }
+
+    def viral(self, limit=5):
+        """z-skoru en yüksek aykırı (viral) tweet'ler"""
+        candidates = np.flatnonzero(self.viral_z > VIRAL_Z)
+        top = candidates[np.argsort(-self.viral_z[candidates], kind="stable")[:limit]]
+        return [
+            {
+                "id": self.ids[i],
+                "text": self.texts[i],
+                "created_at": float(self.epochs[i]),
+                "interactions": int(self.interactions[i]),
+                "engagement_rate": float(self.engagement_rate[i]),
+                "z": float(self.viral_z[i]),
+                "category": str(self.categories[i]),
+            }
+            for i in top
+        ]
+
+    def trend(self):
+        """Grafik için zaman serisi: epoch, oran ve hareketli ortalamalar"""
+        series = {"epoch": self.epochs, "engagement_rate": self.engagement_rate}
+        for window, values in self.rolling.items():
+            series[f"rolling_{window}"] = values
+        return series
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_analytics(store, user_id, followers):
+    """Kullanıcının analizi; veri sürümü değişmediyse önbellekten"""
+    version = tuple(store.dataset_version(user_id)) + (followers,)
+    key = (id(store), str(user_id))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    analytics = ProfileAnalytics(store.timeline_rows(user_id), followers)
+    with _cache_lock:
+        _cache[key] = (version, analytics)
+    return analytics
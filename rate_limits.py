@@ -0,0 +1,155 @@
+"""
+Sağlayıcı Kota Yönetimi
+=======================
+Her AI sağlayıcısı için dakikalık istek (RPM) ve token (TPM) kovaları ile
+eşzamanlı istek sınırı. Hem senkron (Streamlit oturumları) hem asyncio
+(toplu işler) çağrıları aynı kovaları paylaşır; kota dolunca istekler 429
+almak yerine sırayla bekler.
+
+Limitler ortamdan okunur: GEMINI_RPM, GEMINI_TPM, GEMINI_CONCURRENCY,
+OPENAI_RPM, ... (bkz. DEFAULT_LIMITS).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+# (rpm, tpm, concurrency) - ücretsiz/başlangıç seviyesi kotalar için muhafazakâr değerler
+DEFAULT_LIMITS = {
+    "gemini": (15, 1_000_000, 4),
+    "openai": (500, 30_000, 8),
+    "anthropic": (50, 40_000, 4),
+}
+
+# İstek öncesi token tahmini için beklenen çıktı uzunluğu (gerçek kullanım sonra düzeltilir)
+EXPECTED_OUTPUT_TOKENS = 1500
+
+
+def estimate_tokens(text):
+    """Kaba token tahmini (~4 karakter / token)"""
+    return len(text or "") // 4 + 1
+
+
+class TokenBucket:
+    """Dakikalık oranla dolan, rezervasyon tabanlı token kovası
+
+    reserve() miktarı hemen düşer (kova eksiye inebilir) ve borcun ödenmesi için
+    beklenmesi gereken süreyi döndürür. Böylece bekleyenler geliş sırasına göre
+    sıraya girer.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """amount kadar token ayır; kullanılabilir olana kadar beklenecek süreyi (sn) döndür"""
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, delta):
+        """Tahmin ile gerçek kullanım farkını kovaya yansıt (eksi: iade)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class ProviderLimiter:
+    """Bir sağlayıcı için RPM + TPM kovaları ve eşzamanlılık sınırı"""
+
+    def __init__(self, rpm, tpm, concurrency):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._stats_lock = threading.Lock()
+        self.waited_seconds = 0.0
+        self.queued = 0
+
+    def _reserve(self, estimated_tokens):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait:
+            with self._stats_lock:
+                self.waited_seconds += wait
+                self.queued += 1
+        return wait
+
+    @contextmanager
+    def limit(self, estimated_tokens):
+        """Senkron çağrılar için: slot al, kota açılana kadar bekle"""
+        self._slots.acquire()
+        try:
+            wait = self._reserve(estimated_tokens)
+            if wait:
+                time.sleep(wait)
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def limit_async(self, estimated_tokens):
+        """asyncio çağrıları için: event loop'u bloklamadan slot ve kota bekle"""
+        # Slotlar thread'lerle paylaşıldığı için bekleme bir worker thread'inde yapılır
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # İptal edilse de thread slotu alacak; alınınca geri bırak
+            acquire.add_done_callback(lambda _: self._slots.release())
+            raise
+        try:
+            wait = self._reserve(estimated_tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            yield
+        finally:
+            self._slots.release()
+
+    def try_acquire_extra(self):
+        """Bekleme gerektirmeyen ek bir istek hakkı varsa al (hedging için)"""
+        if self.requests.reserve(1):
+            self.requests.adjust(-1)
+            return False
+        return True
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """İstek bittikten sonra gerçek token kullanımını kovaya işle"""
+        if actual_tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """Sağlayıcı başına süreç genelinde tek limiter"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            rpm, tpm, concurrency = DEFAULT_LIMITS.get(provider, (60, 100_000, 4))
+            prefix = provider.upper()
+            _limiters[provider] = ProviderLimiter(
+                _env_int(f"{prefix}_RPM", rpm),
+                _env_int(f"{prefix}_TPM", tpm),
+                _env_int(f"{prefix}_CONCURRENCY", concurrency),
+            )
+        return _limiters[provider]
@@ -0,0 +1,474 @@
+"""
+Zaman Aşımı, Yeniden Deneme ve Hedging
+======================================
+AI çağrılarını sağlayıcı başına zaman aşımı ile sınırlar, geçici hataları
+(429 / 5xx / zaman aşımı / bağlantı) jitter'lı üstel geri çekilme ile yeniden
+dener. Hedging açıksa, ilk istek p95 gecikmesine kadar cevap vermezse ikinci
+bir istek gönderilir ve hangisi önce biterse o alınır. Aynı mantığın asyncio
+karşılığı (acall_with_retries) async_ai tarafından kullanılır.
+
+Her sağlayıcının önünde bir devre kesici (circuit breaker) durur: son denemelerde
+hata ya da yavaş cevap oranı eşiği aşınca devre açılır ve istekler beklemeden
+reddedilir (core.generate_with_ai bu durumda yedek sağlayıcıya geçer). Bekleme
+süresi dolunca tek bir deneme isteğine izin verilir; başarılıysa devre kapanır.
+Sadece sağlayıcının sağlığını gösteren hatalar (ağ, zaman aşımı, 5xx, 429)
+başarısızlık sayılır; kalıcı 4xx ve içerik hataları devreyi açmaz.
+
+Ayarlar ortamdan okunur: GEMINI_TIMEOUT, GEMINI_MAX_RETRIES, GEMINI_HEDGE, ...
+ve BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_ERROR_RATE, BREAKER_SLOW_SECONDS,
+BREAKER_COOLDOWN.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# (timeout sn, max yeniden deneme, hedging)
+DEFAULT_POLICIES = {
+    "gemini": (60.0, 2, False),
+    "openai": (90.0, 2, False),
+    "anthropic": (90.0, 2, False),
+}
+# (pencere, en az deneme, hata/yavaşlık oranı, yavaş sayılma sn, açık kalma sn)
+DEFAULT_BREAKER = (10, 3, 0.5, 45.0, 60.0)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 20.0
+# p95 güvenilir olsun diye hedging için gereken en az ölçüm
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+# SDK'ların (openai, anthropic, google-api-core, httpx) geçici hata sınıf adları
+RETRYABLE_NAME_HINTS = (
+    "Timeout", "Connection", "RateLimit", "ResourceExhausted", "ServiceUnavailable",
+    "InternalServerError", "DeadlineExceeded", "Overloaded", "TooManyRequests",
+)
+
+
+class AttemptTimeout(TimeoutError):
+    """Tek denemenin sağlayıcı zaman aşımını aşması"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Devre açık: sağlayıcıya şu an istek gönderilmiyor"""
+
+
+def is_retryable(exc):
+    """Hata geçici mi (tekrar denemeye değer mi)?"""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    for attr in ("status_code", "code", "status"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int):
+            return status in RETRYABLE_STATUS
+    name = type(exc).__name__
+    return any(hint in name for hint in RETRYABLE_NAME_HINTS)
+
+
+def is_breaker_failure(exc):
+    """Hata sağlayıcının sağlığı hakkında mı? (ağ, zaman aşımı, 5xx, 429)
+
+    Kalıcı 4xx ve içerik hataları isteğe özgüdür; devre kesiciye işlenmez.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    for attr in ("status_code", "code", "status"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int):
+            return status in (408, 429) or status >= 500
+    name = type(exc).__name__
+    return any(hint in name for hint in RETRYABLE_NAME_HINTS)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Full jitter'lı üstel geri çekilme süresi (attempt 0'dan başlar)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class ProviderPolicy:
+    def __init__(self, timeout, max_retries, hedge):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedge = hedge
+
+
+def _env(name, default, cast):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
+
+
+def get_policy(provider):
+    """Sağlayıcının zaman aşımı / yeniden deneme / hedging ayarları"""
+    timeout, retries, hedge = DEFAULT_POLICIES.get(provider, (60.0, 2, False))
+    prefix = provider.upper()
+    return ProviderPolicy(
+        _env(f"{prefix}_TIMEOUT", timeout, float),
+        _env(f"{prefix}_MAX_RETRIES", retries, int),
+        _env(f"{prefix}_HEDGE", hedge, lambda v: v.lower() in ("1", "true", "yes")),
+    )
+
+
+class CallStats:
+    """Sağlayıcı başına deneme gecikmeleri ve sayaçlar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counters = {}
+
+    def _counter(self, provider):
+        return self._counters.setdefault(provider, {
+            "calls": 0, "attempts": 0, "retries": 0, "failures": 0,
+            "timeouts": 0, "hedges": 0, "hedge_wins": 0, "fallbacks": 0,
+        })
+
+    def incr(self, provider, name, amount=1):
+        with self._lock:
+            self._counter(provider)[name] += amount
+
+    def record_latency(self, provider, seconds):
+        with self._lock:
+            self._latencies.setdefault(provider, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def percentile(self, provider, pct):
+        """Son ölçümlerden yüzdelik gecikme (yeterli ölçüm yoksa None)"""
+        with self._lock:
+            samples = sorted(self._latencies.get(provider, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def sample_count(self, provider):
+        with self._lock:
+            return len(self._latencies.get(provider, ()))
+
+    def report(self):
+        with self._lock:
+            providers = set(self._counters) | set(self._latencies)
+            counters = {p: dict(self._counter(p)) for p in providers}
+        for provider, counter in counters.items():
+            counter["p50"] = self.percentile(provider, 50)
+            counter["p95"] = self.percentile(provider, 95)
+        return counters
+
+
+call_stats = CallStats()
+
+
+class CircuitBreaker:
+    """Sağlayıcı başına devre kesici: kapalı → açık → yarı açık → kapalı"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, window, min_calls, error_rate, slow_seconds, cooldown):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # (başarılı, yavaş)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.trips = 0
+
+    def _current_state(self):
+        # Açık kalma süresi dolduysa yarı açığa geç (kilit altında çağrılır)
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _trip(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.trips += 1
+
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def available(self):
+        """İstek kabul edilir mi? (deneme hakkını tüketmeden bakar)"""
+        with self._lock:
+            state = self._current_state()
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probe_in_flight)
+
+    def allow(self):
+        """İstek gönderilebilir mi? Yarı açıkta tek bir deneme isteğine izin verir"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def cancel(self):
+        """İzin alınmış ama sonucu ölçülemeden iptal edilen isteği bırak"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_error(self, exc, latency=None):
+        """Hatalı denemeyi işle: sadece sağlık hataları başarısızlık sayılır
+
+        Diğerleri ne hata ne başarı olarak işlenir; yarı açıktaki deneme hakkı bırakılır.
+        """
+        if is_breaker_failure(exc):
+            self.record(False, latency)
+        else:
+            self.cancel()
+
+    def record(self, ok, latency=None):
+        """Denemenin sonucunu işle; eşik aşıldıysa devreyi aç"""
+        slow = latency is not None and latency >= self.slow_seconds
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if ok and not slow:
+                    self._state = self.CLOSED
+                else:
+                    self._trip()
+                return
+            if state == self.OPEN:
+                # Devre açılmadan önce başlamış isteğin geç gelen sonucu
+                return
+            self._outcomes.append((ok, slow))
+            count = len(self._outcomes)
+            if count < self.min_calls:
+                return
+            failures = sum(1 for success, _ in self._outcomes if not success)
+            slows = sum(1 for _, was_slow in self._outcomes if was_slow)
+            if failures / count >= self.error_rate or slows / count >= self.error_rate:
+                self._trip()
+
+    def snapshot(self):
+        """Arayüz için anlık durum"""
+        with self._lock:
+            state = self._current_state()
+            count = len(self._outcomes)
+            failures = sum(1 for success, _ in self._outcomes if not success)
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+            return {
+                "state": state,
+                "calls": count,
+                "error_rate": failures / count if count else 0.0,
+                "retry_in": retry_in,
+                "trips": self.trips,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider):
+    """Sağlayıcı başına süreç genelinde tek devre kesici"""
+    with _breakers_lock:
+        if provider not in _breakers:
+            window, min_calls, error_rate, slow_seconds, cooldown = DEFAULT_BREAKER
+            _breakers[provider] = CircuitBreaker(
+                _env("BREAKER_WINDOW", window, int),
+                _env("BREAKER_MIN_CALLS", min_calls, int),
+                _env("BREAKER_ERROR_RATE", error_rate, float),
+                _env("BREAKER_SLOW_SECONDS", slow_seconds, float),
+                _env("BREAKER_COOLDOWN", cooldown, float),
+            )
+        return _breakers[provider]
+
+# Deneme thread'leri süreç genelinde paylaşılır (zaman aşımı ve hedging için)
+_attempt_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ai-attempt")
+
+
+def _timed(provider, fn):
+    started = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        call_stats.record_latency(provider, time.perf_counter() - started)
+
+
+def _run_attempt(provider, fn, policy, can_hedge):
+    """Tek deneme: sonucu devre kesiciye işle"""
+    breaker = get_breaker(provider)
+    started = time.perf_counter()
+    try:
+        result = _race_attempt(provider, fn, policy, can_hedge)
+    except Exception as e:
+        breaker.record_error(e, time.perf_counter() - started)
+        raise
+    breaker.record(True, time.perf_counter() - started)
+    return result
+
+
+def _race_attempt(provider, fn, policy, can_hedge):
+    """Zaman aşımıyla bekle, gerekirse p95'te hedge isteği gönder"""
+    call_stats.incr(provider, "attempts")
+    primary = _attempt_pool.submit(_timed, provider, fn)
+    pending = {primary}
+    deadline = time.monotonic() + policy.timeout
+
+    hedge_after = None
+    if policy.hedge and call_stats.sample_count(provider) >= HEDGE_MIN_SAMPLES:
+        hedge_after = call_stats.percentile(provider, 95)
+
+    last_error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        hedge_pending = hedge_after is not None and len(pending) == 1 and primary in pending
+        done, pending = wait(pending, timeout=min(remaining, hedge_after) if hedge_pending else remaining,
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if future is not primary:
+                call_stats.incr(provider, "hedge_wins")
+            return result
+        if not done and hedge_pending:
+            hedge_after = None
+            if can_hedge is None or can_hedge():
+                call_stats.incr(provider, "hedges")
+                pending.add(_attempt_pool.submit(_timed, provider, fn))
+    if last_error is not None and not pending:
+        raise last_error
+    call_stats.incr(provider, "timeouts")
+    raise AttemptTimeout(f"{provider} {policy.timeout:.0f} sn içinde cevap vermedi")
+
+
+def call_with_retries(provider, fn, can_hedge=None):
+    """fn()'i sağlayıcı politikasına göre zaman aşımı, retry ve hedging ile çalıştır
+
+    Geçici olmayan hatalar hemen, geçici hatalar denemeler bitince fırlatılır.
+    Devre açıksa (veya denemeler arasında açılırsa) CircuitOpenError fırlatılır.
+    """
+    policy = get_policy(provider)
+    breaker = get_breaker(provider)
+    call_stats.incr(provider, "calls")
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            call_stats.incr(provider, "failures")
+            raise CircuitOpenError(f"{provider} devresi açık, istek gönderilmedi")
+        try:
+            return _run_attempt(provider, fn, policy, can_hedge)
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                call_stats.incr(provider, "failures")
+                raise
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+            call_stats.incr(provider, "retries")
+
+
+# ============================================
+# ASYNCIO
+# ============================================
+
+async def _arun_attempt(provider, fn, policy, can_hedge):
+    """_run_attempt'in asyncio karşılığı"""
+    breaker = get_breaker(provider)
+    started = time.perf_counter()
+    try:
+        result = await _arace_attempt(provider, fn, policy, can_hedge)
+    except asyncio.CancelledError:
+        breaker.cancel()
+        raise
+    except Exception as e:
+        breaker.record_error(e, time.perf_counter() - started)
+        raise
+    breaker.record(True, time.perf_counter() - started)
+    return result
+
+
+async def _arace_attempt(provider, fn, policy, can_hedge):
+    """_race_attempt'in asyncio karşılığı; kaybeden ve zaman aşan istekler iptal edilir"""
+    call_stats.incr(provider, "attempts")
+
+    async def timed():
+        started = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            call_stats.record_latency(provider, time.perf_counter() - started)
+
+    primary = asyncio.ensure_future(timed())
+    pending = {primary}
+    deadline = time.monotonic() + policy.timeout
+
+    hedge_after = None
+    if policy.hedge and call_stats.sample_count(provider) >= HEDGE_MIN_SAMPLES:
+        hedge_after = call_stats.percentile(provider, 95)
+
+    last_error = None
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            hedge_pending = hedge_after is not None and len(pending) == 1 and primary in pending
+            done, pending = await asyncio.wait(
+                pending, timeout=min(remaining, hedge_after) if hedge_pending else remaining,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if future is not primary:
+                    call_stats.incr(provider, "hedge_wins")
+                return result
+            if not done and hedge_pending:
+                hedge_after = None
+                if can_hedge is None or can_hedge():
+                    call_stats.incr(provider, "hedges")
+                    pending.add(asyncio.ensure_future(timed()))
+    finally:
+        for future in pending:
+            future.cancel()
+    if last_error is not None and not pending:
+        raise last_error
+    call_stats.incr(provider, "timeouts")
+    raise AttemptTimeout(f"{provider} {policy.timeout:.0f} sn içinde cevap vermedi")
+
+
+async def acall_with_retries(provider, fn, can_hedge=None):
+    """call_with_retries'in asyncio karşılığı: fn() her denemede yeni bir coroutine döndürür"""
+    policy = get_policy(provider)
+    breaker = get_breaker(provider)
+    call_stats.incr(provider, "calls")
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            call_stats.incr(provider, "failures")
+            raise CircuitOpenError(f"{provider} devresi açık, istek gönderilmedi")
+        try:
+            return await _arun_attempt(provider, fn, policy, can_hedge)
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                call_stats.incr(provider, "failures")
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+            call_stats.incr(provider, "retries")
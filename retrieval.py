@@ -0,0 +1,135 @@
+"""
+Konu Bazlı Örnek Getirme
+========================
+Beğenilen/beğenilmeyen thread'ler üzerinde BM25 ters indeksi. Prompt'a son 3
+beğeni yerine seçilen konuyla en ilgili örnekler eklenir.
+"""
+
+import heapq
+import math
+import threading
+from collections import Counter
+
+from turkish_text import tokenize
+
+# Başlık, tweet'lere göre daha belirleyici; token'ları bu kadar tekrar sayılır
+TITLE_WEIGHT = 2
+
+
+def thread_text(entry):
+    """Kayıttaki thread'den (dict veya tweet listesi) başlık ve tweet metinlerini çıkar"""
+    thread = entry.get("thread") if isinstance(entry, dict) else None
+    if isinstance(thread, dict):
+        return thread.get("title", ""), thread.get("tweets", [])
+    if isinstance(thread, list):
+        return "", thread
+    return "", []
+
+
+class BM25Index:
+    """Artımlı güncellenebilen BM25 ters indeksi"""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {doc_id: tf}
+        self.doc_lengths = []
+        self.docs = []
+        self.total_length = 0
+        self._norms = None  # doküman uzunluk normalizasyonu, ekleme olunca yeniden hesaplanır
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc, text_tokens):
+        """Dokümanı indekse ekle (O(token sayısı))"""
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+        self.doc_lengths.append(len(text_tokens))
+        self.total_length += len(text_tokens)
+        self._norms = None
+        for term, tf in Counter(text_tokens).items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+    def search(self, query_tokens, k):
+        """En yüksek BM25 skorlu k dokümanı (skor, doküman) olarak döndür
+
+        Sadece sorgu terimlerinin posting listeleri gezilir.
+        """
+        n_docs = len(self.docs)
+        if not n_docs or k <= 0:
+            return []
+        if self._norms is None:
+            avgdl = self.total_length / n_docs or 1.0
+            self._norms = [self.k1 * (1 - self.b + self.b * length / avgdl) for length in self.doc_lengths]
+        norms = self._norms
+        k1_plus = self.k1 + 1
+        scores = {}
+        for term in set(query_tokens):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * k1_plus / (tf + norms[doc_id])
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(score, self.docs[doc_id]) for doc_id, score in best]
+
+
+def entry_tokens(entry):
+    title, tweets = thread_text(entry)
+    tokens = tokenize(title) * TITLE_WEIGHT
+    for tweet in tweets:
+        tokens.extend(tokenize(tweet))
+    return tokens
+
+
+class FeedbackIndex:
+    """Öğrenilmiş örnek deposunu izleyen, beğeni/beğenmeme için iki BM25 indeksi
+
+    Her sorguda depo ile senkronize olur: sadece yeni eklenen kayıtlar indekslenir,
+    veri sıfırlanmışsa indeks yeniden kurulur.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._indexes = {}
+        self._last_entries = {}
+
+    def _sync(self):
+        data = self.store.load()
+        for kind, key in (("liked", "liked_threads"), ("disliked", "disliked_threads")):
+            entries = data[key]
+            index = self._indexes.get(kind)
+            indexed = len(index) if index else 0
+            # Sıfırlama/yeniden yazma tespiti: son indekslenen kayıt yerinde değilse baştan kur
+            if index is None or indexed > len(entries) or (
+                    indexed and entries[indexed - 1] != self._last_entries.get(kind)):
+                index = self._indexes[kind] = BM25Index()
+                indexed = 0
+            for entry in entries[indexed:]:
+                index.add(entry, entry_tokens(entry))
+            if entries:
+                self._last_entries[kind] = entries[-1]
+
+    def search(self, topic, kind="liked", k=3):
+        """Konuyla en ilgili k kaydı döndür (ilgili kayıt yoksa boş liste)"""
+        query = tokenize(topic)
+        if not query:
+            return []
+        with self._lock:
+            self._sync()
+            return [entry for _, entry in self._indexes[kind].search(query, k)]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_feedback_index(store):
+    """Depo başına süreç genelinde tek indeks"""
+    with _indexes_lock:
+        if id(store) not in _indexes:
+            _indexes[id(store)] = FeedbackIndex(store)
+        return _indexes[id(store)]
@@ -0,0 +1,156 @@
+"""
+Uyarlanabilir Sağlayıcı Yönlendirici
+====================================
+"auto" sağlayıcısı seçildiğinde her istek için bir backend seçer. Gerçek
+generate_with_ai çağrılarından sağlayıcı başına EWMA gecikme, EWMA hata oranı ve
+istek başına token kullanımı öğrenilir. Maliyet tavanının (ROUTER_COST_CEILING,
+$ / 1K token) altında kalan sağlayıcılar arasından beklenen gecikmesi en düşük
+olan seçilir; az ölçümü olan sağlayıcılar önce denenir, ara sıra da keşif için
+rastgele biri seçilir ki eski ölçümler tazelensin.
+
+Ağırlıklar her çağrıda güncellenir ve ROUTER_STATE_FILE'a yazılır, böylece
+yeniden başlatmalarda kaybolmaz.
+"""
+
+import atexit
+import json
+import os
+import random
+import threading
+import time
+
+DEFAULT_STATE_FILE = ".router_state.json"
+
+# Girdi/çıktı karışık yaklaşık liste fiyatı ($ / 1K token); {PROVIDER}_PRICE_PER_1K ile değiştirilebilir
+DEFAULT_PRICES = {
+    "gemini": 0.00175,
+    "openai": 0.00625,
+    "anthropic": 0.009,
+}
+EWMA_ALPHA = 0.2
+# Bu kadar ölçümü olmayan sağlayıcı, seçimden önce denenir
+MIN_SAMPLES = 3
+EXPLORE_RATE = 0.05
+SAVE_INTERVAL = 5.0  # saniye
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class AdaptiveRouter:
+    """Gecikme, hata oranı ve maliyete göre sağlayıcı seçen, kalıcı durumlu yönlendirici"""
+
+    def __init__(self, state_file=DEFAULT_STATE_FILE, cost_ceiling=None):
+        self.state_file = state_file
+        self.cost_ceiling = cost_ceiling
+        self._lock = threading.Lock()
+        self._stats = {}  # provider -> {"latency", "error_rate", "tokens", "samples", "cost"}
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def price(self, provider):
+        """Sağlayıcının 1K token fiyatı ($)"""
+        return _env_float(f"{provider.upper()}_PRICE_PER_1K", DEFAULT_PRICES.get(provider, 0.0))
+
+    def _provider_stats(self, provider):
+        return self._stats.setdefault(provider, {
+            "latency": None, "error_rate": 0.0, "tokens": None, "samples": 0, "cost": 0.0,
+        })
+
+    def _expected_latency(self, s):
+        # Başarısız deneme tekrar gerektirir: beklenen süre ≈ gecikme / başarı oranı
+        return s["latency"] / max(0.05, 1.0 - s["error_rate"])
+
+    def choose(self, providers):
+        """Aday sağlayıcılardan bu istek için birini seç"""
+        if not providers:
+            return "gemini"
+        if self.cost_ceiling is not None:
+            affordable = [p for p in providers if self.price(p) <= self.cost_ceiling]
+            # Hiçbiri tavanın altında değilse en ucuzu
+            providers = affordable or [min(providers, key=self.price)]
+        if len(providers) == 1:
+            return providers[0]
+
+        with self._lock:
+            stats = {p: dict(self._provider_stats(p)) for p in providers}
+        unexplored = [p for p in providers if stats[p]["samples"] < MIN_SAMPLES or stats[p]["latency"] is None]
+        if unexplored:
+            return min(unexplored, key=lambda p: stats[p]["samples"])
+        if random.random() < EXPLORE_RATE:
+            return random.choice(providers)
+        return min(providers, key=lambda p: self._expected_latency(stats[p]))
+
+    def observe(self, provider, latency, ok, tokens=0):
+        """Gerçek bir çağrının sonucunu ağırlıklara işle"""
+        with self._lock:
+            s = self._provider_stats(provider)
+            s["samples"] += 1
+            s["error_rate"] += EWMA_ALPHA * ((0.0 if ok else 1.0) - s["error_rate"])
+            # Hatalar çoğu zaman hızlı döner; gecikmeyi sadece başarılı çağrılar belirler
+            if ok:
+                s["latency"] = latency if s["latency"] is None else s["latency"] + EWMA_ALPHA * (latency - s["latency"])
+            if tokens:
+                s["tokens"] = tokens if s["tokens"] is None else s["tokens"] + EWMA_ALPHA * (tokens - s["tokens"])
+                s["cost"] += tokens * self.price(provider) / 1000
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def stats(self):
+        """Arayüz için sağlayıcı bazında güncel ağırlıklar"""
+        with self._lock:
+            report = {}
+            for provider, s in self._stats.items():
+                report[provider] = {
+                    "latency": s["latency"],
+                    "expected_latency": self._expected_latency(s) if s["latency"] is not None else None,
+                    "error_rate": s["error_rate"],
+                    "samples": s["samples"],
+                    "price_per_1k": self.price(provider),
+                    "cost_per_request": (s["tokens"] or 0) * self.price(provider) / 1000,
+                    "total_cost": s["cost"],
+                }
+            return report
+
+    def _load(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for provider, s in data.get("providers", {}).items():
+            self._provider_stats(provider).update(
+                {k: v for k, v in s.items() if k in ("latency", "error_rate", "tokens", "samples", "cost")}
+            )
+
+    def save(self):
+        """Ağırlıkları diske yaz (geçici dosya + atomik yer değiştirme)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"updated": time.time(), "providers": {p: dict(s) for p, s in self._stats.items()}}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = f"{self.state_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError:
+            # Salt okunur ortamda yönlendirme bellekte çalışmaya devam eder
+            pass
+
+
+# Süreç genelinde tek yönlendirici
+provider_router = AdaptiveRouter(
+    state_file=os.getenv("ROUTER_STATE_FILE", DEFAULT_STATE_FILE),
+    cost_ceiling=_env_float("ROUTER_COST_CEILING", None),
+)
+atexit.register(provider_router.save)
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import DuplicateDetector
+
+
+class MemoryStore:
+    def __init__(self):
+        self.data = {"liked_threads": [], "disliked_threads": []}
+
+    def load(self):
+        return self.data
+
+
+def _thread(title, *tweets):
+    return {"title": title, "tweets": list(tweets)}
+
+
+BATCH = [
+    _thread("Kahve", "Sabah kahvesi güne başlamanın en güzel yolu bence", "Filtre mi türk kahvesi mi tartışması bitmez"),
+    _thread("Kahve", "Sabah kahvesi güne başlamanın en güzel yolu bence", "Filtre mi türk kahvesi mi tartışması bitmez"),
+    _thread("Deniz", "Yaz gelince herkes sahile koşuyor ama kışın deniz bambaşka", "Boş sahilde yürümek insanı dinlendiriyor"),
+]
+
+
+def test_annotate_same_batch_twice_is_identical():
+    detector = DuplicateDetector(MemoryStore())
+    first = detector.annotate([dict(t) for t in BATCH])
+    second = detector.annotate([dict(t) for t in BATCH])
+    assert first == second
+    assert [t.get("duplicate_of") for t in first] == [None, "Üretilen: Kahve", None]
+
+
+def test_annotate_drop_keeps_repeated_generation():
+    detector = DuplicateDetector(MemoryStore())
+    detector.annotate([dict(t) for t in BATCH], drop=True)
+    again = detector.annotate([dict(t) for t in BATCH], drop=True)
+    assert [t["title"] for t in again] == ["Kahve", "Deniz"]
+
+
+def test_annotate_does_not_mutate_input():
+    detector = DuplicateDetector(MemoryStore())
+    threads = [dict(t) for t in BATCH]
+    result = detector.annotate(threads)
+    assert all("duplicate_of" not in t for t in threads)
+    assert result[1]["duplicate_of"] == "Üretilen: Kahve"
+
+
+def _entry(thread):
+    return {"thread": dict(thread), "timestamp": "2024-01-01T00:00:00"}
+
+
+def test_exact_copy_of_disliked_thread_is_flagged():
+    store = MemoryStore()
+    store.data["disliked_threads"].append(_entry(BATCH[0]))
+    result = DuplicateDetector(store).annotate([dict(BATCH[0])])
+    assert result[0]["duplicate_of"] == "👎 Kahve"
+    assert result[0]["similarity"] == 1.0
+
+
+def test_exact_copy_of_liked_thread_is_flagged():
+    store = MemoryStore()
+    store.data["liked_threads"].append(_entry(BATCH[2]))
+    detector = DuplicateDetector(store)
+    assert detector.annotate([dict(BATCH[2])])[0]["duplicate_of"] == "👍 Deniz"
+    assert detector.annotate([dict(BATCH[2])], drop=True) == []
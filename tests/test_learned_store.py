@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from learned_store import LearnedExamplesStore
+
+
+def _entry(title):
+    return {"thread": {"title": title, "tweets": [title]}, "timestamp": "2024-01-01T00:00:00"}
+
+
+def _titles(data, key="liked_threads"):
+    return [e["thread"]["title"] for e in data[key]]
+
+
+def test_append_updates_view_and_other_store(tmp_path):
+    path = str(tmp_path / "learned.json")
+    store, other = LearnedExamplesStore(path), LearnedExamplesStore(path)
+    assert other.counts() == {"liked": 0, "disliked": 0}
+    store.append("liked", _entry("A"))
+    store.append("disliked", _entry("B"))
+    assert store.counts() == {"liked": 1, "disliked": 1}
+    # Diğer süreç günlüğün sadece yeni satırlarını okur
+    assert _titles(other.load()) == ["A"]
+    assert _titles(other.load(), "disliked_threads") == ["B"]
+
+
+def test_compaction_round_trip(tmp_path):
+    path = str(tmp_path / "learned.json")
+    store = LearnedExamplesStore(path, compact_threshold=200)
+    for title in "ABCDE":
+        store.append("liked", _entry(title))
+    store.compact()
+    store.append("liked", _entry("F"))
+    assert _titles(LearnedExamplesStore(path).load()) == list("ABCDEF")
+    assert _titles(store.load()) == list("ABCDEF")
+
+
+def test_crash_between_snapshot_and_journal_rotation(tmp_path, monkeypatch):
+    path = str(tmp_path / "learned.json")
+    store = LearnedExamplesStore(path)
+    store.append("liked", _entry("A"))
+    store.append("liked", _entry("B"))
+
+    def crash(generation):
+        raise OSError("çökme")
+
+    # Snapshot yazıldı, günlük yenilenemedi: eski kayıtlar günlükte duruyor
+    monkeypatch.setattr(store, "_rotate_journal", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    assert _titles(LearnedExamplesStore(path).load()) == ["A", "B"]
+
+    # Yeniden açılan depo eklemeye ve sıkıştırmaya devam edebilir
+    monkeypatch.undo()
+    reopened = LearnedExamplesStore(path)
+    reopened.append("liked", _entry("C"))
+    reopened.compact()
+    assert _titles(LearnedExamplesStore(path).load()) == ["A", "B", "C"]
@@ -0,0 +1,27 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import ResponseCache
+
+
+def test_disk_hit_after_memory_eviction(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_entries=1)
+    cache.put("a", "birinci")
+    cache.put("b", "ikinci")
+    assert cache.get("a") == "birinci"
+    assert cache.get("c") is None
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (1, 1)
+
+
+def test_prune_removes_expired_files(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl=60)
+    cache.put("eski", "metin")
+    cache.put("yeni", "metin")
+    old = time.time() - 120
+    os.utime(tmp_path / "eski.json", (old, old))
+    assert cache.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == ["yeni.json"]
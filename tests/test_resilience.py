@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resilience import CircuitBreaker, is_breaker_failure
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize("exc, failure", [
+    (TimeoutError(), True),
+    (ConnectionError(), True),
+    (ApiError(429), True),
+    (ApiError(503), True),
+    (ApiError(400), False),
+    (ApiError(401), False),
+    (ValueError("boş yanıt"), False),
+])
+def test_is_breaker_failure(exc, failure):
+    assert is_breaker_failure(exc) is failure
+
+
+def test_client_errors_do_not_trip_breaker():
+    breaker = CircuitBreaker(window=10, min_calls=3, error_rate=0.5, slow_seconds=45.0, cooldown=60.0)
+    for _ in range(5):
+        breaker.record_error(ApiError(400), 0.1)
+    assert breaker.state() == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["calls"] == 0
+    for _ in range(3):
+        breaker.record_error(ApiError(503), 0.1)
+    assert breaker.state() == CircuitBreaker.OPEN
+
+
+def test_client_error_releases_half_open_probe():
+    breaker = CircuitBreaker(window=10, min_calls=1, error_rate=0.5, slow_seconds=45.0, cooldown=0.0)
+    breaker.record(False)
+    assert breaker.allow()
+    breaker.record_error(ApiError(400))
+    # Deneme hakkı bırakıldı; devre ne açıldı ne kapandı
+    assert breaker.state() == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# core, API istemcilerini import eder
+for module in ("tweepy", "dotenv", "google.generativeai"):
+    pytest.importorskip(module)
+
+from core import ThreadStreamParser, parse_threads
+
+
+CONTENT = (
+    "İşte fikirler:\n"
+    "THREAD 1: Sabah kahvesi\n"
+    "1. Filtre kahve mi türk kahvesi mi?\n"
+    "2. Bence ikisi de güzel 🙂\n"
+    "---\n"
+    "THREAD 2: Deniz\n"
+    "1. Kışın sahil bambaşka\n"
+    f"2. {'uzun ' * 70}\n"
+    "3.\n"
+    "THREAD 3: Başlıksız son\n"
+    "1. Akış burada bitiyor"
+)
+
+
+def _legacy_parse(content):
+    # Akış desteğinden önceki tek seferlik parse (karşılaştırma için)
+    threads = []
+    current = None
+    for line in content.split("\n"):
+        line = line.strip()
+        if line.startswith("THREAD") and ":" in line:
+            if current:
+                threads.append(current)
+            current = {"title": line.split(":", 1)[1].strip(), "tweets": []}
+        elif line and current is not None and line[0].isdigit() and "." in line[:3]:
+            tweet = line.split(".", 1)[1].strip()
+            if tweet:
+                current["tweets"].append(tweet if len(tweet) <= 280 else tweet[:277] + "...")
+    if current:
+        threads.append(current)
+    return threads
+
+
+def _parse_chunked(content, size):
+    parser = ThreadStreamParser()
+    threads = []
+    for start in range(0, len(content), size):
+        threads.extend(parser.feed(content[start:start + size]))
+    threads.extend(parser.close())
+    return threads
+
+
+def test_parse_threads_matches_legacy_parser():
+    threads = parse_threads(CONTENT)
+    assert threads == _legacy_parse(CONTENT)
+    assert [t["title"] for t in threads] == ["Sabah kahvesi", "Deniz", "Başlıksız son"]
+    assert len(threads[1]["tweets"][1]) == 280
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(CONTENT)])
+def test_chunked_feed_matches_whole_parse(size):
+    assert _parse_chunked(CONTENT, size) == parse_threads(CONTENT)
+
+
+def test_thread_is_emitted_at_separator():
+    parser = ThreadStreamParser()
+    head, _, _ = CONTENT.partition("THREAD 2")
+    emitted = list(parser.feed(head))
+    assert [t["title"] for t in emitted] == ["Sabah kahvesi"]
@@ -0,0 +1,84 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tweet_store import TimelineSync, TweetStore
+
+
+class Tweet:
+    def __init__(self, tweet_id):
+        self.id = tweet_id
+        self.text = f"tweet {tweet_id}"
+        self.created_at = datetime.fromtimestamp(1.7e9 + tweet_id, timezone.utc)
+        self.public_metrics = {"like_count": 1}
+
+
+class Response:
+    def __init__(self, data, meta):
+        self.data = data
+        self.meta = meta
+
+
+class FakeClient:
+    """since_id/until_id filtreli, offset token'lı sahte zaman tüneli (yeniden eskiye)"""
+
+    def __init__(self, ids):
+        self.ids = list(ids)
+        self.calls = []
+
+    def get_users_tweets(self, id, max_results, tweet_fields, since_id=None, until_id=None, pagination_token=None):
+        self.calls.append({"since_id": since_id, "until_id": until_id, "pagination_token": pagination_token})
+        pool = [
+            i for i in sorted(self.ids, reverse=True)
+            if (since_id is None or i > int(since_id)) and (until_id is None or i < int(until_id))
+        ]
+        start = int(pagination_token or 0)
+        meta = {"next_token": str(start + max_results)} if start + max_results < len(pool) else {}
+        return Response([Tweet(i) for i in pool[start:start + max_results]], meta)
+
+
+class Access:
+    def request(self, endpoint, fetch):
+        return fetch(), None
+
+
+def _sync(tmp_path, ids):
+    store = TweetStore(str(tmp_path / "tweets.db"))
+    client = FakeClient(ids)
+    return store, client, TimelineSync(store, Access())
+
+
+def test_initial_backfill_resumes_across_page_caps(tmp_path):
+    store, client, sync = _sync(tmp_path, range(1, 251))
+    assert sync.sync(client, 1, max_pages=2) == (200, 2, None)
+    assert not store.state(1)["backfill_done"]
+    # Önce since_id turu (boş), sonra geçmiş kaldığı yerden
+    assert sync.sync(client, 1, max_pages=2) == (50, 2, None)
+    state = store.state(1)
+    assert state["backfill_done"] and (state["newest_id"], state["oldest_id"]) == ("250", "1")
+    assert store.count(1) == 250
+
+
+def test_since_id_gap_resumes_with_until_id(tmp_path):
+    store, client, sync = _sync(tmp_path, range(1, 101))
+    sync.sync(client, 1)
+    client.ids += list(range(101, 451))
+
+    # Sayfa sınırına takılınca newest_id ilerlemez, boşluk imleci saklanır
+    assert sync.sync(client, 1, max_pages=2) == (200, 2, None)
+    state = store.state(1)
+    assert (state["newest_id"], state["gap_newest"], state["gap_until"]) == ("100", "450", "251")
+
+    # Arada yeni tweet gelse de önce boşluk kapanır
+    client.ids.append(500)
+    client.calls.clear()
+    sync.sync(client, 1, max_pages=2)
+    assert client.calls[0] == {"since_id": "100", "until_id": "251", "pagination_token": None}
+    state = store.state(1)
+    assert (state["newest_id"], state["gap_until"]) == ("450", None)
+
+    sync.sync(client, 1, max_pages=2)
+    assert store.state(1)["newest_id"] == "500"
+    assert sorted(int(i) for i in store.tweet_ids(1)) == list(range(1, 451)) + [500]
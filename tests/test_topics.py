@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topics import DEFAULT_CATEGORY, DEFAULT_TOPIC_KEYWORDS, TopicClassifier
+from turkish_text import match_fold
+
+
+def _substring_scan(text, keywords=DEFAULT_TOPIC_KEYWORDS):
+    # Otomattan önceki kategori başına alt dizgi taraması (karşılaştırma için)
+    folded = match_fold(text)
+    for category, words in keywords.items():
+        if any(match_fold(word) in folded for word in words):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def test_matches_substring_scan_on_random_texts():
+    rng = random.Random(20)
+    words = [w for ws in DEFAULT_TOPIC_KEYWORDS.values() for w in ws]
+    filler = ["bugün", "hava", "çok", "güzel", "#gündem", "yarın", "ama", "ve", "a", "k"]
+    classifier = TopicClassifier()
+    texts = []
+    for _ in range(500):
+        parts = rng.sample(filler, 3) + rng.sample(words, rng.randint(0, 2))
+        # Kelimeleri bölüp yapıştırarak kelime içi ve sınır eşleşmeleri de denenir
+        texts.append(rng.choice([" ", ""]).join(rng.sample(parts, len(parts))).upper())
+    assert classifier.categorize_many(texts) == [_substring_scan(t) for t in texts]
+
+
+def test_priority_and_turkish_folding():
+    classifier = TopicClassifier()
+    assert classifier.categorize("Maç sonrası DOLAR yükseldi") == "ekonomi"
+    assert classifier.categorize("SEÇİM sonuçları") == "siyaset"
+    assert classifier.categorize("#AI ile kod yazmak") == "teknoloji"
+    assert classifier.categorize("Bugün hava güzel") == DEFAULT_CATEGORY
+
+
+def test_custom_keywords_suffix_matches():
+    keywords = {"uzun": ["abcd"], "kısa": ["bc"]}
+    classifier = TopicClassifier(keywords)
+    for text in ("xabcdx", "xbcx", "abx", ""):
+        assert classifier.categorize(text) == _substring_scan(text, keywords)
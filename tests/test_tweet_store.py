@@ -0,0 +1,43 @@
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tweet_store import METRIC_COLUMNS, TweetStore, _pack
+
+
+class Tweet:
+    def __init__(self, tweet_id, likes):
+        self.id = tweet_id
+        self.public_metrics = {"like_count": likes, "retweet_count": 1}
+
+
+def _likes(curve):
+    return [metrics["like_count"] for _, metrics in curve]
+
+
+def test_engagement_curve_finds_tweet_in_each_snapshot(tmp_path):
+    store = TweetStore(str(tmp_path / "tweets.db"))
+    store.record_metrics([Tweet(30, 1), Tweet(10, 2), Tweet(20, 3)], taken_at=100.0)
+    store.record_metrics([Tweet(20, 4)], taken_at=200.0)
+    store.record_metrics([Tweet(10, 5), Tweet(30, 6)], taken_at=300.0)
+    assert _likes(store.engagement_curve(10)) == [2, 5]
+    assert _likes(store.engagement_curve("20")) == [3, 4]
+    assert store.engagement_curve(30)[1] == (300.0, dict(zip(METRIC_COLUMNS, [6, 1, 0, 0, 0])))
+    assert store.engagement_curve(40) == []
+
+
+def test_unsorted_legacy_snapshots_are_sorted_on_open(tmp_path):
+    path = str(tmp_path / "tweets.db")
+    TweetStore(path)
+    width = len(METRIC_COLUMNS)
+    # ID'leri yanıt sırasında saklanmış eski görüntü
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute(
+            "INSERT INTO metric_snapshots (taken_at, ids, metrics) VALUES (?, ?, ?)",
+            (50.0, _pack([30, 10, 20]), _pack([7] * width + [8] * width + [9] * width))
+        )
+    store = TweetStore(path)
+    assert [_likes(store.engagement_curve(i)) for i in (10, 20, 30)] == [[8], [9], [7]]
@@ -0,0 +1,127 @@
+"""
+Thread Önizleme HTML'i
+======================
+Bir thread'in tüm tweet'leri tek bir HTML parçası olarak üretilir; arayüz
+her thread için tweet başına ayrı bir st.markdown yerine tek bir eleman
+gönderir. Üretilen HTML thread içeriğinin hash'i ve görünüm moduna göre
+önbelleklenir, rerun'larda tekrar oluşturulmaz.
+"""
+
+import hashlib
+import html
+import json
+import threading
+from collections import OrderedDict
+
+NORMAL, X_PREVIEW = "normal", "x"
+TWEET_LIMIT = 280
+CACHE_SIZE = 256
+
+
+def thread_hash(thread):
+    """Başlık ve tweet'lerden türetilen içerik hash'i"""
+    payload = json.dumps([thread.get("title", ""), thread.get("tweets", [])], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _escape(text):
+    # Boş satır markdown içinde HTML bloğunu böler; satır sonları <br> olur
+    return html.escape(text, quote=False).replace("\n", "<br>")
+
+
+def _normal_html(tweets, handle):
+    total = len(tweets)
+    parts = []
+    for j, tweet in enumerate(tweets, 1):
+        color = "green" if len(tweet) <= TWEET_LIMIT else "red"
+        parts.append(
+            f'<div class="thread-card"><strong>{j}/{total}.</strong> {_escape(tweet)}'
+            f'<br><small style="color:{color}">({len(tweet)}/{TWEET_LIMIT})</small></div>'
+        )
+    return "".join(parts)
+
+
+def preview_identity(handle):
+    """X önizlemesindeki hesap: (görünen ad, baş harfler); ör. bir_adamiste -> Bir Adamiste, BA"""
+    words = handle.replace("_", " ").split()
+    return " ".join(w.capitalize() for w in words), "".join(w[:1] for w in words[:2]).upper()
+
+
+def _preview_html(tweets, handle):
+    author, initials = (html.escape(part) for part in preview_identity(handle))
+    handle = html.escape(handle)
+    total = len(tweets)
+    parts = []
+    for j, tweet in enumerate(tweets, 1):
+        color = "#28a745" if len(tweet) <= TWEET_LIMIT else "#dc3545"
+        parts.append(
+            '<div class="tweet-preview"><div class="tweet-header">'
+            f'<div class="tweet-avatar">{initials}</div><div>'
+            f'<span class="tweet-author">{author}</span><br>'
+            f'<span class="tweet-handle">@{handle} · {j}/{total}</span></div></div>'
+            f'<div class="tweet-content">{_escape(tweet)}</div>'
+            '<div class="tweet-footer">'
+            '<span class="tweet-action">💬 --</span><span class="tweet-action">🔁 --</span>'
+            '<span class="tweet-action">❤️ --</span><span class="tweet-action">📊 --</span>'
+            f'<span style="color: {color}">{len(tweet)}/{TWEET_LIMIT}</span></div></div>'
+        )
+    return "".join(parts)
+
+
+_BUILDERS = {NORMAL: _normal_html, X_PREVIEW: _preview_html}
+
+
+def thread_plain_text(thread):
+    """Kopyalama/indirme için thread'in düz metni"""
+    tweets = thread.get("tweets", [])
+    text = f"🧵 {thread.get('title', '')}\n\n"
+    for j, tweet in enumerate(tweets, 1):
+        text += f"{j}/{len(tweets)} {tweet}\n\n"
+    return text
+
+
+class ThreadRenderer:
+    """Thread HTML'ini (hash, mod) anahtarıyla LRU önbellekte tutan üretici"""
+
+    def __init__(self, handle, max_entries=CACHE_SIZE):
+        self.handle = handle  # X önizlemesinde gösterilen hesap
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key, build):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return value
+
+    def render(self, thread, mode=NORMAL):
+        """Thread'in tüm tweet'leri için tek HTML parçası"""
+        builder = _BUILDERS[mode]
+        return self._cached((thread_hash(thread), mode), lambda: builder(thread.get("tweets", []), self.handle))
+
+    def plain_text(self, thread):
+        return self._cached((thread_hash(thread), "text"), lambda: thread_plain_text(thread))
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_thread_renderer(handle):
+    """Hesap başına süreç genelinde tek üretici"""
+    with _renderers_lock:
+        if handle not in _renderers:
+            _renderers[handle] = ThreadRenderer(handle)
+        return _renderers[handle]
@@ -0,0 +1,130 @@
+"""
+Konu Kategorileme
+=================
+Kategori anahtar kelimeleri içe aktarmada bir kez Aho-Corasick otomatına
+derlenir. Metin tek geçişte taranır; kaç kelime olursa olsun maliyet metin
+uzunluğuyla orantılıdır. Birden fazla kategori eşleşirse öncelik sırası
+(ekonomi > spor > siyaset > teknoloji > mizah) kazanır.
+
+Eşleştirme match_fold ile yapılır: "#İstanbul", "SIYASET" ve "#AI" gibi
+yazımlar str.lower()'ın aksine doğru katlanır.
+
+Anahtar kelimeler TOPIC_KEYWORDS_FILE ile bir JSON dosyasından
+değiştirilebilir: {"kategori": ["kelime", ...]}. Dosyadaki kategoriler
+varsayılanın yerine geçer, yeni kategoriler önceliğe sondan eklenir.
+"""
+
+import json
+import os
+import threading
+
+from turkish_text import match_fold
+
+DEFAULT_CATEGORY = "diger"
+
+# Sıra önceliktir
+DEFAULT_TOPIC_KEYWORDS = {
+    "ekonomi": ["dolar", "euro", "enflasyon", "faiz", "borsa", "ekonomi", "maaş", "zam", "tl", "kur"],
+    "spor": ["galatasaray", "fenerbahçe", "beşiktaş", "trabzonspor", "maç", "gol", "futbol", "basketbol", "şampiyon"],
+    "siyaset": ["seçim", "tbmm", "meclis", "parti", "cumhurbaşkan", "bakan", "hükümet", "muhalefet"],
+    "teknoloji": ["yapay zeka", "ai", "chatgpt", "iphone", "android", "yazılım", "teknoloji", "kod", "google", "apple"],
+    "mizah": ["pazartesi", "cuma", "işyerinde", "aşk", "sevgili", "evlilik", "komik", "espri"],
+}
+
+
+def load_topic_keywords(path=None):
+    """Varsayılan kelimeleri (varsa) JSON dosyasıyla birleştir: {kategori: [kelime, ...]}"""
+    keywords = {category: list(words) for category, words in DEFAULT_TOPIC_KEYWORDS.items()}
+    if not path:
+        return keywords
+    with open(path, "r", encoding="utf-8") as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: kategori -> kelime listesi sözlüğü bekleniyor")
+    for category, words in overrides.items():
+        keywords[category] = [str(w) for w in words]
+    return keywords
+
+
+class TopicClassifier:
+    """Öncelikli kategorilere sahip Aho-Corasick anahtar kelime otomatı"""
+
+    def __init__(self, keywords=None):
+        keywords = DEFAULT_TOPIC_KEYWORDS if keywords is None else keywords
+        self.categories = list(keywords)
+        self._none = len(self.categories)  # "eşleşme yok" önceliği
+        self._build(keywords)
+
+    def _build(self, keywords):
+        # Trie: düğüm başına çocuklar ve o düğümde biten en öncelikli kategori
+        children = [{}]
+        best = [self._none]
+        for priority, words in enumerate(keywords.values()):
+            for word in words:
+                node = 0
+                for ch in match_fold(word):
+                    nxt = children[node].get(ch)
+                    if nxt is None:
+                        nxt = len(children)
+                        children[node][ch] = nxt
+                        children.append({})
+                        best.append(self._none)
+                    node = nxt
+                if node:
+                    best[node] = min(best[node], priority)
+
+        # Başarısızlık bağlantılarını genişlikte ara ile kur ve geçişleri tam DFA'ya aç:
+        # her düğüm kelimelerde geçen her harf için doğrudan hedef düğümü bilir
+        alphabet = {ch for node in children for ch in node}
+        fail = [0] * len(children)
+        delta = [None] * len(children)
+        delta[0] = {ch: children[0].get(ch, 0) for ch in alphabet}
+        queue = list(children[0].values())
+        for node in queue:
+            delta[node] = {}
+            for ch in alphabet:
+                child = children[node].get(ch)
+                if child is None:
+                    delta[node][ch] = delta[fail[node]][ch]
+                else:
+                    delta[node][ch] = child
+                    fail[child] = delta[fail[node]][ch] if node else 0
+                    queue.append(child)
+            # Bu düğümde biten daha kısa kelimeler (sonekler) de eşleşmiş sayılır
+            best[node] = min(best[node], best[fail[node]])
+
+        # Kelimelerde geçmeyen harf otomatı köke döndürür; .get(ch, 0) yeterli
+        self._delta = [{ch: target for ch, target in row.items() if target} for row in delta]
+        self._best = best
+
+    def categorize(self, text):
+        """Metnin kategorisi; eşleşme yoksa "diger" """
+        delta = self._delta
+        best = self._best
+        found = self._none
+        state = 0
+        for ch in match_fold(text):
+            state = delta[state].get(ch, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return self.categories[found] if found < self._none else DEFAULT_CATEGORY
+
+    def categorize_many(self, texts):
+        """Çok sayıda konu/tweet metnini tek çağrıda kategorile (giriş sırasıyla liste)"""
+        categorize = self.categorize
+        return [categorize(text) for text in texts]
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_topic_classifier():
+    """Süreç genelinde tek sınıflandırıcı (TOPIC_KEYWORDS_FILE'dan)"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = TopicClassifier(load_topic_keywords(os.getenv("TOPIC_KEYWORDS_FILE")))
+        return _classifier
@@ -0,0 +1,335 @@
+"""
+Akan Gündem Tespiti
+===================
+Free tier'da X trends endpoint'i olmadığı için gündem yerel bir tweet
+akışından çıkarılır. Akış bir dosya (tail -f gibi izlenir) veya satır bazlı
+bir TCP soketi olabilir; her satır {"text": ..., "created_at": ...} JSON'u ya
+da düz tweet metnidir.
+
+- Her tweet'ten hashtag'ler ve anlamlı kelimeler çıkarılır (tweet başına bir kez).
+- Hacimler Count-Min sketch ile tahmin edilir. Zaman 10 dakikalık kovalara
+  bölünür; 1s/6s/24s pencereleri için toplam sketch'ler tutulur, kova
+  pencereden çıkınca toplamdan çıkarılır. Bellek akış hızından bağımsızdır.
+- Her kovada Space-Saving ile en sık terimler (aday kümesi) izlenir.
+- Son 1 saatin hacmi, önceki saatlerin (en fazla 23, gözlenen süre kadar)
+  saatlik ortalamasıyla karşılaştırılarak yükselen konular bulunur. En az
+  MIN_RISING_HISTORY kadar geçmiş birikmeden hiçbir konu yükselen sayılmaz.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import socket
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from turkish_text import STOPWORDS, match_fold, tokenize
+
+BUCKET_SECONDS = 10 * 60
+# Pencere adı -> kova sayısı
+WINDOWS = {"1h": 6, "6h": 36, "24h": 144}
+RING_SIZE = WINDOWS["24h"]
+
+SKETCH_WIDTH = 4096
+SKETCH_DEPTH = 4
+# Kova başına izlenen aday terim sayısı (Space-Saving kapasitesi)
+HEAVY_HITTERS = 200
+
+MIN_KEYWORD_LENGTH = 4
+# Son saat, önceki saatlerin ortalamasının bu katıysa konu yükseliyor sayılır
+RISING_RATIO = 2.0
+MIN_RISING_VOLUME = 20
+# Yükselen tespiti için gereken en az gözlem süresi (saniye); soğuk başlangıçta
+# karşılaştırılacak geçmiş olmadığından her konu "yükseliyor" görünmesin
+MIN_RISING_HISTORY = 2 * 3600
+TOP_TOPICS = 60
+
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_URL_RE = re.compile(r"https?://\S+|@\w+")
+_FEED_POLL_INTERVAL = 1.0  # saniye
+
+
+def extract_terms(text):
+    """Tweet'teki hashtag ve anlamlı kelimeler: {katlanmış anahtar: görünen ad}"""
+    terms = {}
+    for tag in _HASHTAG_RE.findall(text):
+        terms.setdefault("#" + match_fold(tag), "#" + tag)
+    for token in tokenize(_URL_RE.sub(" ", _HASHTAG_RE.sub(" ", text)), stem=False, fold=False):
+        if len(token) >= MIN_KEYWORD_LENGTH and not token.isdigit() and token not in STOPWORDS:
+            terms.setdefault(match_fold(token), token)
+    return terms
+
+
+class CountMinSketch:
+    """Çıkarılabilir (doğrusal) Count-Min sketch: depth x width sayaç"""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.counts = array("I", bytes(4 * width * depth))
+
+    def indexes(self, key):
+        """Anahtarın her satırdaki sayaç konumu (iki hash ile türetilir)"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, indexes, count=1):
+        counts = self.counts
+        for i in indexes:
+            counts[i] += count
+
+    def estimate(self, indexes):
+        counts = self.counts
+        return min(counts[i] for i in indexes)
+
+    def merge(self, other, sign=1):
+        """other'ı ekle (sign=-1: çıkar)"""
+        counts = self.counts
+        if sign > 0:
+            for i, value in enumerate(other.counts):
+                if value:
+                    counts[i] += value
+        else:
+            for i, value in enumerate(other.counts):
+                if value:
+                    counts[i] -= value
+
+    def clear(self):
+        self.counts = array("I", bytes(4 * self.width * self.depth))
+
+
+class SpaceSaving:
+    """Sabit kapasiteli Space-Saving: en sık terimleri (ve görünen adlarını) izler"""
+
+    def __init__(self, capacity=HEAVY_HITTERS):
+        self.capacity = capacity
+        self.items = {}  # anahtar -> [sayı, hata, görünen ad]
+
+    def add(self, key, label, count=1):
+        entry = self.items.get(key)
+        if entry is not None:
+            entry[0] += count
+            return
+        if len(self.items) < self.capacity:
+            self.items[key] = [count, 0, label]
+            return
+        # En az sayılanı çıkar; yeni terim onun sayısını hata payı olarak devralır
+        victim = min(self.items, key=lambda k: self.items[k][0])
+        floor = self.items.pop(victim)[0]
+        self.items[key] = [floor + count, floor, label]
+
+    def clear(self):
+        self.items = {}
+
+
+class TrendEngine:
+    """Tweet akışından pencere bazlı hacim ve yükselen konu tahmini"""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, capacity=HEAVY_HITTERS):
+        self._lock = threading.Lock()
+        self._buckets = [CountMinSketch(width, depth) for _ in range(RING_SIZE)]
+        self._heavy = [SpaceSaving(capacity) for _ in range(RING_SIZE)]
+        self._windows = {name: CountMinSketch(width, depth) for name in WINDOWS}
+        self._current = None  # en yeni kova numarası (epoch // BUCKET_SECONDS)
+        self._first = None  # gözlenen en eski kova (geçmişin ne kadar dolu olduğu)
+        self.tweets = 0
+        self.last_event = None
+        self._feed = None
+
+    # ---------- besleme ----------
+
+    def ingest(self, text, timestamp=None):
+        """Tek tweet'i işle (timestamp: epoch saniye, yoksa şimdi)"""
+        terms = extract_terms(text)
+        timestamp = time.time() if timestamp is None else timestamp
+        bucket = int(timestamp // BUCKET_SECONDS)
+        indexes_of = self._windows["24h"].indexes
+        keyed = [(key, label, indexes_of(key)) for key, label in terms.items()]
+        with self._lock:
+            self._advance(bucket)
+            age = self._current - bucket
+            if age >= RING_SIZE:
+                return  # 24 saatten eski
+            self._first = bucket if self._first is None else min(self._first, bucket)
+            slot = bucket % RING_SIZE
+            windows = [self._windows[name] for name, size in WINDOWS.items() if age < size]
+            for key, label, indexes in keyed:
+                self._buckets[slot].add(indexes)
+                self._heavy[slot].add(key, label)
+                for window in windows:
+                    window.add(indexes)
+            self.tweets += 1
+            self.last_event = max(self.last_event or 0, timestamp)
+
+    def _advance(self, bucket):
+        """Zamanı bucket'a ilerlet; pencereden çıkan kovaları toplamlardan düş"""
+        if self._current is None:
+            self._current = bucket
+            return
+        if bucket <= self._current:
+            return
+        if bucket - self._current >= RING_SIZE:
+            # Uzun sessizlik: her şey pencere dışında kaldı
+            for sketch in list(self._buckets) + list(self._windows.values()):
+                sketch.clear()
+            for heavy in self._heavy:
+                heavy.clear()
+            self._current = bucket
+            self._first = None
+            return
+        for new in range(self._current + 1, bucket + 1):
+            for name, size in WINDOWS.items():
+                self._windows[name].merge(self._buckets[(new - size) % RING_SIZE], sign=-1)
+            # Halkadaki yer 24 saat önceki kovaya aitti; artık hiçbir pencerede değil
+            self._buckets[new % RING_SIZE].clear()
+            self._heavy[new % RING_SIZE].clear()
+        self._current = bucket
+
+    # ---------- sorgu ----------
+
+    def trending(self, limit=TOP_TOPICS, now=None):
+        """24 saatlik hacme göre konular ve yükselenler (get_trending_topics biçiminde)
+
+        Canlı akışta (follow) pencereler önce şimdiki zamana ilerletilir; akış
+        sustuğunda eski konular pencereden düşer. follow olmadan beslenen bir
+        motorda (ör. geçmiş tarihli kayıt oynatma) pencereler en yeni tweet'in
+        zamanına göredir; now verilirse o ana ilerletilir.
+        """
+        if now is None and self._feed is not None:
+            now = time.time()
+        with self._lock:
+            if now is not None:
+                self._advance(int(now // BUCKET_SECONDS))
+            if self._current is None:
+                return []
+            labels = {}
+            for heavy in self._heavy:
+                for key, entry in heavy.items.items():
+                    labels.setdefault(key, entry[2])
+            # Son saatten önce gözlenen kova sayısı (en fazla 23 saat)
+            observed = 0 if self._first is None else min(self._current - self._first + 1, RING_SIZE)
+            prior_hours = (observed - WINDOWS["1h"]) / WINDOWS["1h"]
+            enough_history = observed * BUCKET_SECONDS >= MIN_RISING_HISTORY
+            indexes_of = self._windows["24h"].indexes
+            topics = []
+            for key, label in labels.items():
+                indexes = indexes_of(key)
+                volumes = {name: window.estimate(indexes) for name, window in self._windows.items()}
+                if not volumes["24h"]:
+                    continue
+                growth = None
+                if enough_history:
+                    # Önceki saatlerin saatlik ortalaması (+1: sıfıra bölme ve gürültü için)
+                    baseline = (volumes["24h"] - volumes["1h"]) / prior_hours
+                    growth = (volumes["1h"] + 1) / (baseline + 1)
+                topics.append({
+                    "name": label,
+                    "tweet_volume": volumes["24h"],
+                    "volume_1h": volumes["1h"],
+                    "volume_6h": volumes["6h"],
+                    "growth": growth,
+                    "rising": growth is not None and growth >= RISING_RATIO and volumes["1h"] >= MIN_RISING_VOLUME,
+                })
+
+        top = heapq.nlargest(limit, topics, key=lambda t: t["tweet_volume"])
+        # Hacmi henüz küçük ama hızla yükselenler de listede yer alsın
+        chosen = {t["name"] for t in top}
+        rising = [t for t in topics if t["rising"] and t["name"] not in chosen]
+        top.extend(heapq.nlargest(max(1, limit // 6), rising, key=lambda t: t["growth"]))
+        return top
+
+    def stats(self):
+        return {"tweets": self.tweets, "last_event": self.last_event, "feed": self._feed}
+
+    # ---------- akış ----------
+
+    def follow(self, source):
+        """Akışı arka planda tüketmeye başla: dosya yolu veya tcp://host:port"""
+        self._feed = source
+        target = self._follow_socket if source.startswith("tcp://") else self._follow_file
+        threading.Thread(target=target, args=(source,), name="trend-feed", daemon=True).start()
+
+    def _ingest_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        text, timestamp = line, None
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                text = record.get("text") or ""
+                timestamp = parse_timestamp(record.get("created_at"))
+        self.ingest(text, timestamp)
+
+    def _follow_file(self, path):
+        position = 0
+        while True:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    f.seek(position)
+                    while True:
+                        line = f.readline()
+                        if not line.endswith("\n"):
+                            # Yarım satır: tamamlanınca tekrar okunur
+                            break
+                        self._ingest_line(line)
+                        position = f.tell()
+                    if os.path.getsize(path) < position:
+                        position = 0  # dosya kesilmiş/döndürülmüş
+            except OSError:
+                pass
+            time.sleep(_FEED_POLL_INTERVAL)
+
+    def _follow_socket(self, url):
+        host, _, port = url[len("tcp://"):].rpartition(":")
+        while True:
+            try:
+                with socket.create_connection((host, int(port))) as conn:
+                    for line in conn.makefile("r", encoding="utf-8"):
+                        self._ingest_line(line)
+            except (OSError, ValueError):
+                pass
+            time.sleep(_FEED_POLL_INTERVAL * 5)
+
+
+def parse_timestamp(value):
+    """created_at (ISO 8601 veya epoch) -> epoch saniye; anlaşılamazsa None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def current_trend_engine():
+    """Başlatılmış motor (get_trend_engine henüz çağrılmadıysa None); akış başlatmaz"""
+    return _engine
+
+
+def get_trend_engine(source):
+    """Akış kaynağı için süreç genelinde tek motor, ilk çağrıda akışı başlatır; kaynak yoksa None"""
+    global _engine
+    if not source:
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = TrendEngine()
+            _engine.follow(source)
+        return _engine
@@ -0,0 +1,112 @@
+"""
+Gündem Deposu
+=============
+Gündem konuları her yenilemede bir kez işlenip değiştirilemez bir anlık
+görüntüye (TrendSnapshot) dönüştürülür: kategori indeksi, kategori başına
+hacme göre sıralı ilk k konu ve seçim kutusu seçenekleri önceden hazırlanır.
+Streamlit rerun'ları ve diğer çağıranlar aynı nesneyi kopyalamadan okur.
+
+Veri kaynağı bir yükleyici fonksiyondur (client -> konu listesi); örnek
+veriden gerçek X gündemine geçmek sadece yükleyiciyi değiştirmeyi gerektirir.
+"""
+
+import heapq
+import threading
+import time
+from types import MappingProxyType
+
+from topics import get_topic_classifier
+
+# Seçim kutusunda elle konu girişi seçeneği
+MANUAL_TOPIC = "-- Manuel gir --"
+# Önceden hesaplanan kategori başına konu sayısı
+TOP_K = 5
+# Anlık görüntü bu kadar eskiyince bir sonraki okumada yenilenir (saniye)
+DEFAULT_MAX_AGE = 15 * 60
+# Canlı akıştan beslenirken
+LIVE_MAX_AGE = 60
+
+_FORCE = object()
+
+
+class TrendSnapshot:
+    """Bir yenilemenin değiştirilemez gündem görünümü"""
+
+    def __init__(self, trends, version, top_k=TOP_K):
+        missing = [t for t in trends if not t.get("category")]
+        detected = iter(get_topic_classifier().categorize_many([t["name"] for t in missing]))
+        topics = []
+        by_category = {}
+        for trend in trends:
+            topic = dict(trend)
+            if not topic.get("category"):
+                topic["category"] = next(detected)
+            # Gerçek X verisinde hacim None gelebilir
+            topic["tweet_volume"] = topic.get("tweet_volume") or 0
+            topic = MappingProxyType(topic)
+            topics.append(topic)
+            by_category.setdefault(topic["category"], []).append(topic)
+
+        self.version = version
+        self.created = time.time()
+        self.topics = tuple(topics)
+        self.names = tuple(t["name"] for t in topics)
+        self.options = (MANUAL_TOPIC,) + self.names
+        self.by_category = MappingProxyType({c: tuple(items) for c, items in by_category.items()})
+        self.top_k = top_k
+        self._top = {
+            category: tuple(self._largest(items, top_k))
+            for category, items in self.by_category.items()
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _largest(items, k):
+        # Eşit hacimlerde kaynak sırası korunur
+        return heapq.nlargest(k, items, key=lambda t: t["tweet_volume"])
+
+    def category(self, name):
+        """Kategorideki konular (kaynak sırasıyla)"""
+        return self.by_category.get(name, ())
+
+    def top(self, category, k=None):
+        """Kategorinin hacme göre en büyük k konusu"""
+        k = self.top_k if k is None else k
+        if k == self.top_k:
+            return self._top.get(category, ())
+        with self._lock:
+            key = (category, k)
+            if key not in self._top:
+                self._top[key] = tuple(self._largest(self.category(category), k))
+            return self._top[key]
+
+
+class TrendRepository:
+    """Gündem anlık görüntüsünü tutar; yenilemede yenisini hazırlayıp atomik olarak değiştirir"""
+
+    def __init__(self, loader, max_age=DEFAULT_MAX_AGE):
+        self.loader = loader
+        self.max_age = max_age
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, client=None):
+        """Güncel anlık görüntü (yoksa veya eskidiyse yükleyerek)"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.time() - snapshot.created < self.max_age:
+            return snapshot
+        return self.refresh(client, stale=snapshot)
+
+    def refresh(self, client=None, stale=_FORCE):
+        """Yükleyiciyi çağırıp yeni anlık görüntü hazırla
+
+        stale verilirse ve başka bir thread bu arada yenilemişse tekrar yüklenmez.
+        """
+        with self._lock:
+            if stale is not _FORCE and self._snapshot is not stale:
+                return self._snapshot
+            trends = self.loader(client)
+            self._version += 1
+            self._snapshot = TrendSnapshot(trends, self._version)
+            return self._snapshot
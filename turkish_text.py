@@ -0,0 +1,65 @@
+"""
+Türkçe Metin Yardımcıları
+=========================
+Türkçe'ye uygun küçük harfe çevirme, hashtag bölme ve basit kök bulma.
+"""
+
+import re
+
+# str.lower() "I" -> "i" ve "İ" -> "i̇" (noktalı birleşik karakter) yapar; Türkçe'de yanlış
+_TR_UPPER_MAP = str.maketrans({"I": "ı", "İ": "i"})
+
+# CamelCase hashtag'leri böl: "#AsgariÜcret" -> "Asgari Ücret"
+_CAMEL_RE = re.compile(r"(?<=[a-zçğıöşü])(?=[A-ZÇĞİÖŞÜ])")
+_WORD_RE = re.compile(r"[0-9a-zçğıöşüâîû]+")
+
+# Sık geçen, anlam taşımayan kelimeler
+STOPWORDS = frozenset("""
+acaba ama ancak artık aslında az bana bazı belki ben beni benim bir biraz birkaç
+biz bize bu buna bunu bunun çok çünkü da daha de defa diye en gibi hem hep hepsi
+her hiç için ile ise işte kadar ki kim mı mi mu mü nasıl ne neden nerede niye o
+olan olarak oldu olduğu olsun on ona onu onun öyle sen siz şey şu tüm ve veya ya
+yani yok zaten the and for
+""".split())
+
+# Eşleştirme için I ailesini tek harfe indir: "#AI", "SIYASET", "#İstanbul" hepsi "i" ile eşleşir
+_MATCH_CASE_MAP = str.maketrans({"I": "i", "İ": "i", "ı": "i"})
+
+# Eşleştirme için aksan katlama: ASCII yazılmış metinler de eşleşsin ("Isik" ~ "Işık")
+_ASCII_FOLD_MAP = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+# Kök yerine ilk N harf (Türkçe için bilinen basit ve etkili yaklaşım)
+STEM_LENGTH = 5
+
+
+_FOLDED_STOPWORDS = frozenset(w.translate(_ASCII_FOLD_MAP) for w in STOPWORDS)
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harfe çevir (I -> ı, İ -> i)"""
+    return text.translate(_TR_UPPER_MAP).lower()
+
+
+def match_fold(text):
+    """Anahtar kelime eşleştirmesi için katla: Türkçe küçük harf, noktalı/noktasız i ayrımı yok"""
+    return text.translate(_MATCH_CASE_MAP).lower()
+
+
+def fold_diacritics(text):
+    """Türkçe harfleri ASCII karşılıklarına indir (küçük harfli metin beklenir)"""
+    return text.translate(_ASCII_FOLD_MAP)
+
+
+def tokenize(text, stem=True, fold=True):
+    """Metni küçük harfli, stopword'süz ve (opsiyonel) kısaltılmış token'lara ayır"""
+    text = turkish_lower(_CAMEL_RE.sub(" ", text))
+    stopwords = STOPWORDS
+    if fold:
+        text = fold_diacritics(text)
+        stopwords = _FOLDED_STOPWORDS
+    tokens = []
+    for token in _WORD_RE.findall(text):
+        if len(token) < 2 or token in stopwords:
+            continue
+        tokens.append(token[:STEM_LENGTH] if stem else token)
+    return tokens
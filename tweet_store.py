@@ -0,0 +1,518 @@
+"""
+Yerel Tweet Deposu ve Zaman Tüneli Senkronu
+===========================================
+Kullanıcının tweet'leri SQLite'ta (varsayılan: tweets.db) saklanır: metin,
+created_at ve public_metrics. İlk senkronda X API'nin izin verdiği kadar geçmiş
+(en fazla ~3200 tweet) sayfa sayfa çekilir; sonraki senkronlarda since_id ile
+sadece yeni tweet'ler istenir. Böylece Persona ve Profil sekmeleri her
+yenilemede genellikle tek bir API çağrısı yapar.
+
+Geçmiş çekimi limit yüzünden yarıda kalırsa, bir sonraki senkron until_id ile
+kaldığı yerden devam eder. Yeni tweet'ler sayfa sınırına sığmazsa da aynı
+şekilde bir boşluk imleci (gap_until) saklanır; newest_id ancak boşluk
+kapandığında ilerletilir.
+
+Etkileşim günlerce değişmeye devam ettiği için MetricsRefresher depodaki tüm
+tweet'lerin metriklerini 100'lük get_tweets(ids=...) çağrılarıyla (N/100 istek)
+yeniden çeker ve her yenilemeyi zaman damgalı bir anlık görüntü olarak saklar.
+Anlık görüntüler sütun bazlı sıkıştırılmış dizilerdir (array('Q') blob'ları):
+bir satır = bir yenileme, tüm tweet ID'leri ve metrikleri. ID'ler sıralı
+saklanır; bir tweet'in eğrisi her görüntüde blob'u açmadan ikili aramayla bulunur.
+"""
+
+import os
+import sqlite3
+from array import array
+from bisect import bisect_left
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+TWEET_FIELDS = ["public_metrics", "created_at", "text"]
+METRIC_COLUMNS = ("like_count", "retweet_count", "reply_count", "quote_count", "impression_count")
+PAGE_SIZE = 100
+# GET /2/tweets?ids=... tek istekte en fazla 100 ID alır
+LOOKUP_BATCH = 100
+# users/:id/tweets en fazla son 3200 tweet'i döndürür
+MAX_PAGES = 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at TEXT,
+    like_count INTEGER DEFAULT 0,
+    retweet_count INTEGER DEFAULT 0,
+    reply_count INTEGER DEFAULT 0,
+    quote_count INTEGER DEFAULT 0,
+    impression_count INTEGER DEFAULT 0,
+    fetched_at REAL,
+    change_seq INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tweets_user_created ON tweets (user_id, created_at DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT PRIMARY KEY,
+    username TEXT,
+    newest_id TEXT,
+    oldest_id TEXT,
+    backfill_done INTEGER DEFAULT 0,
+    last_sync REAL,
+    gap_newest TEXT,
+    gap_until TEXT
+);
+"""
+# Aynı anda alınan iki anlık görüntü (ör. karşılaştırmadaki paralel hesaplar)
+# birbirinin üzerine yazılmasın diye anahtar taken_at değil, artan id
+SNAPSHOTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    taken_at REAL NOT NULL,
+    ids BLOB NOT NULL,
+    metrics BLOB NOT NULL,
+    ids_sorted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS metric_snapshots_taken ON metric_snapshots (taken_at);
+"""
+# Sütunları göçle eklenenlerin indeksleri (göçten sonra kurulur)
+INDEXES = """
+DROP INDEX IF EXISTS tweets_user_fetched;
+CREATE INDEX IF NOT EXISTS tweets_change ON tweets (change_seq);
+CREATE INDEX IF NOT EXISTS tweets_user_change ON tweets (user_id, change_seq);
+"""
+# Eski veritabanlarına eklenen sütunlar: tablo -> [(sütun, tanım)]
+MIGRATIONS = {
+    "tweets": [("change_seq", "INTEGER DEFAULT 0")],
+    "sync_state": [("gap_newest", "TEXT"), ("gap_until", "TEXT")],
+}
+STATE_FIELDS = ("newest_id", "oldest_id", "backfill_done", "last_sync", "gap_newest", "gap_until")
+
+
+class StoredTweet:
+    """Depodan okunan tweet (tweepy.Tweet ile aynı alan adları)"""
+
+    __slots__ = ("id", "text", "created_at", "public_metrics")
+
+    def __init__(self, id, text, created_at, public_metrics):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.public_metrics = public_metrics
+
+
+def _tweet_id_key(tweet_id):
+    # Snowflake ID'leri sayısal karşılaştırılmalı (metin olarak "9" > "10")
+    return int(tweet_id)
+
+
+class TweetStore:
+    """SQLite tabanlı, thread-safe tweet deposu"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            conn.executescript(SNAPSHOTS_SCHEMA)
+            self._sort_snapshots(conn)
+            conn.executescript(INDEXES)
+
+    @staticmethod
+    def _migrate(conn):
+        # CREATE TABLE IF NOT EXISTS mevcut tabloya sütun eklemez
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+        conn.commit()
+        # Eski metric_snapshots (taken_at PRIMARY KEY) id anahtarlı tabloya taşınır
+        snapshot_columns = {row[1] for row in conn.execute("PRAGMA table_info(metric_snapshots)")}
+        if snapshot_columns and "id" not in snapshot_columns:
+            conn.execute("BEGIN")
+            conn.execute("ALTER TABLE metric_snapshots RENAME TO metric_snapshots_old")
+            for statement in SNAPSHOTS_SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(
+                """INSERT INTO metric_snapshots (taken_at, ids, metrics)
+                   SELECT taken_at, ids, metrics FROM metric_snapshots_old ORDER BY taken_at"""
+            )
+            conn.execute("DROP TABLE metric_snapshots_old")
+            conn.commit()
+
+    @staticmethod
+    def _sort_snapshots(conn):
+        # Eski (ID'leri yanıt sırasında) anlık görüntüler bir kez sıralanır
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(metric_snapshots)")}
+        if "ids_sorted" not in columns:
+            conn.execute("ALTER TABLE metric_snapshots ADD COLUMN ids_sorted INTEGER NOT NULL DEFAULT 0")
+        rows = conn.execute("SELECT id, ids, metrics FROM metric_snapshots WHERE ids_sorted = 0").fetchall()
+        for snapshot_id, ids_blob, metrics_blob in rows:
+            ids, flat = _sort_by_id(_unpack(ids_blob), _unpack(metrics_blob))
+            conn.execute(
+                "UPDATE metric_snapshots SET ids = ?, metrics = ?, ids_sorted = 1 WHERE id = ?",
+                (_pack(ids), _pack(flat), snapshot_id)
+            )
+        conn.commit()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def _next_change(conn):
+        """Yazma işlemi içinde bir sonraki değişiklik sırası
+        
+        BEGIN IMMEDIATE yazma kilidini alır; sıra commit sırasıyla artar. Duvar
+        saati (fetched_at) eşzamanlı yazmalarda geriye gidebildiği için artımlı
+        okuyucular bu sırayı imleç olarak kullanır.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        return conn.execute("SELECT COALESCE(MAX(change_seq), 0) + 1 FROM tweets").fetchone()[0]
+
+    def upsert(self, user_id, tweets):
+        """Tweet'leri ekle; var olanların metriklerini güncelle"""
+        now = time.time()
+        rows = []
+        for t in tweets:
+            metrics = t.public_metrics or {}
+            created = t.created_at.isoformat() if t.created_at else None
+            rows.append((str(t.id), str(user_id), t.text, created, *(metrics.get(c, 0) for c in METRIC_COLUMNS), now))
+        if not rows:
+            return 0
+        with self._lock, closing(self._connect()) as conn, conn:
+            change = self._next_change(conn)
+            conn.executemany(
+                f"""INSERT INTO tweets (id, user_id, text, created_at, {", ".join(METRIC_COLUMNS)}, fetched_at, change_seq)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {change})
+                    ON CONFLICT(id) DO UPDATE SET
+                        {", ".join(f"{c} = excluded.{c}" for c in METRIC_COLUMNS)},
+                        fetched_at = excluded.fetched_at, change_seq = excluded.change_seq""",
+                rows
+            )
+        return len(rows)
+
+    def latest(self, user_id, limit=5):
+        """Kullanıcının en yeni tweet'leri"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""SELECT id, text, created_at, {", ".join(METRIC_COLUMNS)} FROM tweets
+                    WHERE user_id = ? ORDER BY created_at DESC LIMIT ?""",
+                (str(user_id), limit)
+            ).fetchall()
+        return [self._row_to_tweet(row) for row in rows]
+
+    def _row_to_tweet(self, row):
+        tweet_id, text, created, *metrics = row
+        return StoredTweet(
+            tweet_id,
+            text,
+            datetime.fromisoformat(created) if created else None,
+            dict(zip(METRIC_COLUMNS, metrics)),
+        )
+
+    def count(self, user_id):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM tweets WHERE user_id = ?", (str(user_id),)).fetchone()[0]
+
+    def state(self, user_id):
+        """Senkron durumu: newest_id, oldest_id, backfill_done, last_sync, gap_newest, gap_until"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(STATE_FIELDS)} FROM sync_state WHERE user_id = ?",
+                (str(user_id),)
+            ).fetchone()
+        state = dict(zip(STATE_FIELDS, row or (None,) * len(STATE_FIELDS)))
+        state["backfill_done"] = bool(state["backfill_done"])
+        return state
+
+    def save_state(self, user_id, **fields):
+        """Senkron durumunun verilen alanlarını güncelle"""
+        state = self.state(user_id)
+        state.update(fields)
+        state["backfill_done"] = int(state["backfill_done"])
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"""INSERT INTO sync_state (user_id, {", ".join(STATE_FIELDS)})
+                    VALUES (?, {", ".join("?" for _ in STATE_FIELDS)})
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        {", ".join(f"{f} = excluded.{f}" for f in STATE_FIELDS)}""",
+                (str(user_id), *(state[f] for f in STATE_FIELDS))
+            )
+
+    def tweet_ids(self, user_id=None):
+        """Depodaki tweet ID'leri (yeniden eskiye)"""
+        query = "SELECT id FROM tweets"
+        params = ()
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params = (str(user_id),)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC", params).fetchall()
+        return [row[0] for row in rows]
+
+    def record_metrics(self, tweets, taken_at=None):
+        """Güncel metrikleri tweets tablosuna yaz ve zaman damgalı anlık görüntü ekle"""
+        if not tweets:
+            return
+        taken_at = taken_at or time.time()
+        ids = []
+        flat = []
+        updates = []
+        for t in tweets:
+            metrics = t.public_metrics or {}
+            values = [metrics.get(c, 0) or 0 for c in METRIC_COLUMNS]
+            ids.append(int(t.id))
+            flat.extend(values)
+            updates.append((*values, taken_at, str(t.id)))
+        with self._lock, closing(self._connect()) as conn, conn:
+            change = self._next_change(conn)
+            conn.executemany(
+                f"""UPDATE tweets SET {", ".join(f"{c} = ?" for c in METRIC_COLUMNS)}, fetched_at = ?,
+                    change_seq = {change} WHERE id = ?""",
+                updates
+            )
+            ids, flat = _sort_by_id(ids, flat)
+            conn.execute(
+                "INSERT INTO metric_snapshots (taken_at, ids, metrics, ids_sorted) VALUES (?, ?, ?, 1)",
+                (taken_at, _pack(ids), _pack(flat))
+            )
+
+    def engagement_curve(self, tweet_id):
+        """Bir tweet'in zaman içindeki metrikleri: [(taken_at, {metrik: değer}), ...]"""
+        target = int(tweet_id)
+        width = len(METRIC_COLUMNS)
+        curve = []
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT taken_at, ids, metrics FROM metric_snapshots ORDER BY taken_at, id").fetchall()
+        for taken_at, ids_blob, metrics_blob in rows:
+            # Blob'lar kopyalanmadan okunur; görüntü başına tek ikili arama
+            ids = memoryview(ids_blob).cast("Q")
+            index = bisect_left(ids, target)
+            if index == len(ids) or ids[index] != target:
+                continue
+            values = memoryview(metrics_blob).cast("Q")[index * width:(index + 1) * width].tolist()
+            curve.append((taken_at, dict(zip(METRIC_COLUMNS, values))))
+        return curve
+
+    def engagement_rows(self, user_id=None, changed_since=-1):
+        """Zamanlama modeli için ham satırlar: (rowid, epoch, metrikler..., change_seq)
+
+        Değişiklik sırası changed_since'ten büyük olan (sonradan eklenen veya
+        metrikleri yenilenen) tweet'ler döner.
+        """
+        metrics = ", ".join(f"COALESCE({c}, 0)" for c in METRIC_COLUMNS)
+        query = f"""SELECT rowid, CAST(strftime('%s', created_at) AS INTEGER), {metrics}, change_seq
+                    FROM tweets WHERE created_at IS NOT NULL AND change_seq > ?"""
+        params = [changed_since]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(str(user_id))
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).fetchall()
+
+    def dataset_version(self, user_id):
+        """Kullanıcı verisinin sürümü: (tweet sayısı, son değişiklik sırası)"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*), MAX(change_seq) FROM tweets WHERE user_id = ?", (str(user_id),)
+            ).fetchone()
+
+    def timeline_rows(self, user_id):
+        """Analiz için tüm zaman tüneli, eskiden yeniye: (id, epoch, metin, metrikler...)"""
+        metrics = ", ".join(f"COALESCE({c}, 0)" for c in METRIC_COLUMNS)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                f"""SELECT id, CAST(strftime('%s', created_at) AS INTEGER), text, {metrics}
+                    FROM tweets WHERE user_id = ? AND created_at IS NOT NULL ORDER BY created_at""",
+                (str(user_id),)
+            ).fetchall()
+
+    def snapshot_count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM metric_snapshots").fetchone()[0]
+
+    def remember_user(self, username, user_id):
+        """Kullanıcı adı → ID eşlemesini sakla (ID için ayrıca API çağrısı gerekmesin)"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                """INSERT INTO sync_state (user_id, username) VALUES (?, ?)
+                   ON CONFLICT(user_id) DO UPDATE SET username = excluded.username""",
+                (str(user_id), username.lower())
+            )
+
+    def user_id_for(self, username):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT user_id FROM sync_state WHERE username = ?", (username.lower(),)
+            ).fetchone()
+        return row[0] if row else None
+
+
+def _pack(values):
+    return array("Q", values).tobytes()
+
+
+def _unpack(blob):
+    values = array("Q")
+    values.frombytes(blob)
+    return values
+
+
+def _sort_by_id(ids, flat):
+    """ID'leri ve satır satır metrikleri (len(METRIC_COLUMNS) genişlikte) ID'ye göre sırala"""
+    width = len(METRIC_COLUMNS)
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    return (
+        [ids[i] for i in order],
+        [value for i in order for value in flat[i * width:(i + 1) * width]],
+    )
+
+
+class MetricsRefresher:
+    """Depodaki tweet'lerin metriklerini 100'lük gruplarla yeniler ve anlık görüntü alır"""
+
+    def __init__(self, store, x_access):
+        self.store = store
+        self.x_access = x_access
+
+    def _lookup(self, client, ids):
+        def fetch():
+            return client.get_tweets(ids=ids, tweet_fields=["public_metrics"])
+        return self.x_access.request("tweets", fetch)
+
+    def refresh(self, client, user_id=None):
+        """Tüm depolanan tweet'leri yenile: (yenilenen tweet, istek, hata)
+
+        Limit dolarsa o ana kadar yenilenenler yine de anlık görüntüye yazılır.
+        """
+        ids = self.store.tweet_ids(user_id)
+        refreshed = []
+        requests = 0
+        error = None
+        for start in range(0, len(ids), LOOKUP_BATCH):
+            batch = ids[start:start + LOOKUP_BATCH]
+            response, error = self._lookup(client, batch)
+            requests += 1
+            if error:
+                break
+            # Silinmiş/gizlenmiş tweet'ler yanıtta yer almaz (response.errors)
+            refreshed.extend(response.data or [])
+        self.store.record_metrics(refreshed)
+        return len(refreshed), requests, error
+
+
+class TimelineSync:
+    """Zaman tünelini depoya artımlı olarak senkronlar"""
+
+    def __init__(self, store, x_access):
+        self.store = store
+        self.x_access = x_access
+
+    def _page(self, client, user_id, **params):
+        def fetch():
+            return client.get_users_tweets(
+                id=user_id,
+                max_results=PAGE_SIZE,
+                tweet_fields=TWEET_FIELDS,
+                **{k: v for k, v in params.items() if v}
+            )
+        return self.x_access.request("users/:id/tweets", fetch)
+
+    def sync(self, client, user_id, max_pages=MAX_PAGES):
+        """Yeni tweet'leri (since_id) ve eksik geçmişi (until_id) çek: (eklenen, istek, hata)"""
+        state = self.store.state(user_id)
+        added = requests = 0
+
+        # 1a) Önceki senkronda sayfa sınırına takılan aralık: newest_id ile gap_until arası
+        # Her sayfa yeni bir until_id ile istenir; token saklamadan kaldığı yerden devam edilir
+        while state["gap_until"] and requests < max_pages:
+            response, error = self._page(client, user_id, since_id=state["newest_id"], until_id=state["gap_until"])
+            requests += 1
+            if error:
+                return added, requests, error
+            tweets = response.data or []
+            added += self.store.upsert(user_id, tweets)
+            if tweets and (response.meta or {}).get("next_token"):
+                state["gap_until"] = min((str(t.id) for t in tweets), key=_tweet_id_key)
+                self.store.save_state(user_id, gap_until=state["gap_until"])
+                continue
+            # Boşluk kapandı: newest_id artık güvenle ilerleyebilir
+            state.update(newest_id=state["gap_newest"], gap_newest=None, gap_until=None)
+            self.store.save_state(
+                user_id, newest_id=state["newest_id"], gap_newest=None, gap_until=None, last_sync=time.time()
+            )
+        if state["gap_until"]:
+            return added, requests, None
+
+        # 1b) Son senkrondan beri atılan tweet'ler
+        if state["newest_id"] and requests < max_pages:
+            token = None
+            newest = state["newest_id"]
+            oldest = None
+            while requests < max_pages:
+                response, error = self._page(client, user_id, since_id=state["newest_id"], pagination_token=token)
+                requests += 1
+                if error:
+                    # newest_id ilerletilmez; yarım kalan aralık sonraki senkronda tekrar istenir
+                    return added, requests, error
+                tweets = response.data or []
+                added += self.store.upsert(user_id, tweets)
+                if tweets:
+                    ids = [str(t.id) for t in tweets]
+                    newest = max([newest] + ids, key=_tweet_id_key)
+                    oldest = min(ids + ([oldest] if oldest else []), key=_tweet_id_key)
+                token = (response.meta or {}).get("next_token")
+                if not token:
+                    break
+            if token:
+                # Sayfa sınırına takıldı: newest_id ilerlerse arada boşluk kalır. Boşluk
+                # imleci saklanır, sonraki senkron 1a'da oradan devam eder
+                self.store.save_state(user_id, gap_newest=newest, gap_until=oldest, last_sync=time.time())
+                return added, requests, None
+            self.store.save_state(user_id, newest_id=newest, last_sync=time.time())
+            state["newest_id"] = newest
+
+        # 2) İlk senkron veya yarıda kalmış geçmiş çekimi
+        # Sayfalama token'ı aynı sorgu parametreleriyle kullanılmalı: until_id sabit kalır
+        token = None
+        until_id = state["oldest_id"]
+        while not state["backfill_done"] and requests < max_pages:
+            response, error = self._page(client, user_id, until_id=until_id, pagination_token=token)
+            requests += 1
+            if error:
+                return added, requests, error
+            tweets = response.data or []
+            added += self.store.upsert(user_id, tweets)
+            ids = [str(t.id) for t in tweets]
+            if ids:
+                if not state["newest_id"]:
+                    state["newest_id"] = max(ids, key=_tweet_id_key)
+                candidates = ids + ([state["oldest_id"]] if state["oldest_id"] else [])
+                state["oldest_id"] = min(candidates, key=_tweet_id_key)
+            token = (response.meta or {}).get("next_token")
+            state["backfill_done"] = not token
+            self.store.save_state(
+                user_id,
+                newest_id=state["newest_id"],
+                oldest_id=state["oldest_id"],
+                backfill_done=state["backfill_done"],
+                last_sync=time.time()
+            )
+        return added, requests, None
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_tweet_store(path):
+    """Dosya yolu başına süreç genelinde tek depo"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = TweetStore(path)
+        return _stores[key]
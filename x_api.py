@@ -0,0 +1,225 @@
+"""
+X API Erişim Katmanı
+====================
+tweepy'nin wait_on_rate_limit davranışı limit dolunca Streamlit thread'ini 15
+dakikaya kadar uyutur. Bu katman bunun yerine:
+
+- Her yanıttaki x-rate-limit-limit / remaining / reset başlıklarını okuyup
+  endpoint başına bütçe tutar,
+- Bütçe bittiyse istek atmadan önbellekteki son veriyi döndürür,
+- Pencere sıfırlandığında veriyi arka planda yenilemek için iş planlar.
+
+Hiçbir çağrı limit için beklemez; en kötü ihtimalle eski veri ya da hata döner.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+
+import tweepy
+
+# Önbellekteki veri bu kadar tazeyse API'ye hiç gidilmez (saniye)
+DEFAULT_MAX_AGE = 60
+# Başlık gelmeyen 429'larda varsayılan bekleme penceresi (X'te 15 dk)
+DEFAULT_WINDOW = 15 * 60
+
+
+class EndpointBudget:
+    """Bir endpoint'in mevcut penceredeki istek bütçesi"""
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None  # None: henüz bilinmiyor
+        self.reset_at = 0.0  # epoch saniye
+
+    def exhausted(self, now):
+        return self.remaining is not None and self.remaining <= 0 and now < self.reset_at
+
+    def reset_in(self, now):
+        return max(0.0, self.reset_at - now)
+
+
+class RefreshScheduler:
+    """Belirli bir zamanda çalışacak yenileme işleri (tek daemon thread)"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._pending = set()
+        self._counter = itertools.count()
+        self._thread = None
+
+    def schedule(self, at, key, fn):
+        """fn'i at (epoch) zamanında çalıştır; aynı anahtar zaten sıradaysa atla"""
+        with self._cond:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            heapq.heappush(self._heap, (at, next(self._counter), key, fn))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="x-refresh", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def scheduled_at(self, key):
+        with self._cond:
+            for at, _, pending_key, _ in self._heap:
+                if pending_key == key:
+                    return at
+        return None
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.time():
+                    timeout = self._heap[0][0] - time.time() if self._heap else None
+                    self._cond.wait(timeout)
+                _, _, key, fn = heapq.heappop(self._heap)
+                self._pending.discard(key)
+            try:
+                fn()
+            except Exception:
+                # Yenileme başarısızsa bir sonraki çağrı yeniden planlar
+                pass
+
+
+class XAccess:
+    """Endpoint bütçeli, önbellekli ve asla beklemeyen X API erişimi"""
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._cache = {}  # key -> (value, fetched_at)
+        self._notices = {}  # key -> kullanıcıya gösterilecek durum notu
+        self._local = threading.local()
+        self.scheduler = RefreshScheduler()
+
+    def capture_headers(self, response, *args, **kwargs):
+        """requests yanıt hook'u: son yanıtın başlıklarını bu thread için sakla"""
+        self._local.headers = response.headers
+        return response
+
+    def _budget(self, endpoint):
+        return self._budgets.setdefault(endpoint, EndpointBudget())
+
+    def _update_budget(self, endpoint, headers):
+        if not headers or "x-rate-limit-remaining" not in headers:
+            return
+        try:
+            with self._lock:
+                budget = self._budget(endpoint)
+                budget.limit = int(headers.get("x-rate-limit-limit", 0)) or budget.limit
+                budget.remaining = int(headers["x-rate-limit-remaining"])
+                budget.reset_at = float(headers.get("x-rate-limit-reset", 0)) or budget.reset_at
+        except ValueError:
+            pass
+
+    def _reserve(self, endpoint, now):
+        """Bütçeden bir istek ayır; bütçe bitmişse False (eşzamanlı oturumlar aşmasın diye)"""
+        with self._lock:
+            budget = self._budget(endpoint)
+            if budget.exhausted(now):
+                return False
+            if budget.remaining is not None and now < budget.reset_at:
+                budget.remaining -= 1
+            return True
+
+    def cached(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def notice(self, key):
+        """Son çağrıda önbellekten dönüldüyse nedeni (arayüz için)"""
+        with self._lock:
+            return self._notices.get(key)
+
+    def _request(self, endpoint, fn):
+        """Bütçeden ayırıp fn()'i çağır: (değer, hata, limit_doldu)"""
+        now = time.time()
+        if not self._reserve(endpoint, now):
+            return None, None, True
+        self._local.headers = None
+        try:
+            value = fn()
+        except tweepy.TooManyRequests as e:
+            self._update_budget(endpoint, getattr(e.response, "headers", None))
+            with self._lock:
+                budget = self._budget(endpoint)
+                budget.remaining = 0
+                if budget.reset_at <= now:
+                    budget.reset_at = now + DEFAULT_WINDOW
+            return None, None, True
+        except Exception as e:
+            self._update_budget(endpoint, self._local.headers)
+            return None, str(e), False
+        self._update_budget(endpoint, self._local.headers)
+        return value, None, False
+
+    def _limit_message(self, endpoint):
+        with self._lock:
+            wait_min = self._budget(endpoint).reset_in(time.time()) / 60
+        return f"X API limiti doldu ({endpoint}); {wait_min:.0f} dk sonra tekrar denenebilir"
+
+    def request(self, endpoint, fn):
+        """Önbelleksiz tek istek (sayfalama için): limit doluysa beklemeden hata döner"""
+        value, error, limited = self._request(endpoint, fn)
+        if limited:
+            return None, self._limit_message(endpoint)
+        return value, error
+
+    def call(self, endpoint, key, fn, max_age=None):
+        """fn()'i bütçe varsa çağır, yoksa önbellekten dön: (değer, hata)
+
+        fn ham değeri döndürür veya hata fırlatır. Bütçe bitmişse veya 429
+        alınırsa pencere sıfırlanınca yenileme planlanır.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        cached = self.cached(key)
+        if cached is not None and time.time() - cached[1] < max_age:
+            return cached[0], None
+
+        value, error, limited = self._request(endpoint, fn)
+        if limited:
+            return self._serve_stale(endpoint, key, fn, cached)
+        if error:
+            return (cached[0] if cached else None), error
+        with self._lock:
+            self._cache[key] = (value, time.time())
+            self._notices.pop(key, None)
+        return value, None
+
+    def _serve_stale(self, endpoint, key, fn, cached):
+        """Bütçe bitti: yenilemeyi planla, varsa eski veriyi döndür"""
+        with self._lock:
+            reset_at = self._budget(endpoint).reset_at
+        self.scheduler.schedule(reset_at + 1, key, lambda: self.call(endpoint, key, fn, max_age=0))
+        if cached is None:
+            return None, self._limit_message(endpoint) + " (otomatik yenileme planlandı)"
+        wait_min = max(0.0, reset_at - time.time()) / 60
+        with self._lock:
+            self._notices[key] = (
+                f"X API limiti doldu; {time.strftime('%H:%M', time.localtime(cached[1]))} tarihli veri gösteriliyor, "
+                f"{wait_min:.0f} dk sonra otomatik yenilenecek"
+            )
+        return cached[0], None
+
+    def budgets(self):
+        """Arayüz için endpoint bazında kalan bütçe"""
+        now = time.time()
+        with self._lock:
+            return {
+                endpoint: {
+                    "limit": b.limit,
+                    "remaining": b.remaining,
+                    "reset_in": b.reset_in(now),
+                    "exhausted": b.exhausted(now),
+                }
+                for endpoint, b in self._budgets.items()
+            }
+
+
+# Süreç genelinde tek erişim katmanı (bütçeler tüm oturumlarca paylaşılır)
+x_access = XAccess(max_age=int(os.getenv("X_CACHE_MAX_AGE", DEFAULT_MAX_AGE)))